@@ -0,0 +1,59 @@
+"""
+Throughput of batch scoring, in-process and through /api/v1/predict/batch.
+
+    python benchmarks/bench_batch_predict.py --rows 1000 10000 100000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "bikerental_model_api"))
+
+import argparse
+import time
+
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.data_manager import load_raw_dataset
+
+
+def sample_records(rows: int) -> pd.DataFrame:
+    """Replicate the bundled dataset up to ``rows`` input records."""
+    data = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    data = data.drop(columns=[config.model_config_.target, "casual", "registered"])
+    repeats = -(-rows // len(data))
+    return pd.concat([data] * repeats, ignore_index=True).iloc[:rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--no-api", action="store_true", help="only time the in-process path")
+    args = parser.parse_args()
+
+    from bikerental_model.predict import make_batch_prediction
+    client = None
+    if not args.no_api:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        client = TestClient(app)
+
+    print(f"{'rows':>8}{'case':>14}{'seconds':>10}{'rows/s':>12}")
+    for rows in args.rows:
+        data = sample_records(rows)
+        cases = {"in-process": lambda: make_batch_prediction(input_data=data)}
+        if client is not None:
+            payload = {"inputs": data.astype(object).where(data.notna(), None).to_dict(orient="records")}
+            cases["api list"] = lambda: client.post("/api/v1/predict/batch", json=payload).raise_for_status()
+            cases["api ndjson"] = lambda: client.post("/api/v1/predict/batch?stream=true", json=payload).raise_for_status()
+        for name, func in cases.items():
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>8}{name:>14}{elapsed:>10.2f}{rows / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
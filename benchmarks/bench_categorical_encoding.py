@@ -0,0 +1,73 @@
+"""
+Speed and memory of categorical encoding: the seven Mapper steps plus
+WeekdayOneHotEncoder vs a single CategoricalEncoder, on the bundled
+dataset replicated to ``--rows`` rows (after imputation, as in bike_pipe).
+Also compares object vs fixed-category Categorical storage of the inputs.
+
+    python benchmarks/bench_categorical_encoding.py --rows 1000000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from bikerental_model.config.core import config
+from bikerental_model.pipeline import make_bike_pipe
+from bikerental_model.processing.data_manager import pre_pipeline_preparation
+from bikerental_model.processing.features import CategoricalEncoder, Mapper, WeekdayOneHotEncoder
+from benchmarks.bench_batch_predict import sample_records
+
+
+def _measure(func, data: pd.DataFrame):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        data = pre_pipeline_preparation(data_frame=sample_records(rows))[config.model_config_.features]
+        data = make_bike_pipe()[:2].fit_transform(data)  # weekday / weathersit imputation
+        default = make_bike_pipe()
+        mappers = Pipeline(
+            [step for step in default.steps if isinstance(step[1], (Mapper, WeekdayOneHotEncoder))]
+        ).fit(data)
+        encoder = make_bike_pipe(categorical_encoding=True).named_steps["categorical_encoder"].fit(data)
+        columns = list(encoder.ordinal) + list(encoder.one_hot)
+        categorical = data.copy()
+        for column in columns:
+            categories = encoder.one_hot.get(column) or list(encoder.ordinal[column])
+            categorical[column] = pd.Categorical(categorical[column], categories=categories)
+
+        print(f"rows={rows}")
+        print(f"  input columns: object {data[columns].memory_usage(deep=True).sum() / 2**20:8.1f} MB, "
+              f"categorical {categorical[columns].memory_usage(deep=True).sum() / 2**20:8.1f} MB")
+        print(f"  {'case':<36}{'seconds':>9}{'peak MB':>9}")
+        cases = {
+            "Mapper x7 + WeekdayOneHotEncoder": (mappers.transform, data),
+            "CategoricalEncoder (object input)": (encoder.transform, data),
+            "CategoricalEncoder (categorical)": (encoder.transform, categorical),
+        }
+        for name, (func, frame) in cases.items():
+            elapsed, peak = _measure(func, frame)
+            print(f"  {name:<36}{elapsed:>9.3f}{peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
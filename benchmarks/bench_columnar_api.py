@@ -0,0 +1,76 @@
+"""
+End-to-end latency of large batches through the API: the row-oriented
+{"inputs": [{...}, ...]} body on /api/v1/predict/batch vs the columnar
+{"temp": [...], "hr": [...], ...} body on /api/v1/predict/batch/columnar.
+Request bodies are serialized up front, so the timings are the server's
+parsing, validation, scoring and response serialization (TestClient, no
+network).
+
+    PYTHONPATH=bikerental_model_api python benchmarks/bench_columnar_api.py --rows 10000 100000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "bikerental_model_api"))
+
+import argparse
+import contextlib
+import io
+import json
+
+import numpy as np
+
+from benchmarks.bench_batch_predict import sample_records
+from benchmarks.bench_scoring_plan import _timings
+
+CASES = {
+    "rows": "predict/batch",
+    "columnar": "predict/batch/columnar",
+}
+
+
+def request_bodies(rows: int) -> dict:
+    """The same records as a row-oriented and a columnar JSON body."""
+    data = sample_records(rows)
+    data = data.astype(object).where(data.notna(), None)
+    return {
+        "rows": json.dumps({"inputs": data.to_dict(orient="records")}).encode(),
+        "columnar": json.dumps(data.to_dict(orient="list")).encode(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    print(f"{'rows':>8}{'case':>10}{'MiB sent':>10}{'MiB back':>10}{'p50 ms':>10}{'vs rows':>9}")
+    with TestClient(app) as client:
+        for rows in args.rows:
+            bodies = request_bodies(rows)
+            first = None
+            for case in args.cases:
+                def send():
+                    response = client.post(
+                        f"/api/v1/{CASES[case]}", content=bodies[case], headers={"Content-Type": "application/json"}
+                    )
+                    response.raise_for_status()
+                    return response
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    received = len(send().content)
+                    median = np.median(_timings(send, args.repeat))
+                first = first or median
+                print(f"{rows:>8}{case:>10}{len(bodies[case]) / 2**20:>10.1f}{received / 2**20:>10.2f}"
+                      f"{median:>10.1f}{median / first:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
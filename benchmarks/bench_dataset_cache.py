@@ -0,0 +1,61 @@
+"""
+Load time of the training data: pd.read_csv vs the Feather dataset cache,
+on the bundled dataset replicated to ``--rows`` rows. "cold" parses the
+CSV and writes the cache, "warm" memory-maps it (categorical columns, as
+load_dataset gets them) and "warm object" also turns the categoricals back
+into object columns (as load_raw_dataset gets them).
+
+    python benchmarks/bench_dataset_cache.py --rows 17379 1000000 10000000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import tempfile
+import time
+
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.data_manager import load_raw_dataset
+from bikerental_model.processing.dataset_cache import read_csv_cached
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[17379, 1_000_000])
+    args = parser.parse_args()
+
+    source = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    print(f"{'rows':>10}{'case':>14}{'seconds':>9}{'frame MB':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "data.csv"
+            repeats = -(-rows // len(source))
+            pd.concat([source] * repeats, ignore_index=True).iloc[:rows].to_csv(path, index=False)
+            cache_dir = Path(tmp) / "cache"
+
+            cases = {
+                "read_csv": lambda: pd.read_csv(path),
+                "cache cold": lambda: read_csv_cached(path, cache_dir),
+                "cache warm": lambda: read_csv_cached(path, cache_dir),
+                "warm object": lambda: read_csv_cached(path, cache_dir, categorical=False),
+            }
+            for name, func in cases.items():
+                elapsed, frame = _timed(func)
+                size = frame.memory_usage(deep=True).sum() / 2**20
+                del frame
+                print(f"{rows:>10}{name:>14}{elapsed:>9.3f}{size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Date handling before the model: pd.to_datetime on every row (once in
+get_year_and_month, again in WeekdayImputer) vs the shared date-feature
+stage that parses each distinct date once. Input is ``--rows`` rows drawn
+from the ~730 dates of the bundled dataset, with ``--missing`` of the
+weekdays blanked out so WeekdayImputer has work to do.
+
+    python benchmarks/bench_date_parsing.py --rows 1000000 10000000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.data_manager import get_year_and_month, load_raw_dataset
+from bikerental_model.processing.features import WeekdayImputer
+
+
+def per_row_year_and_month(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """get_year_and_month as it was: every row goes through pd.to_datetime."""
+    df = dataframe.copy()
+    df['dteday'] = pd.to_datetime(df['dteday'], format='%Y-%m-%d')
+    df['yr'] = df['dteday'].dt.year.astype('str')
+    df['mnth'] = df['dteday'].dt.month_name()
+    return df
+
+
+def per_row_weekday_imputer(X: pd.DataFrame) -> pd.DataFrame:
+    """WeekdayImputer.transform as it was: the date column is parsed again."""
+    X = X.copy()
+    X['dteday'] = pd.to_datetime(X['dteday'], errors='coerce')
+    missing_idx = X[X['weekday'].isnull()].index
+    X.loc[missing_idx, 'weekday'] = X.loc[missing_idx, 'dteday'].dt.day_name().str[:3]
+    return X
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--missing", type=float, default=0.1)
+    args = parser.parse_args()
+
+    source = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    dates = source['dteday'].unique()
+    rng = np.random.default_rng(42)
+
+    for rows in args.rows:
+        picked = rng.integers(0, len(dates), rows)
+        data = pd.DataFrame({
+            'dteday': dates[picked],
+            'weekday': pd.Series(pd.to_datetime(dates, format='%Y-%m-%d').day_name().str[:3])
+                         .to_numpy(dtype=object)[picked],
+        })
+        data.loc[rng.random(rows) < args.missing, 'weekday'] = np.nan
+
+        before_prep, prepared = _timed(per_row_year_and_month, data)
+        before_imp, expected = _timed(per_row_weekday_imputer, prepared)
+        after_prep, prepared = _timed(get_year_and_month, data)
+        after_imp, subject = _timed(WeekdayImputer('weekday').transform, prepared)
+        assert subject.equals(expected)
+
+        print(f"rows={rows} distinct dates={len(dates)}")
+        print(f"  {'stage':<22}{'per-row s':>11}{'cached s':>10}{'speedup':>9}")
+        for stage, before, after in (
+            ("get_year_and_month", before_prep, after_prep),
+            ("WeekdayImputer", before_imp, after_imp),
+            ("total", before_prep + before_imp, after_prep + after_imp),
+        ):
+            print(f"  {stage:<22}{before:>11.3f}{after:>10.3f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+The random forest step scored by sklearn vs the FlatForest engine: the model
+alone on transformed rows, the whole pipeline (bikerental_pipeline.predict
+vs transform + FlatForest) and a single record through the ScoringPlan.
+
+    python benchmarks/bench_flat_forest.py --rows 1 10 100 10000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+
+import numpy as np
+
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import prepare_inputs
+from bikerental_model.processing.flat_forest import FlatForest
+from bikerental_model.processing.scoring_plan import ScoringPlan
+from benchmarks.bench_batch_predict import sample_records
+from benchmarks.bench_scoring_plan import _timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pipeline = model_registry.get()
+    forest = FlatForest(pipeline[-1])
+    print(f"{forest.n_trees} trees padded to depth {forest.depth}")
+
+    print(f"{'rows':>7}{'case':>18}{'sklearn ms':>12}{'flat ms':>10}{'speed-up':>10}")
+    for rows in args.rows:
+        X, _ = prepare_inputs(sample_records(rows), validate=False)
+        features = pipeline[:-1].transform(X)
+        np.testing.assert_allclose(forest.predict(features), pipeline[-1].predict(features), rtol=1e-12)
+        repeat = max(5, args.repeat * 100 // max(rows, 100))
+        cases = {
+            "model only": (lambda: pipeline[-1].predict(features), lambda: forest.predict(features)),
+            "pipeline": (lambda: pipeline.predict(X), lambda: forest.predict(pipeline[:-1].transform(X))),
+        }
+        for name, (sklearn_func, flat_func) in cases.items():
+            sklearn_ms = np.median(_timings(sklearn_func, repeat))
+            flat_ms = np.median(_timings(flat_func, repeat))
+            print(f"{rows:>7}{name:>18}{sklearn_ms:>12.3f}{flat_ms:>10.3f}{sklearn_ms / flat_ms:>9.1f}x")
+
+    record = sample_records(1).iloc[0].to_dict()
+    sklearn_plan, flat_plan = ScoringPlan(pipeline), ScoringPlan(pipeline, model=forest)
+    sklearn_ms = np.median(_timings(lambda: sklearn_plan.predict(record), args.repeat))
+    flat_ms = np.median(_timings(lambda: flat_plan.predict(record), args.repeat))
+    print(f"{1:>7}{'scoring plan':>18}{sklearn_ms:>12.3f}{flat_ms:>10.3f}{sklearn_ms / flat_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
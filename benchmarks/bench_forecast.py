@@ -0,0 +1,90 @@
+"""
+Payload size and end-to-end latency of an hourly multi-day forecast sent
+as a date range plus hourly weather arrays to /api/v1/forecast, vs the
+same hours spelled out as full records: one /api/v1/predict request per
+hour, or all of them in one /api/v1/predict/batch request. Runs through a
+TestClient, so the latency includes JSON parsing and request validation
+but no network.
+
+    PYTHONPATH=bikerental_model_api python benchmarks/bench_forecast.py --days 7 31
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "bikerental_model_api"))
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+
+import numpy as np
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.forecast import HOURS_PER_DAY, WEATHER_COLUMNS, forecast_grid
+from benchmarks.bench_scoring_plan import _timings
+
+
+def forecast_payload(start: datetime.date, days: int, seed: int = 0) -> dict:
+    """A /forecast request body with random hourly weather."""
+    hours = days * HOURS_PER_DAY
+    rng = np.random.default_rng(seed)
+    return {
+        "start": start.isoformat(),
+        "end": (start + datetime.timedelta(days=days - 1)).isoformat(),
+        "temp": rng.uniform(0, 30, hours).round(2).tolist(),
+        "atemp": rng.uniform(-5, 35, hours).round(4).tolist(),
+        "hum": rng.uniform(20, 100, hours).round(0).tolist(),
+        "windspeed": rng.uniform(0, 40, hours).round(4).tolist(),
+        "weathersit": rng.choice(list(config.model_config_.weather_mappings), hours).tolist(),
+    }
+
+
+def record_payloads(forecast: dict) -> list:
+    """The same hours as the full records a client builds for /predict."""
+    grid = forecast_grid(forecast["start"], forecast["end"], {column: forecast[column] for column in WEATHER_COLUMNS})
+    grid["dteday"] = grid["dteday"].dt.strftime("%Y-%m-%d")
+    return grid.to_dict(orient="records")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 31])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    print(f"{'days':>5}{'case':>30}{'requests':>10}{'KiB sent':>10}{'p50 ms':>10}{'vs forecast':>13}")
+    with TestClient(app) as client, contextlib.redirect_stdout(io.StringIO()) as quiet:
+        for days in args.days:
+            forecast = forecast_payload(datetime.date(2012, 6, 4), days)
+            records = record_payloads(forecast)
+            bodies = {
+                "forecast": [("forecast", forecast)],
+                "records, one /predict each": [("predict", {"inputs": [record]}) for record in records],
+                "records, one /predict/batch": [("predict/batch", {"inputs": records})],
+            }
+            results = []
+            for name, requests in bodies.items():
+                def send():
+                    for route, body in requests:
+                        client.post(f"/api/v1/{route}", json=body).raise_for_status()
+
+                sent = sum(len(json.dumps(body)) for _, body in requests)
+                results.append((name, len(requests), sent, np.median(_timings(send, args.repeat))))
+
+            forecast_ms = results[0][3]
+            with contextlib.redirect_stdout(sys.__stdout__):
+                for name, count, sent, median in results:
+                    print(f"{days:>5}{name:>30}{count:>10}{sent / 1024:>10.1f}{median:>10.2f}"
+                          f"{median / forecast_ms:>12.1f}x")
+            quiet.truncate(0)
+
+
+if __name__ == "__main__":
+    main()
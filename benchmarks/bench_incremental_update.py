@@ -0,0 +1,51 @@
+"""
+Daily model refresh: retraining bike_pipe from scratch on the whole
+history vs growing the fitted forest on one new day (update_pipeline),
+with the history replicated ``--scale`` times.
+
+    python benchmarks/bench_incremental_update.py --scale 1 10 50
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import time
+
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.pipeline import make_bike_pipe
+from bikerental_model.processing.data_manager import load_dataset
+from bikerental_model.update_pipeline import update_pipeline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--new-trees", type=int, default=None)
+    args = parser.parse_args()
+
+    data = load_dataset(file_name=config.app_config_.training_data_file)
+    features, target = config.model_config_.features, config.model_config_.target
+    new_day = data[data["dteday"] == data["dteday"].max()]
+    history = data[data["dteday"] < data["dteday"].max()]
+
+    print(f"{'history rows':>13}{'full retrain s':>16}{'daily update s':>16}")
+    for scale in args.scale:
+        rows = pd.concat([history] * scale, ignore_index=True)
+        pipeline = make_bike_pipe()
+        start = time.perf_counter()
+        pipeline.fit(rows[features], rows[target])
+        retrain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        update_pipeline(pipeline, new_day[features], new_day[target], new_trees=args.new_trees)
+        update = time.perf_counter() - start
+        print(f"{len(rows):>13}{retrain:>16.2f}{update:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
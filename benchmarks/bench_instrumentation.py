@@ -0,0 +1,73 @@
+"""
+Overhead of the per-stage instrumentation: pipeline.predict called directly
+vs make_prediction's pipeline call with stage metrics disabled and enabled,
+on batches of ``--rows`` prepared rows, plus the cost of one disabled
+stage() block on its own.
+
+    python benchmarks/bench_instrumentation.py --rows 1 100 10000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import time
+import timeit
+from typing import Dict, List
+
+import numpy as np
+
+from bikerental_model.instrumentation import predict_with_stages, stage_metrics
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import prepare_inputs
+from benchmarks.bench_batch_predict import sample_records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    pipeline = model_registry.get()
+    print(f"{'rows':>7}{'case':>12}{'p50 ms':>10}{'overhead':>10}")
+    for rows in args.rows:
+        X, _ = prepare_inputs(sample_records(rows), validate=False)
+        repeat = max(5, args.repeat * 100 // max(rows, 100))
+
+        def run(enabled: bool):
+            def call():
+                stage_metrics.enabled = enabled
+                try:
+                    predict_with_stages(pipeline, X)
+                finally:
+                    stage_metrics.enabled = False
+            return call
+
+        funcs = {"direct": lambda: pipeline.predict(X), "disabled": run(False), "enabled": run(True)}
+        # interleave the cases so drift on a shared machine hits them alike
+        cases: Dict[str, List[float]] = {name: [] for name in funcs}
+        for _ in range(repeat):
+            for name, func in funcs.items():
+                start = time.perf_counter()
+                func()
+                cases[name].append((time.perf_counter() - start) * 1000)
+        baseline = np.median(cases["direct"])
+        for name, timings in cases.items():
+            median = np.median(timings)
+            print(f"{rows:>7}{name:>12}{median:>10.3f}{(median / baseline - 1) * 100:>9.1f}%")
+
+
+    def disabled_stage():
+        with stage_metrics.stage("noop", 1):
+            pass
+
+    calls = 200_000
+    seconds = timeit.timeit(disabled_stage, number=calls)
+    print(f"disabled stage(): {seconds / calls * 1e9:.0f} ns per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Wall time and peak memory of the bike_pipe preprocessing steps, default
+(copying) transformers vs the copy-free pipeline, on the bundled dataset
+replicated to ``--rows`` rows. Each case runs in a fresh process; peak
+memory is the growth of the process high-water mark during fit_transform
+and transform (Linux only).
+
+    python benchmarks/bench_pipeline_copies.py --rows 10000000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import multiprocessing as mp
+import time
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _reset_peak() -> None:
+    # writing 5 to clear_refs resets VmHWM to the current RSS
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+
+def _case(rows: int, copy_free: bool, results) -> None:
+    from bikerental_model.config.core import config
+    from bikerental_model.pipeline import make_bike_pipe
+    from bikerental_model.processing.data_manager import pre_pipeline_preparation
+    from benchmarks.bench_batch_predict import sample_records
+
+    data = sample_records(rows)
+    data = pre_pipeline_preparation(data_frame=data)[config.model_config_.features]
+    preprocessing = make_bike_pipe(copy_free=copy_free)[:-1]
+
+    measurements = {}
+    for name, func in (("fit_transform", preprocessing.fit_transform), ("transform", preprocessing.transform)):
+        baseline = _status_kb("VmRSS")
+        _reset_peak()
+        start = time.perf_counter()
+        func(data)
+        measurements[name] = (time.perf_counter() - start, (_status_kb("VmHWM") - baseline) / 1024)
+    results.put(measurements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000_000])
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"{'rows':>10}{'mode':>11}{'step':>15}{'seconds':>10}{'peak MB':>10}")
+    for rows in args.rows:
+        for copy_free in (False, True):
+            results = ctx.Queue()
+            process = ctx.Process(target=_case, args=(rows, copy_free, results))
+            process.start()
+            measurements = results.get()
+            process.join()
+            for name, (seconds, peak) in measurements.items():
+                mode = "copy-free" if copy_free else "default"
+                print(f"{rows:>10}{mode:>11}{name:>15}{seconds:>10.2f}{peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
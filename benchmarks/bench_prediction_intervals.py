@@ -0,0 +1,61 @@
+"""
+Latency of point-only predictions vs predictions with per-tree quantiles
+(p10/p50/p90) through make_trusted_prediction, and of the per-estimator
+Python loop the quantiles would otherwise need.
+
+    python benchmarks/bench_prediction_intervals.py --rows 1 100 10000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+
+import numpy as np
+
+from bikerental_model.config.core import config
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import make_trusted_prediction, prepare_inputs
+from benchmarks.bench_batch_predict import sample_records
+from benchmarks.bench_scoring_plan import _timings
+
+
+def estimator_loop(pipeline, records, quantiles):
+    """Quantiles from calling every tree of the forest in turn."""
+    X, _ = prepare_inputs(records, validate=False)
+    features = pipeline[:-1].transform(X)
+    trees = np.array([tree.predict(features) for tree in pipeline[-1].estimators_])
+    return np.quantile(trees, quantiles, axis=0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    quantiles = config.model_config_.prediction_quantiles
+    pipeline = model_registry.get()
+    model_registry.flat_forest()  # exported once per model, like the scoring plan
+
+    print(f"{'rows':>7}{'case':>18}{'p50 ms':>10}{'vs point':>10}")
+    for rows in args.rows:
+        data = sample_records(rows)
+        records = data.astype(object).where(data.notna(), None).to_dict(orient="records")
+        repeat = max(5, args.repeat * 100 // max(rows, 100))
+        cases = {
+            "point only": lambda: make_trusted_prediction(input_data=records),
+            "with quantiles": lambda: make_trusted_prediction(input_data=records, quantiles=quantiles),
+            "estimator loop": lambda: estimator_loop(pipeline, data, quantiles),
+        }
+        point = None
+        for name, func in cases.items():
+            median = np.median(_timings(func, repeat))
+            point = point or median
+            print(f"{rows:>7}{name:>18}{median:>10.3f}{median / point:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
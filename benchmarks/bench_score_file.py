@@ -0,0 +1,63 @@
+"""
+Peak memory and throughput of streaming file scoring (score_file.py) as
+the input grows: the bundled dataset is written ``--rows`` rows long and
+scored in a fresh process, whose peak RSS is read from wait4(). With
+``--workers`` > 1 the figure covers the parent process only.
+
+    python benchmarks/bench_score_file.py --rows 100000 1000000 4000000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from bikerental_model.config.core import PACKAGE_ROOT, config
+from bikerental_model.processing.data_manager import load_raw_dataset
+
+
+def write_inputs(path: Path, rows: int) -> None:
+    """Write ``rows`` input records to a CSV, a copy of the dataset at a time."""
+    source = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    source = source.drop(columns=[config.model_config_.target, "casual", "registered"])
+    written = 0
+    while written < rows:
+        part = source.iloc[:rows - written]
+        part.to_csv(path, mode="a" if written else "w", header=not written, index=False)
+        written += len(part)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'seconds':>9}{'rows/s':>10}{'peak RSS MB':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs, outputs = Path(tmp) / "inputs.csv", Path(tmp) / "predictions.csv"
+            write_inputs(inputs, rows)
+            command = [sys.executable, str(PACKAGE_ROOT / "score_file.py"), str(inputs), str(outputs),
+                       "--workers", str(args.workers)]
+            if args.chunk_size:
+                command += ["--chunk-size", str(args.chunk_size)]
+            start = time.perf_counter()
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+            _, status, usage = os.wait4(process.pid, 0)
+            elapsed = time.perf_counter() - start
+            process.returncode = os.waitstatus_to_exitcode(status)
+            if process.returncode:
+                raise SystemExit(f"score_file.py failed on {rows} rows")
+            print(f"{rows:>10}{elapsed:>9.1f}{rows / elapsed:>10.0f}{usage.ru_maxrss / 1024:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
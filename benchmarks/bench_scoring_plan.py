@@ -0,0 +1,66 @@
+"""
+Latency of single-record scoring: compiled ScoringPlan vs the pandas pipeline.
+
+    python benchmarks/bench_scoring_plan.py --repeat 200
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from bikerental_model.predict import get_scoring_plan, make_prediction
+
+RECORD = {
+    "dteday": "2012-11-05",
+    "season": "winter",
+    "hr": "2am",
+    "holiday": "No",
+    "weekday": "Mon",
+    "workingday": "Yes",
+    "weathersit": "Mist",
+    "temp": 6.1,
+    "atemp": 3.0014,
+    "hum": 49.0,
+    "windspeed": 19.0012,
+}
+
+
+def _timings(func, repeat: int) -> np.ndarray:
+    func()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    plan = get_scoring_plan()
+    cases = {
+        "pandas pipeline": lambda: make_prediction(input_data=[RECORD], fast_path=False),
+        "scoring plan": lambda: make_prediction(input_data=[RECORD]),
+        "plan encode only": lambda: plan.encode(RECORD),
+        "model predict only": lambda: plan.model.predict(plan.encode(RECORD)),
+    }
+    print(f"{'case':<20}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, func in cases.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = _timings(func, args.repeat)
+        print(f"{name:<20}{np.percentile(timings, 50):>10.3f}{np.percentile(timings, 99):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Wall time of fitting bike_pipe with the random forest on 1, 4 and 16
+cores (``model_rf__n_jobs``), on the bundled dataset replicated
+``--scale`` times. Scaling is bounded by the cores this machine has.
+
+    python benchmarks/bench_training.py --n-jobs 1 4 16 --scale 4
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.pipeline import make_bike_pipe
+from bikerental_model.processing.data_manager import load_dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    data = load_dataset(file_name=config.app_config_.training_data_file)
+    data = pd.concat([data] * args.scale, ignore_index=True)
+    X, y = data[config.model_config_.features], data[config.model_config_.target]
+
+    print(f"rows={len(data)} cpu_count={os.cpu_count()} usable={len(os.sched_getaffinity(0))}")
+    print(f"{'n_jobs':>8}{'fit s':>9}{'speedup':>9}")
+    baseline = None
+    for n_jobs in args.n_jobs:
+        pipe = make_bike_pipe().set_params(model_rf__n_jobs=n_jobs)
+        start = time.perf_counter()
+        pipe.fit(X, y)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{n_jobs:>8}{elapsed:>9.2f}{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Per-request latency of the /predict worker: re-encoding the parsed request
+(jsonable_encoder -> DataFrame) and re-validating it in make_prediction vs
+handing the schema-validated records to make_trusted_prediction. The
+request is parsed into the API schema once, outside the timings.
+
+    PYTHONPATH=bikerental_model_api python benchmarks/bench_trusted_predict.py --rows 1 24 1000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from bikerental_model.predict import make_prediction
+from app import schemas
+from app.api import _predict
+from benchmarks.bench_batch_predict import sample_records
+from benchmarks.bench_scoring_plan import _timings
+
+
+def revalidating_predict(inputs: list) -> dict:
+    """The /predict worker before the trusted entry point."""
+    input_df = pd.DataFrame(jsonable_encoder(inputs))
+    print(input_df)
+    return make_prediction(input_data=input_df.replace({np.nan: None}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 24, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}{'case':>14}{'p50 ms':>10}{'p99 ms':>10}")
+    for rows in args.rows:
+        data = sample_records(rows)
+        payload = {"inputs": data.astype(object).where(data.notna(), None).to_dict(orient="records")}
+        inputs = schemas.MultipleDataInputs(**payload).inputs
+        cases = {"revalidated": lambda: revalidating_predict(inputs), "trusted": lambda: _predict(inputs)}
+        for name, func in cases.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                timings = _timings(func, args.repeat)
+            print(f"{rows:>6}{name:>14}{np.percentile(timings, 50):>10.3f}{np.percentile(timings, 99):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
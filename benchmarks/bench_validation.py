@@ -0,0 +1,46 @@
+"""
+validate_inputs: the reference per-row pydantic schema vs the columnar
+validator, on the bundled dataset replicated to ``--rows`` rows.
+
+    python benchmarks/bench_validation.py --rows 10000 100000
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import time
+import tracemalloc
+
+from bikerental_model.processing.validation import validate_inputs
+from benchmarks.bench_batch_predict import sample_records
+
+
+def _measure(data, method: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, errors = validate_inputs(input_df=data, method=method)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert errors is None
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'method':>11}{'seconds':>9}{'peak MB':>9}")
+    for rows in args.rows:
+        data = sample_records(rows)
+        for method in ("pydantic", "columnar"):
+            elapsed, peak = _measure(data, method)
+            print(f"{rows:>9}{method:>11}{elapsed:>9.3f}{peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
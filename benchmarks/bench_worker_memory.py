@@ -0,0 +1,80 @@
+"""
+Resident memory of N serving workers that each load the trained pipeline.
+
+Every worker imports the package, loads the pipeline (copied or
+memory-mapped), scores one record and then reports its RSS and PSS
+(proportional set size, which splits shared pages between the processes
+mapping them) from /proc while all workers are alive. Linux only.
+
+sklearn's trees copy their node arrays when unpickled, so memory-mapping
+the artifact does not share the forest: both modes use the same memory.
+
+    python benchmarks/bench_worker_memory.py --workers 1 4 8
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import multiprocessing as mp
+
+
+def _memory_kb() -> dict:
+    memory = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Shared_Clean", "Private_Clean", "Private_Dirty"):
+                memory[key] = int(value.split()[0])
+    return memory
+
+
+def _worker(mmap_mode, barrier, results) -> None:
+    from bikerental_model import __version__ as _version
+    from bikerental_model.model_registry import ModelRegistry
+    from bikerental_model.processing.data_manager import load_pipeline
+
+    before = _memory_kb()
+    pipeline = load_pipeline(file_name=ModelRegistry.file_name(_version), mmap_mode=mmap_mode)
+    barrier.wait()
+    after = _memory_kb()
+    results.put({"model_kb": after["Rss"] - before["Rss"], **after})
+    barrier.wait()
+    del pipeline
+
+
+def measure(workers: int, mmap_mode) -> dict:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(mmap_mode, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "rss_mb": sum(s["Rss"] for s in samples) / workers / 1024,
+        "model_mb": sum(s["model_kb"] for s in samples) / workers / 1024,
+        "total_rss_mb": sum(s["Rss"] for s in samples) / 1024,
+        "total_pss_mb": sum(s["Pss"] for s in samples) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'mode':>8}{'RSS/worker':>12}{'model/worker':>14}{'total RSS':>11}{'total PSS':>11}  (MB)")
+    for workers in args.workers:
+        for mmap_mode in (None, "r"):
+            m = measure(workers, mmap_mode)
+            print(f"{workers:>8}{mmap_mode or 'copy':>8}{m['rss_mb']:>12.1f}{m['model_mb']:>14.2f}"
+                  f"{m['total_rss_mb']:>11.1f}{m['total_pss_mb']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Concurrent load test against a running API server.
+
+Fires single-row /predict requests from ``--concurrency`` client threads
+while a probe polls /health, then reports p50/p99 latency for both and
+the status codes seen (503 = queue full, 504 = timed out).
+
+    cd bikerental_model_api && python app/main.py
+    python benchmarks/load_test_api.py --url http://localhost:8001 --concurrency 32 --requests 2000
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+PAYLOAD = json.dumps({
+    "inputs": [
+        {
+            "dteday": "2012-11-05",
+            "season": "winter",
+            "hr": "2am",
+            "holiday": "No",
+            "weekday": "Mon",
+            "workingday": "Yes",
+            "weathersit": "Mist",
+            "temp": 6.1,
+            "atemp": 3.0014,
+            "hum": 49.0,
+            "windspeed": 19.0012,
+        }
+    ]
+}).encode()
+
+
+def _call(url: str, data: Optional[bytes] = None):
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return status, time.perf_counter() - start
+
+
+def _summary(name: str, timings: list) -> str:
+    millis = np.array(timings) * 1000
+    return (f"{name:<10} n={len(millis):<6} p50={np.percentile(millis, 50):8.1f} ms  "
+            f"p99={np.percentile(millis, 99):8.1f} ms  max={millis.max():8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--health-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    predict_url = f"{args.url}/api/v1/predict"
+    health_url = f"{args.url}/api/v1/health"
+    done = threading.Event()
+    health_timings = []
+
+    def probe():
+        while not done.is_set():
+            health_timings.append(_call(health_url)[1])
+            time.sleep(args.health_interval)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda _: _call(predict_url, PAYLOAD), range(args.requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+
+    statuses = Counter(status for status, _ in results)
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.requests / elapsed:.0f} req/s")
+    print(f"status codes: {dict(statuses)}")
+    print(_summary("predict", [t for status, t in results if status == 200]))
+    print(_summary("health", health_timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark suite: every fitted pipeline step, validate_inputs, make_prediction
+at several batch sizes, model load and /api/v1/predict (plus a small
+/api/v1/predict/batch request) through a TestClient.
+
+Results are written as JSON to benchmarks/results/<commit>.json. With
+--baseline they are compared with a stored run, and the exit status is 1
+when a case got slower than --tolerance allows, so two commits can be
+compared on the same machine:
+
+    PYTHONPATH=bikerental_model_api python benchmarks/run_suite.py --save-baseline
+    # ... change the code ...
+    PYTHONPATH=bikerental_model_api python benchmarks/run_suite.py --baseline benchmarks/results/baseline.json
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+sys.path.append(str(root / "bikerental_model_api"))
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import subprocess
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from bikerental_model import __version__ as _version
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import make_prediction, prepare_inputs
+from bikerental_model.processing.data_manager import load_pipeline
+from bikerental_model.processing.validation import validate_inputs
+from benchmarks.bench_batch_predict import sample_records
+
+RESULTS_DIR = parent / "results"
+
+
+def _measure(func: Callable, repeat: int) -> dict:
+    """Median and best wall time of ``repeat`` calls, after one warm-up call."""
+    with contextlib.redirect_stdout(io.StringIO()):  # make_prediction prints its output
+        if repeat > 1:
+            func()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return {"median_s": float(np.median(timings)), "min_s": float(np.min(timings)), "repeat": repeat}
+
+
+def _repeat_for(rows: int, repeat: int) -> int:
+    # large batches take seconds each; a single run is precise enough
+    return max(1, min(repeat, 100_000 // max(rows, 1)))
+
+
+def run_suite(*, sizes, transform_rows: int, repeat: int, api: bool = True) -> Dict[str, dict]:
+    results = {}
+
+    def record(name: str, func: Callable, rows: int, times: int) -> None:
+        result = _measure(func, times)
+        result["rows"] = rows
+        result["rows_per_s"] = rows / result["median_s"]
+        results[name] = result
+        print(f"{name:<40}{result['median_s'] * 1000:>12.3f}{result['rows_per_s']:>14.0f}")
+
+    print(f"{'case':<40}{'median ms':>12}{'rows/s':>14}")
+    model_registry.evict()
+    record("model.load", lambda: load_pipeline(file_name=model_registry.file_name()), 1, min(repeat, 5))
+
+    pipeline = model_registry.get()
+    data = sample_records(transform_rows)
+    X, _ = prepare_inputs(data, validate=False)
+    for name, step in pipeline.steps[:-1]:
+        record(f"transform.{name}", lambda: step.transform(X), transform_rows, repeat)
+        X = step.transform(X)
+    record("transform.model_rf.predict", lambda: pipeline[-1].predict(X), transform_rows, repeat)
+
+    record("validate_inputs", lambda: validate_inputs(input_df=data), transform_rows, repeat)
+
+    for rows in sizes:
+        batch = sample_records(rows)
+        record(f"make_prediction.{rows}", lambda: make_prediction(input_data=batch), rows,
+               _repeat_for(rows, repeat))
+
+    if api:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        with TestClient(app) as client:
+            # /predict scores a single record; larger requests go to /predict/batch
+            for route, rows in (("predict", 1), ("predict/batch", 100)):
+                batch = sample_records(rows)
+                payload = {"inputs": batch.astype(object).where(batch.notna(), None).to_dict(orient="records")}
+                record(f"api.{route.replace('/', '_')}.{rows}",
+                       lambda: client.post(f"/api/v1/{route}", json=payload).raise_for_status(), rows, repeat)
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> list:
+    """Cases whose median time grew by more than ``tolerance`` over the baseline."""
+    slower = []
+    print(f"\n{'case':<40}{'baseline ms':>12}{'now ms':>12}{'ratio':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median_s"] / baseline[name]["median_s"]
+        flag = "  slower" if ratio > 1 + tolerance else ""
+        print(f"{name:<40}{baseline[name]['median_s'] * 1000:>12.3f}{result['median_s'] * 1000:>12.3f}"
+              f"{ratio:>8.2f}{flag}")
+        if flag:
+            slower.append(name)
+    return slower
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 1_000_000],
+                        help="make_prediction batch sizes")
+    parser.add_argument("--transform-rows", type=int, default=10_000, help="rows for the per-step timings")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-api", action="store_true", help="skip the TestClient cases")
+    parser.add_argument("--output", type=Path, default=None, help="default: benchmarks/results/<commit>.json")
+    parser.add_argument("--baseline", type=Path, default=None, help="results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="also store this run as results/baseline.json")
+    args = parser.parse_args()
+
+    commit = _commit()
+    results = run_suite(sizes=args.sizes, transform_rows=args.transform_rows, repeat=args.repeat, api=not args.no_api)
+    report = {
+        "commit": commit,
+        "model_version": _version,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        (RESULTS_DIR / "baseline.json").write_text(json.dumps(report, indent=2))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        slower = compare(results, baseline["results"], args.tolerance)
+        if slower:
+            print(f"{len(slower)} case(s) slower than {baseline['commit']} by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
-from typing import Dict, List
+import tempfile
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel
 from strictyaml import YAML, load
 
@@ -20,7 +21,11 @@ CONFIG_FILE_PATH = PACKAGE_ROOT / "config.yml"
 #print(CONFIG_FILE_PATH)
 
 DATASET_DIR = PACKAGE_ROOT / "datasets"
+DATASET_CACHE_DIR = DATASET_DIR / "cache"
 TRAINED_MODEL_DIR = PACKAGE_ROOT / "trained_models"
+TUNING_DIR = PACKAGE_ROOT / "tuning"
+# fitted pipeline steps cached by tuning runs, outside the source tree
+TUNING_CACHE_DIR = Path(tempfile.gettempdir()) / "bikerental_model" / "tuning_cache"
 
 
 class AppConfig(BaseModel):
@@ -29,7 +34,11 @@ class AppConfig(BaseModel):
     """
 
     training_data_file: str
+    dataset_cache: bool = False
     pipeline_save_file: str
+    prediction_chunk_size: int
+    forest_engine: Literal["sklearn", "flat"] = "sklearn"
+    serve_optimized_pipeline: bool = False
 
 
 class ModelConfig(BaseModel):
@@ -47,12 +56,26 @@ class ModelConfig(BaseModel):
     holiday_mapping: Dict[str, int]
     workingday_mapping: Dict[str, int]
     hour_mapping: Dict[str, int]
+    weekday_categories: List[str]
+    numeric_ranges: Dict[str, List[float]]
+    copy_free_pipeline: bool = False
+    categorical_encoding: bool = False
   
     test_size:float
     random_state: int
     n_estimators: int
     max_depth: int
     max_features: int
+    n_jobs: Optional[int] = None
+    predict_n_jobs: Optional[int] = None
+    tuning_param_grid: Dict[str, List[int]]
+    tuning_cv_folds: int = 3
+    update_new_trees: int = 10
+    update_max_trees: int = 300
+    update_drift_threshold: float = 3.0
+    evaluation_k_folds: int = 5
+    evaluation_time_splits: int = 4
+    prediction_quantiles: List[float] = [0.1, 0.5, 0.9]
 
   
 # set train/test split
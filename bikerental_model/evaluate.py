@@ -0,0 +1,172 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import datetime
+import json
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import KFold, TimeSeriesSplit, cross_validate
+from sklearn.pipeline import Pipeline
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import TRAINED_MODEL_DIR, config
+from bikerental_model.pipeline import make_bike_pipe
+from bikerental_model.processing.data_manager import load_dataset
+
+SCORING = {
+    "rmse": "neg_root_mean_squared_error",
+    "mae": "neg_mean_absolute_error",
+    "r2": "r2",
+}
+# a metric is a regression when it is worse than the baseline by more than this
+REGRESSION_TOLERANCE = {"rmse": 0.05, "mae": 0.05, "r2": 0.01}
+
+
+def report_file_name(version: str = _version) -> str:
+    return f"{config.app_config_.pipeline_save_file}{version}.metrics.json"
+
+
+def time_splits(dates: pd.Series, n_splits: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Train-on-past / test-on-future folds over whole days of ``dates``."""
+    days = np.sort(dates.unique())
+    for train_days, test_days in TimeSeriesSplit(n_splits=n_splits).split(days):
+        train = np.flatnonzero(dates.isin(days[train_days]).to_numpy())
+        test = np.flatnonzero(dates.isin(days[test_days]).to_numpy())
+        yield train, test
+
+
+def _summarise(results: dict, test_rows: List[int]) -> dict:
+    folds = []
+    for i, rows in enumerate(test_rows):
+        folds.append({
+            "rmse": -results["test_rmse"][i],
+            "mae": -results["test_mae"][i],
+            "r2": results["test_r2"][i],
+            "fit_seconds": results["fit_time"][i],
+            "predict_rows_per_second": rows / results["score_time"][i],
+            "test_rows": rows,
+        })
+    mean = {key: float(np.mean([fold[key] for fold in folds])) for key in folds[0] if key != "test_rows"}
+    return {"folds": folds, "mean": mean}
+
+
+def evaluate_pipeline(
+    *,
+    pipeline: Optional[Pipeline] = None,
+    data: Optional[pd.DataFrame] = None,
+    k_folds: Optional[int] = None,
+    n_time_splits: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+) -> dict:
+    """
+    Cross-validate bike_pipe with shuffled K-fold and time-based splits.
+
+    The folds of each scheme are fitted in parallel on ``n_jobs`` worker
+    processes (each forest on one core). Per fold and on average, the
+    report holds RMSE, MAE and R2 on the held-out rows, the fit time and
+    the prediction throughput.
+    """
+    model_config = config.model_config_
+    if pipeline is None:
+        pipeline = make_bike_pipe(
+            copy_free=model_config.copy_free_pipeline,
+            categorical_encoding=model_config.categorical_encoding,
+        )
+    # a copy, so the caller's pipeline is neither reconfigured nor fitted
+    pipeline = clone(pipeline).set_params(model_rf__n_jobs=1)
+    if data is None:
+        data = load_dataset(file_name=config.app_config_.training_data_file)
+    data = data.reset_index(drop=True)
+    X, y = data[model_config.features], data[model_config.target]
+    n_jobs = model_config.n_jobs if n_jobs is None else n_jobs
+
+    schemes: Dict[str, list] = {
+        "kfold": list(KFold(
+            n_splits=k_folds or model_config.evaluation_k_folds,
+            shuffle=True, random_state=model_config.random_state,
+        ).split(X)),
+        "time_based": list(time_splits(data["dteday"], n_time_splits or model_config.evaluation_time_splits)),
+    }
+    report = {
+        "version": _version,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "rows": len(data),
+        "model_params": {
+            key: value for key, value in pipeline[-1].get_params().items()
+            if key in ("n_estimators", "max_depth", "max_features", "random_state")
+        },
+    }
+    for name, splits in schemes.items():
+        results = cross_validate(pipeline, X, y, cv=splits, scoring=SCORING, n_jobs=n_jobs)
+        report[name] = _summarise(results, [len(test) for _, test in splits])
+    return report
+
+
+def compare_reports(report: dict, baseline: dict) -> List[str]:
+    """List the mean metrics of ``report`` that regressed against ``baseline``."""
+    regressions = []
+    for scheme in ("kfold", "time_based"):
+        current, previous = report[scheme]["mean"], baseline[scheme]["mean"]
+        for metric, tolerance in REGRESSION_TOLERANCE.items():
+            if metric == "r2":
+                worse = previous[metric] - current[metric] > tolerance
+            else:
+                worse = current[metric] > previous[metric] * (1 + tolerance)
+            if worse:
+                regressions.append(
+                    f"{scheme} {metric}: {current[metric]:.4f} vs {previous[metric]:.4f} in {baseline['version']}"
+                )
+    return regressions
+
+
+def run_evaluation(
+    *,
+    version: str = _version,
+    compare_to: Optional[str] = None,
+    output_dir: Union[str, Path, None] = None,
+    **evaluate_kwargs,
+) -> dict:
+    """
+    Evaluate the pipeline and write the report next to the model artifact.
+
+    The report is saved as ``<pipeline_save_file><version>.metrics.json``;
+    remove_old_pipelines keeps these for every version. With
+    ``compare_to``, the mean metrics are checked against that version's
+    report and the regressions are listed under ``"regressions"``.
+    ``evaluate_kwargs`` are passed on to evaluate_pipeline.
+    """
+    output_dir = Path(output_dir or TRAINED_MODEL_DIR)
+    report = evaluate_pipeline(**evaluate_kwargs)
+    report["version"] = version
+
+    for scheme in ("kfold", "time_based"):
+        mean = report[scheme]["mean"]
+        print(f"{scheme}: rmse={mean['rmse']:.2f} mae={mean['mae']:.2f} r2={mean['r2']:.4f} "
+              f"fit={mean['fit_seconds']:.2f}s predict={mean['predict_rows_per_second']:.0f} rows/s")
+    if compare_to is not None:
+        with open(output_dir / report_file_name(compare_to)) as baseline_file:
+            regressions = compare_reports(report, json.load(baseline_file))
+        report["regressions"] = regressions
+        print("Regressions:" if regressions else f"No regressions against {compare_to}")
+        for regression in regressions:
+            print(f"  {regression}")
+
+    with open(output_dir / report_file_name(version), "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validate bike_pipe and write a metrics report.")
+    parser.add_argument("--version", default=_version, help="version the report is written for")
+    parser.add_argument("--compare-to", default=None, help="version whose report is the baseline")
+    args = parser.parse_args()
+
+    run_evaluation(version=args.version, compare_to=args.compare_to)
@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from bikerental_model.metrics import Histogram
+
+SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROWS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+MEMORY_BUCKETS = (0, 2**20, 2**22, 2**24, 2**26, 2**28, 2**30)
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (peak size where /proc is not available)."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageMetrics:
+    """
+    Per-stage wall time, input rows and memory growth, as histograms.
+
+    A stage is a named pipeline step (``weekday_imputation``, ``map_hr``,
+    ``scaler``, ``model_rf``, ...) or one of ``validate_inputs``,
+    ``scoring_plan`` and ``model_load``. Memory growth is the increase of
+    the process's resident set over the stage, so with several inference
+    threads it also counts their allocations. While ``enabled`` is False
+    nothing is measured and stage() costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.seconds: Dict[str, Histogram] = {}
+        self.rows: Dict[str, Histogram] = {}
+        self.memory: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _histograms(self, stage: str):
+        if stage not in self.seconds:
+            with self._lock:
+                if stage not in self.seconds:
+                    self.rows[stage] = Histogram(ROWS_BUCKETS)
+                    self.memory[stage] = Histogram(MEMORY_BUCKETS)
+                    self.seconds[stage] = Histogram(SECONDS_BUCKETS)
+        return self.seconds[stage], self.rows[stage], self.memory[stage]
+
+    def observe(self, stage: str, seconds: float, rows: Optional[int] = None, memory_bytes: int = 0) -> None:
+        seconds_histogram, rows_histogram, memory_histogram = self._histograms(stage)
+        seconds_histogram.observe(seconds)
+        memory_histogram.observe(max(memory_bytes, 0))
+        if rows is not None:
+            rows_histogram.observe(rows)
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        memory_before = _rss_bytes()
+        start = time.perf_counter()
+        yield
+        self.observe(name, time.perf_counter() - start, rows, _rss_bytes() - memory_before)
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            stage: {
+                "seconds": self.seconds[stage].snapshot(),
+                "rows": self.rows[stage].snapshot(),
+                "memory_bytes": self.memory[stage].snapshot(),
+            }
+            for stage in list(self.seconds)
+        }
+
+    def prometheus(self, prefix: str = "bikerental") -> str:
+        """All stage histograms in the Prometheus text exposition format."""
+        families = (
+            ("stage_seconds", "Wall time spent in each prediction stage.", self.seconds),
+            ("stage_rows", "Input rows handed to each prediction stage.", self.rows),
+            ("stage_memory_growth_bytes", "Resident memory growth over each prediction stage.", self.memory),
+        )
+        lines = []
+        for name, help_text, histograms in families:
+            metric = f"{prefix}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for stage, histogram in sorted(histograms.items()):
+                if histogram.count:
+                    lines += histogram.prometheus_lines(metric, {"stage": stage})
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seconds.clear()
+            self.rows.clear()
+            self.memory.clear()
+
+
+stage_metrics = StageMetrics()
+
+
+def predict_with_stages(pipeline: Pipeline, X: pd.DataFrame, model: Any = None) -> np.ndarray:
+    """
+    ``pipeline.predict(X)``, timing every step when stage_metrics is enabled.
+
+    The steps are run one by one exactly as Pipeline.predict runs them;
+    when instrumentation is disabled the pipeline is called directly.
+    ``model`` (e.g. a FlatForest) replaces the final estimator.
+    """
+    if not stage_metrics.enabled:
+        if model is not None:
+            return model.predict(pipeline[:-1].transform(X))
+        return pipeline.predict(X)
+    for name, step in pipeline.steps[:-1]:
+        if step is None or step == "passthrough":
+            continue
+        with stage_metrics.stage(name, len(X)):
+            X = step.transform(X)
+    name, final = pipeline.steps[-1]
+    with stage_metrics.stage(name, len(X)):
+        return (final if model is None else model).predict(X)
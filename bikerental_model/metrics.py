@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+
+class Histogram:
+    """Cumulative-bucket histogram, shaped like a Prometheus histogram."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets: List[float] = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        """Return count, sum, mean and cumulative counts per upper bound."""
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + [float("inf")], self.counts):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "mean": self.sum / self.count if self.count else None,
+                "buckets": cumulative,
+            }
+
+    def prometheus_lines(self, name: str, labels: Optional[Dict[str, str]] = None) -> List[str]:
+        """Render the histogram's samples in the Prometheus text exposition format."""
+        label_text = ",".join(f'{key}="{value}"' for key, value in (labels or {}).items())
+        prefix = f"{label_text}," if label_text else ""
+        snapshot = self.snapshot()
+        lines = [
+            f'{name}_bucket{{{prefix}le="{bound}"}} {count}' for bound, count in snapshot["buckets"].items()
+        ]
+        suffix = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{name}_sum{suffix} {snapshot['sum']}")
+        lines.append(f"{name}_count{suffix} {snapshot['count']}")
+        return lines
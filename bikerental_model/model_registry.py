@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sklearn.pipeline import Pipeline
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import TRAINED_MODEL_DIR, config
+from bikerental_model.instrumentation import stage_metrics
+from bikerental_model.processing.data_manager import load_pipeline
+from bikerental_model.processing.flat_forest import FlatForest
+from bikerental_model.processing.scoring_plan import ScoringPlan
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily populated cache of trained pipelines keyed by version.
+
+    Nothing is read from disk until a version is first requested (or
+    explicitly warmed up); concurrent first requests load it only once.
+    """
+
+    def __init__(self):
+        self._pipelines: Dict[str, Pipeline] = {}
+        self._plans: Dict[str, ScoringPlan] = {}
+        self._forests: Dict[str, FlatForest] = {}
+        self.load_seconds: Dict[str, float] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_name(version: str = _version) -> str:
+        if config.app_config_.serve_optimized_pipeline:
+            return f"{config.app_config_.pipeline_save_file}{version}.optimized.pkl"
+        return f"{config.app_config_.pipeline_save_file}{version}.pkl"
+
+    def get(self, version: str = _version) -> Pipeline:
+        """Return the pipeline for ``version``, loading it on first use."""
+        pipeline = self._pipelines.get(version)
+        if pipeline is None:
+            with self._lock:
+                pipeline = self._pipelines.get(version)
+                if pipeline is None:
+                    modified = (TRAINED_MODEL_DIR / self.file_name(version)).stat().st_mtime_ns
+                    start = time.perf_counter()
+                    with stage_metrics.stage("model_load"):
+                        pipeline = load_pipeline(file_name=self.file_name(version))
+                    # the artifact keeps the n_jobs it was trained with; serve with predict_n_jobs
+                    pipeline[-1].set_params(n_jobs=config.model_config_.predict_n_jobs)
+                    self.load_seconds[version] = time.perf_counter() - start
+                    self._fingerprints[version] = f"{version}-{modified}"
+                    self._pipelines[version] = pipeline
+        return pipeline
+
+    def scoring_plan(self, version: str = _version) -> ScoringPlan:
+        """Return the compiled ScoringPlan for ``version``."""
+        plan = self._plans.get(version)
+        if plan is None:
+            pipeline = self.get(version)
+            # flat_forest() takes the lock too: build the model before holding it
+            model = self.forest_model(version)
+            with self._lock:
+                plan = self._plans.get(version)
+                if plan is None:
+                    plan = self._plans[version] = ScoringPlan(pipeline, model=model)
+        return plan
+
+    def flat_forest(self, version: str = _version) -> FlatForest:
+        """Return the pipeline's forest of ``version`` exported into a FlatForest."""
+        forest = self._forests.get(version)
+        if forest is None:
+            pipeline = self.get(version)
+            with self._lock:
+                forest = self._forests.get(version)
+                if forest is None:
+                    forest = self._forests[version] = FlatForest(pipeline[-1])
+        return forest
+
+    def forest_model(self, version: str = _version) -> Optional[FlatForest]:
+        """The FlatForest to score ``version`` with, or None when forest_engine is sklearn."""
+        if config.app_config_.forest_engine == "flat":
+            return self.flat_forest(version)
+        return None
+
+    def fingerprint(self, version: str = _version) -> str:
+        """Identify the loaded artifact of ``version``; changes whenever the model is re-saved."""
+        self.get(version)
+        return self._fingerprints[version]
+
+    def warm_up(self, version: str = _version) -> None:
+        """Load the pipeline and compile its scoring plan ahead of the first request."""
+        self.scoring_plan(version)
+
+    def is_ready(self, version: str = _version) -> bool:
+        return version in self._pipelines
+
+    def evict(self, version: Optional[str] = None) -> None:
+        """Drop one cached version (or all of them) so it is reloaded on next use."""
+        with self._lock:
+            for cache in (self._pipelines, self._plans, self._forests, self.load_seconds, self._fingerprints):
+                if version is None:
+                    cache.clear()
+                else:
+                    cache.pop(version, None)
+
+
+model_registry = ModelRegistry()
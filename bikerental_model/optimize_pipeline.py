@@ -0,0 +1,217 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import copy
+import os
+import time
+from typing import List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import TRAINED_MODEL_DIR, config
+from bikerental_model.predict import prepare_inputs
+from bikerental_model.processing.data_manager import load_pipeline, load_raw_dataset
+from bikerental_model.processing.features import WeekdayImputer
+from bikerental_model.processing.features import WeathersitImputer
+from bikerental_model.processing.features import CategoricalEncoder
+from bikerental_model.processing.features import Mapper
+from bikerental_model.processing.features import MultiColumnMapper
+from bikerental_model.processing.features import OutlierHandler
+from bikerental_model.processing.features import WeekdayOneHotEncoder
+from bikerental_model.processing.features import NumericColumnSelector
+
+
+def _is_live(variables: List[str], selected: List[str]) -> bool:
+    """Whether any model feature is one of ``variables`` or derived from one (``<variable>_...``)."""
+    return any(column == variable or column.startswith(f"{variable}_") for variable in variables for column in selected)
+
+
+def _unclipped_threshold(threshold: float, mean: float, scale: float, lower: float, upper: float) -> float:
+    """
+    The split on a scaled but unclipped feature equivalent to ``threshold``.
+
+    The scaling and sklearn's float32 cast are both monotonic, so clipping
+    to ``[lower, upper]`` only matters for a split outside the bounds: it
+    sends every row right when even ``lower`` goes right, and every row
+    left when even ``upper`` goes left. Any other split is unchanged. The
+    scaling itself is not folded: the scaled float64 value is rounded to
+    float32, which no threshold on the raw value reproduces exactly.
+    """
+    def goes_left(value: float) -> bool:
+        return bool(np.float32((value - mean) / scale) <= threshold)
+
+    if not goes_left(lower):
+        return -np.inf
+    if goes_left(upper):
+        return np.inf
+    return threshold
+
+
+def _fold_into_forest(
+    model: RandomForestRegressor, columns: List[str], scaler: Optional[StandardScaler], bounds: dict
+) -> RandomForestRegressor:
+    """Copy of ``model`` whose split thresholds apply to unclipped features."""
+    folded = copy.deepcopy(model)
+    n_features = len(columns)
+    mean = np.zeros(n_features) if scaler is None or not scaler.with_mean else scaler.mean_
+    scale = np.ones(n_features) if scaler is None or not scaler.with_std else scaler.scale_
+    limits = [bounds.get(column, (-np.inf, np.inf)) for column in columns]
+
+    for estimator in folded.estimators_:
+        tree = estimator.tree_
+        thresholds = tree.threshold  # a view: writes go to the tree's node array
+        for node in np.flatnonzero(tree.children_left != -1):
+            feature = tree.feature[node]
+            lower, upper = map(float, limits[feature])
+            if np.isfinite(lower) or np.isfinite(upper):
+                thresholds[node] = _unclipped_threshold(thresholds[node], mean[feature], scale[feature], lower, upper)
+    return folded
+
+
+def optimize_pipeline(pipeline: Pipeline) -> Tuple[Pipeline, dict]:
+    """
+    Rewrite a fitted bike_pipe into an equivalent, shorter pipeline.
+
+    - Steps whose output columns the NumericColumnSelector drops (the
+      weekday imputation and one-hot encoding) are removed.
+    - Consecutive ordinal Mappers, and the ordinal part of a
+      CategoricalEncoder, become a single MultiColumnMapper lookup stage.
+    - The OutlierHandler clipping is folded into the forest's split
+      thresholds. The StandardScaler is kept: folding it would change
+      predictions near a split (see _unclipped_threshold).
+
+    Any other step is kept as it is. Returns the new pipeline and a report
+    of the steps before and after.
+    """
+    *transformers, (model_name, model) = pipeline.steps
+    selectors = [step for _, step in transformers if isinstance(step, NumericColumnSelector)]
+    if len(selectors) != 1:
+        raise ValueError("Only pipelines with one NumericColumnSelector can be optimized")
+    selected = list(selectors[0].numeric_columns)
+
+    steps, removed = [], []
+    scaler, bounds = None, {}
+    for name, step in transformers:
+        if isinstance(step, (WeekdayImputer, WeathersitImputer, WeekdayOneHotEncoder)):
+            if _is_live([step.variables], selected):
+                steps.append((name, step))
+            else:
+                removed.append(name)
+        elif isinstance(step, (Mapper, MultiColumnMapper, CategoricalEncoder)):
+            if isinstance(step, Mapper):
+                mappings = {step.variables: step.mappings}
+            elif isinstance(step, MultiColumnMapper):
+                mappings = dict(step.mappings)
+            else:
+                if step.one_hot and _is_live(list(step.one_hot), selected):
+                    steps.append((name, step))
+                    continue
+                mappings = dict(step.ordinal)
+            if steps and steps[-1][0] == "map_categoricals":
+                steps[-1][1].mappings.update(mappings)
+            else:
+                steps.append(("map_categoricals", MultiColumnMapper(mappings)))
+            removed.append(name)
+        elif isinstance(step, OutlierHandler):
+            bounds.update(step.bounds)
+            removed.append(name)
+        elif isinstance(step, StandardScaler):
+            scaler = step
+            steps.append((name, step))
+        else:
+            steps.append((name, step))
+    steps.append((model_name, _fold_into_forest(model, selected, scaler, bounds)))
+
+    report = {
+        "steps_before": [name for name, _ in pipeline.steps],
+        "steps_after": [name for name, _ in steps],
+        "removed": removed,
+    }
+    return Pipeline(steps), report
+
+
+def numeric_sweep(X: pd.DataFrame, step: float = 0.01) -> pd.DataFrame:
+    """
+    Copies of the rows of ``X`` with one numeric feature swept over its accepted range.
+
+    Every value of ``numeric_ranges`` on a ``step`` grid is tried, so values
+    between the training data's and near every split are covered.
+    """
+    sweeps = []
+    for column, (low, high) in config.model_config_.numeric_ranges.items():
+        values = np.round(np.arange(low, high + step, step), 2)
+        sweep = X.loc[X.index.repeat(len(values))].reset_index(drop=True)
+        sweep[column] = np.tile(values, len(X))
+        sweeps.append(sweep)
+    return pd.concat(sweeps, ignore_index=True)
+
+
+def _median_ms(func, repeat: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def run_optimization(*, version: str = _version, repeat: int = 50) -> dict:
+    """
+    Optimize the saved pipeline of ``version`` and save it as a separate artifact.
+
+    The optimized pipeline must reproduce the original's predictions on the
+    training data, and on a few of its rows swept over every numeric value
+    (numeric_sweep), before it is written to ``<pipeline_save_file><version>
+    .optimized.pkl``; serve it with ``serve_optimized_pipeline``. The report
+    adds the per-request times of both pipelines at 1 and 100 rows.
+    """
+    pipeline = load_pipeline(file_name=f"{config.app_config_.pipeline_save_file}{version}.pkl")
+    optimized, report = optimize_pipeline(pipeline)
+
+    data = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    X, _ = prepare_inputs(data, validate=False)
+    check = pd.concat([X, numeric_sweep(X.iloc[:3])], ignore_index=True)
+    difference = np.abs(optimized.predict(check) - pipeline.predict(check)).max()
+    if difference > 1e-9:
+        raise ValueError(f"Optimized pipeline differs from the original by up to {difference}")
+    report["max_abs_difference"] = float(difference)
+
+    for rows in (1, 100):
+        batch = X.iloc[:rows]
+        original_ms = _median_ms(lambda: pipeline.predict(batch), repeat)
+        optimized_ms = _median_ms(lambda: optimized.predict(batch), repeat)
+        report[f"ms_per_request_{rows}_rows"] = {"original": original_ms, "optimized": optimized_ms}
+
+    save_path = TRAINED_MODEL_DIR / f"{config.app_config_.pipeline_save_file}{version}.optimized.pkl"
+    tmp_path = save_path.with_name(f".{save_path.name}.tmp")
+    joblib.dump(optimized, tmp_path, compress=0)
+    os.replace(tmp_path, save_path)
+    report["file"] = str(save_path)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold the redundant stages of a trained pipeline into its model.")
+    parser.add_argument("--version", default=_version)
+    args = parser.parse_args()
+
+    report = run_optimization(version=args.version)
+    print(f"Steps: {len(report['steps_before'])} -> {len(report['steps_after'])} "
+          f"(removed or folded: {', '.join(report['removed'])})")
+    print(f"Kept: {', '.join(report['steps_after'])}")
+    for rows in (1, 100):
+        timing = report[f"ms_per_request_{rows}_rows"]
+        print(f"{rows:>3} rows: {timing['original']:.3f} ms -> {timing['optimized']:.3f} ms "
+              f"({timing['original'] - timing['optimized']:.3f} ms removed)")
+    print(f"Max abs difference {report['max_abs_difference']:.2e}; saved to {report['file']}")
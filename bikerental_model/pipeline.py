@@ -11,28 +11,65 @@ from sklearn.ensemble import RandomForestRegressor
 from bikerental_model.config.core import config
 from bikerental_model.processing.features import WeekdayImputer
 from bikerental_model.processing.features import WeathersitImputer
+from bikerental_model.processing.features import CategoricalEncoder
 from bikerental_model.processing.features import Mapper
+from bikerental_model.processing.features import MultiColumnMapper
 from bikerental_model.processing.features import OutlierHandler
 from bikerental_model.processing.features import WeekdayOneHotEncoder
 from bikerental_model.processing.features import NumericColumnSelector
 
-bike_pipe = Pipeline([
-    ('weekday_imputation', WeekdayImputer('weekday')),
-    ('weathersit_imputation', WeathersitImputer('weathersit')),
-    ('map_yr', Mapper('yr',config.model_config_.year_mapping)),
-    ('map_mnth', Mapper('mnth',config.model_config_.month_mappings)),
-    ('map_season', Mapper('season',config.model_config_.season_mappings)),
-    ('map_weathersit', Mapper('weathersit',config.model_config_.weather_mappings)),
-    ('map_holiday', Mapper('holiday',config.model_config_.holiday_mapping)),
-    ('map_workingday', Mapper('workingday',config.model_config_.workingday_mapping)),
-    ('map_hr', Mapper('hr',config.model_config_.hour_mapping)),
-    ('outlier_handler', OutlierHandler(variables=['temp', 'atemp', 'hum', 'windspeed'], method='iqr', factor=1.5)),
-    ('weekday_encoder', WeekdayOneHotEncoder(variables='weekday')),
-    # Drop non-numeric columns
-    ('numeric_selector', NumericColumnSelector()), 
-    # # scale
-    ('scaler', StandardScaler()),
-
-    # Model fit
-    ('model_rf', RandomForestRegressor(n_estimators=150, max_depth=5,random_state=42))
-    ])
+def make_bike_pipe(*, copy_free: bool = False, categorical_encoding: bool = False) -> Pipeline:
+    """Build the (unfitted) bike rental pipeline.
+
+    With ``copy_free`` the first step copies the input frame once and every
+    later step works in place on that pipeline-owned copy; the seven
+    ordinal mappings are also applied by a single MultiColumnMapper step.
+    With ``categorical_encoding`` the mappings and the weekday one-hot
+    encoding are done by one CategoricalEncoder step instead.
+    """
+    model_config = config.model_config_
+    mappings = {
+        'yr': model_config.year_mapping,
+        'mnth': model_config.month_mappings,
+        'season': model_config.season_mappings,
+        'weathersit': model_config.weather_mappings,
+        'holiday': model_config.holiday_mapping,
+        'workingday': model_config.workingday_mapping,
+        'hr': model_config.hour_mapping,
+    }
+    one_hot = {'weekday': model_config.weekday_categories}
+    if categorical_encoding:
+        mapping_steps = [('categorical_encoder', CategoricalEncoder(mappings, one_hot, copy=not copy_free))]
+    elif copy_free:
+        mapping_steps = [('map_categoricals', MultiColumnMapper(mappings, copy=False))]
+    else:
+        mapping_steps = [(f'map_{variable}', Mapper(variable, mapping)) for variable, mapping in mappings.items()]
+
+    return Pipeline([
+        ('weekday_imputation', WeekdayImputer('weekday')),
+        ('weathersit_imputation', WeathersitImputer('weathersit', copy=not copy_free)),
+        *mapping_steps,
+        ('outlier_handler', OutlierHandler(variables=['temp', 'atemp', 'hum', 'windspeed'], method='iqr', factor=1.5, copy=not copy_free)),
+        *([] if categorical_encoding else [
+            ('weekday_encoder', WeekdayOneHotEncoder(variables='weekday', copy=not copy_free)),
+        ]),
+        # Drop non-numeric columns
+        ('numeric_selector', NumericColumnSelector()), 
+        # # scale
+        ('scaler', StandardScaler()),
+
+        # Model fit
+        ('model_rf', RandomForestRegressor(
+            n_estimators=model_config.n_estimators,
+            max_depth=model_config.max_depth,
+            max_features=model_config.max_features,
+            random_state=model_config.random_state,
+            n_jobs=model_config.n_jobs,
+        ))
+        ])
+
+
+bike_pipe = make_bike_pipe(
+    copy_free=config.model_config_.copy_free_pipeline,
+    categorical_encoding=config.model_config_.categorical_encoding,
+)
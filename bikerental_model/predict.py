@@ -4,39 +4,312 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
-from typing import Union
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import pandas as pd
 import numpy as np
 
 from bikerental_model import __version__ as _version
 from bikerental_model.config.core import config
+from bikerental_model.instrumentation import predict_with_stages, stage_metrics
 from bikerental_model.pipeline import bike_pipe
-from bikerental_model.processing.data_manager import load_pipeline
+from bikerental_model.model_registry import model_registry
+from bikerental_model.prediction_cache import PredictionCache
 from bikerental_model.processing.data_manager import pre_pipeline_preparation
+from bikerental_model.processing.forecast import HOURS_PER_DAY, forecast_grid
+from bikerental_model.processing.scoring_plan import ScoringPlan, UnsupportedRecordError, single_record
 from bikerental_model.processing.validation import validate_inputs
 import datetime
 
 
-pipeline_file_name = f"{config.app_config_.pipeline_save_file}{_version}.pkl"
+pipeline_file_name = model_registry.file_name(_version)
 #print(pipeline_file_name)
-bikerental_pipeline= load_pipeline(file_name=pipeline_file_name)
 
 
-def make_prediction(*,input_data:Union[pd.DataFrame, dict]) -> dict:
-    """Make a prediction using a saved model """
-    input_df = pd.DataFrame(input_data)
-    validated_data, errors = validate_inputs(input_df=input_df)
-    results = {"predictions": None, "version": _version, "errors": errors}
-    validated_data=validated_data.reindex(columns=config.model_config_.features)
-    
-    predictions = bikerental_pipeline.predict(validated_data)    
-    results = {"predictions": predictions,"version": _version, "errors": errors}    
+def __getattr__(name: str):
+    # the trained pipeline is loaded lazily, on first access
+    if name == "bikerental_pipeline":
+        return model_registry.get(_version)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _predict_rows(pipeline, validated_data: pd.DataFrame, cache: Optional[PredictionCache] = None) -> np.ndarray:
+    """Run the pipeline on prepared rows, through the prediction cache when there is one.
+
+    The forest is scored by the engine chosen with ``forest_engine``.
+    """
+    model = model_registry.forest_model(_version)
+    if cache is None:
+        return predict_with_stages(pipeline, validated_data, model)
+    namespace = model_registry.fingerprint(_version)
+    return cache.predict_rows(validated_data, namespace, lambda rows: predict_with_stages(pipeline, rows, model))
+
+
+def _predict_record(plan: ScoringPlan, record: Mapping) -> np.ndarray:
+    with stage_metrics.stage("scoring_plan", 1):
+        return plan.predict(record)
+
+
+def quantile_label(quantile: float) -> str:
+    """Name of a quantile in the results, e.g. 0.1 -> "p10"."""
+    return f"p{quantile * 100:g}"
+
+
+def _tree_quantiles(features: np.ndarray, quantiles: Sequence[float]) -> Tuple[np.ndarray, dict]:
+    """Point predictions and quantiles of the per-tree predictions for model-ready features.
+
+    All trees are evaluated in one vectorized pass by the FlatForest of the
+    loaded model; the point prediction is the mean over the trees, summed
+    tree by tree like the forest's own predict so that it matches exactly.
+    """
+    trees = model_registry.flat_forest(_version).tree_predictions(features)
+    bands = np.quantile(trees, quantiles, axis=1)
+    predictions = np.ascontiguousarray(trees.T).sum(axis=0) / trees.shape[1]
+    return predictions, {quantile_label(q): band for q, band in zip(quantiles, bands)}
+
+
+def _interval_prediction(input_data, quantiles: Sequence[float], validate: bool) -> dict:
+    """Score inputs with quantiles; single records the ScoringPlan can encode skip pandas."""
+    features = None
+    record = single_record(input_data)
+    if record is not None:
+        try:
+            features = get_scoring_plan().encode(record)
+        except UnsupportedRecordError:
+            validate = True
+    if features is None:
+        validated_data, errors = prepare_inputs(pd.DataFrame(input_data), validate)
+        if errors is not None:
+            return {"predictions": None, "quantiles": None, "version": _version, "errors": errors}
+        features = model_registry.get(_version)[:-1].transform(validated_data)
+    predictions, bands = _tree_quantiles(features, quantiles)
+    return {"predictions": predictions, "quantiles": bands, "version": _version, "errors": None}
+
+
+def get_scoring_plan() -> ScoringPlan:
+    """Return the array-native scoring plan compiled from the loaded pipeline."""
+    return model_registry.scoring_plan(_version)
+
+
+def prepare_inputs(input_df: pd.DataFrame, validate: bool = True) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Derive the model features from raw inputs, validating them unless told they are trusted.
+
+    Returns the frame bike_pipe expects (the configured features, in order;
+    absent columns are all missing) and the validation errors, or None.
+    """
+    if validate:
+        with stage_metrics.stage("validate_inputs", len(input_df)):
+            validated_data, errors = validate_inputs(input_df=input_df)
+    else:
+        validated_data, errors = pre_pipeline_preparation(data_frame=input_df), None
+    features = config.model_config_.features
+    absent = [column for column in features if column not in validated_data.columns]
+    validated_data = validated_data.reindex(columns=features)
+    for column in absent:
+        # an absent categorical column is all missing: object, so the imputers can fill in labels
+        if column not in config.model_config_.numeric_ranges:
+            validated_data[column] = validated_data[column].astype(object)
+    return validated_data, errors
+
+
+def make_prediction(
+    *,
+    input_data: Union[pd.DataFrame, dict],
+    fast_path: bool = True,
+    cache: Optional[PredictionCache] = None,
+    quantiles: Optional[Sequence[float]] = None,
+) -> dict:
+    """Make a prediction using a saved model
+
+    Single records are scored through the compiled ScoringPlan unless
+    ``fast_path`` is False; anything the plan cannot encode falls back to
+    the validated pandas pipeline. Inputs that fail validation are not
+    scored: ``"predictions"`` is None and ``"errors"`` holds the JSON list
+    of errors. With a ``cache``, rows predicted before by the same model
+    are served from it and only the misses are scored.
+    With ``quantiles`` (e.g. [0.1, 0.5, 0.9]) the results also hold
+    ``"quantiles"``: {"p10": ..., ...}, the quantiles over the forest's
+    per-tree predictions of every row; the cache is not used then.
+    """
+    if quantiles is not None:
+        return _interval_prediction(input_data, quantiles, validate=True)
+
+    predictions = None
+    errors = None
+    record = single_record(input_data) if fast_path else None
+    if record is not None:
+        plan = get_scoring_plan()
+        try:
+            if cache is None:
+                predictions = _predict_record(plan, record)
+            else:
+                namespace = model_registry.fingerprint(_version)
+                predictions = cache.predict_record(record, namespace, lambda: _predict_record(plan, record))
+        except UnsupportedRecordError:
+            predictions = None
+
+    if predictions is None:
+        input_df = pd.DataFrame(input_data)
+        validated_data, errors = prepare_inputs(input_df)
+
+        if errors is None:
+            pipeline = model_registry.get(_version)
+            predictions = _predict_rows(pipeline, validated_data, cache)
+    results = {"predictions": predictions,"version": _version, "errors": errors}
 
     print("Predictions", predictions)
     print("Errors", errors)
 
     return results
 
+
+def make_trusted_prediction(
+    *,
+    input_data: Union[Sequence[Mapping], Mapping[str, Sequence]],
+    cache: Optional[PredictionCache] = None,
+    quantiles: Optional[Sequence[float]] = None,
+) -> dict:
+    """Make a prediction for inputs that were already validated upstream
+
+    ``input_data`` is a list of records or a columnar dict of equal-length
+    lists, e.g. straight from the API request schema; dates may be
+    ``datetime.date`` objects or YYYY-MM-DD strings. Nothing is validated
+    or re-encoded. A single record the ScoringPlan cannot encode is handed
+    to make_prediction, which validates it and reports the errors.
+    ``quantiles`` works as in make_prediction.
+    """
+    if quantiles is not None:
+        return _interval_prediction(input_data, quantiles, validate=False)
+
+    record = single_record(input_data)
+    if record is not None:
+        plan = get_scoring_plan()
+        try:
+            if cache is None:
+                predictions = _predict_record(plan, record)
+            else:
+                namespace = model_registry.fingerprint(_version)
+                predictions = cache.predict_record(record, namespace, lambda: _predict_record(plan, record))
+        except UnsupportedRecordError:
+            return make_prediction(input_data=pd.DataFrame(input_data), fast_path=False, cache=cache)
+        return {"predictions": predictions, "version": _version, "errors": None}
+
+    validated_data, _ = prepare_inputs(pd.DataFrame(input_data), validate=False)
+    predictions = _predict_rows(model_registry.get(_version), validated_data, cache)
+    return {"predictions": predictions, "version": _version, "errors": None}
+
+
+def make_grouped_prediction(
+    *, input_data: List[pd.DataFrame], validate: bool = True, cache: Optional[PredictionCache] = None
+) -> List[dict]:
+    """Score several independent requests with one vectorized pipeline call.
+
+    Results are returned in request order. If the combined batch fails
+    validation, every request is scored on its own so that validation
+    errors are reported only to the request that caused them. Pass
+    ``validate=False`` for inputs that were already validated upstream.
+    With a ``cache``, only the rows it misses are scored.
+    """
+    combined = pd.concat(input_data, ignore_index=True)
+    validated_data, errors = prepare_inputs(combined, validate)
+    if errors is not None:
+        return [make_prediction(input_data=input_df, fast_path=False, cache=cache) for input_df in input_data]
+
+    predictions = _predict_rows(model_registry.get(_version), validated_data, cache)
+    splits = np.cumsum([len(input_df) for input_df in input_data])[:-1]
+    return [
+        {"predictions": group, "version": _version, "errors": None}
+        for group in np.split(predictions, splits)
+    ]
+
+
+def iter_batch_predictions(
+    *,
+    input_data: Union[pd.DataFrame, dict],
+    chunk_size: Optional[int] = None,
+    cache: Optional[PredictionCache] = None,
+    validate: bool = True,
+    quantiles: Optional[Sequence[float]] = None,
+) -> Iterator[dict]:
+    """Score a large batch in fixed-size vectorized chunks.
+
+    Yields one result per chunk; ``offset`` is the position of the chunk's
+    first row in the input, and any validation errors refer to rows
+    relative to that offset. Chunks with errors are not scored. Pass
+    ``validate=False`` for inputs that were already validated upstream.
+    With ``quantiles`` each chunk also holds the per-tree quantiles, as in
+    make_prediction.
+    """
+    input_df = pd.DataFrame(input_data)
+    chunk_size = chunk_size or config.app_config_.prediction_chunk_size
+    for offset in range(0, len(input_df), chunk_size):
+        chunk = input_df.iloc[offset:offset + chunk_size]
+        validated_data, errors = prepare_inputs(chunk, validate)
+        predictions, bands = None, None
+        if errors is None and quantiles is not None:
+            features = model_registry.get(_version)[:-1].transform(validated_data)
+            predictions, bands = _tree_quantiles(features, quantiles)
+        elif errors is None:
+            predictions = _predict_rows(model_registry.get(_version), validated_data, cache)
+        result: Dict[str, Any] = {"offset": offset, "predictions": predictions, "version": _version, "errors": errors}
+        if quantiles is not None:
+            result["quantiles"] = bands
+        yield result
+
+
+def make_batch_prediction(
+    *,
+    input_data: Union[pd.DataFrame, dict],
+    chunk_size: Optional[int] = None,
+    cache: Optional[PredictionCache] = None,
+    validate: bool = True,
+    quantiles: Optional[Sequence[float]] = None,
+) -> dict:
+    """Make predictions for a large batch, scoring it chunk by chunk."""
+    chunks: List[np.ndarray] = []
+    bands: List[dict] = []
+    for chunk in iter_batch_predictions(
+        input_data=input_data, chunk_size=chunk_size, cache=cache, validate=validate, quantiles=quantiles
+    ):
+        if chunk["errors"] is not None:
+            return {"predictions": None, "version": _version, "errors": chunk["errors"], "offset": chunk["offset"]}
+        chunks.append(chunk["predictions"])
+        if quantiles is not None:
+            bands.append(chunk["quantiles"])
+
+    predictions = np.concatenate(chunks) if chunks else np.empty(0)
+    results: Dict[str, Any] = {"predictions": predictions, "version": _version, "errors": None}
+    if quantiles is not None:
+        results["quantiles"] = {
+            quantile_label(q): np.concatenate([band[quantile_label(q)] for band in bands]) if bands else np.empty(0)
+            for q in quantiles
+        }
+    return results
+
+
+def make_forecast(
+    *,
+    start: Union[str, datetime.date],
+    end: Union[str, datetime.date],
+    weather: Mapping[str, Sequence],
+    validate: bool = True,
+    quantiles: Optional[Sequence[float]] = None,
+) -> dict:
+    """Hourly predictions for every day from ``start`` to ``end`` (inclusive).
+
+    ``weather`` maps each of temp, atemp, hum, windspeed and weathersit to
+    one value per hour of the range, day by day from 12am. The date x hour
+    grid and its calendar features are built in bulk (processing/forecast.py)
+    and scored as one batch; the results add ``timestamps``, the start of
+    each predicted hour. ``validate`` and ``quantiles`` work as in
+    make_batch_prediction.
+    """
+    grid = forecast_grid(start, end, weather)
+    results = make_batch_prediction(input_data=grid, validate=validate, quantiles=quantiles)
+    hours = np.tile(np.arange(HOURS_PER_DAY), len(grid) // HOURS_PER_DAY).astype("timedelta64[h]")
+    results["timestamps"] = grid["dteday"].to_numpy() + hours
+    return results
+
 if __name__ == "__main__":
 
     #data_in={'dteday':["2012-11-05"],'season':["winter"],'hr':["2am"],'holiday':["No"],'weekday':["Mon"],
@@ -0,0 +1,198 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.dates import date_parts
+from bikerental_model.processing.scoring_plan import UnsupportedRecordError, _is_missing
+
+NUMERIC_FEATURES = ("temp", "atemp", "hum", "windspeed")
+
+
+def _canonical(column: str, value: Any) -> Any:
+    if _is_missing(value) or value is pd.NaT:
+        return None
+    if column in NUMERIC_FEATURES:
+        return float(value)
+    return str(value)
+
+
+def _hash(values: Iterable) -> str:
+    return hashlib.blake2b(repr(tuple(values)).encode(), digest_size=16).hexdigest()
+
+
+def row_keys(validated_data: pd.DataFrame) -> List[str]:
+    """Canonical hash of every validated feature row (after pre_pipeline_preparation)."""
+    columns = []
+    for column in config.model_config_.features:
+        series = validated_data[column]
+        if column == "dteday":
+            series = series.to_numpy().astype("datetime64[D]").astype(str)
+            values = [None if value == "NaT" else value for value in series.tolist()]
+        else:
+            values = [_canonical(column, value) for value in series.tolist()]
+        columns.append(values)
+    return [_hash(row) for row in zip(*columns)]
+
+
+def record_key(record: Mapping) -> str:
+    """Canonical hash of a raw record; equal to row_keys() of the same record once validated."""
+    try:
+        date_value: Any = record.get("dteday")
+        if not isinstance(date_value, str):
+            date_value = date_value.isoformat()[:10]
+        year, month, _ = date_parts(date_value)
+        derived = {"dteday": date_value, "yr": year, "mnth": month}
+        values = [
+            derived[column] if column in derived else _canonical(column, record.get(column))
+            for column in config.model_config_.features
+        ]
+    except (AttributeError, TypeError, ValueError) as error:
+        raise UnsupportedRecordError(f"Cannot build a cache key: {error}") from error
+    return _hash(values)
+
+
+class LocalCacheBackend:
+    """In-process LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_size: int = 100000, ttl: Optional[float] = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> List[Optional[float]]:
+        now = time.monotonic()
+        values: List[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None and entry[1] < now:
+                    del self._entries[key]
+                    entry = None
+                if entry is None:
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    values.append(entry[0])
+        return values
+
+    def set_many(self, items: Dict[str, float]) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (value, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache shared across workers, stored in Redis (needs the optional ``redis`` package)."""
+
+    def __init__(self, url: str, ttl: Optional[float] = 3600.0, prefix: str = "bikerental:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.evictions = 0  # eviction is left to the Redis maxmemory policy
+
+    def get_many(self, keys: List[str]) -> List[Optional[float]]:
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [None if value is None else float(value) for value in values]
+
+    def set_many(self, items: Dict[str, float]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self.prefix + key, repr(value), ex=int(self.ttl) if self.ttl else None)
+        pipe.execute()
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*"))
+
+
+class PredictionCache:
+    """
+    Predicted-demand cache in front of the pipeline.
+
+    Keys are canonical hashes of validated feature rows, prefixed with a
+    namespace identifying the model (its version and artifact), so entries
+    written for an older model are never returned for a newer one.
+    """
+
+    def __init__(self, backend: Any = None):
+        self.backend = backend if backend is not None else LocalCacheBackend()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def predict_record(self, record: Mapping, namespace: str, predict: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the cached prediction for one raw record, calling ``predict`` on a miss."""
+        key = f"{namespace}:{record_key(record)}"
+        value = self.backend.get_many([key])[0]
+        if value is not None:
+            self._count(1, 0)
+            return np.array([value])
+        self._count(0, 1)
+        predictions = predict()
+        self.backend.set_many({key: float(predictions[0])})
+        return predictions
+
+    def predict_rows(
+        self, validated_data: pd.DataFrame, namespace: str, predict: Callable[[pd.DataFrame], np.ndarray]
+    ) -> np.ndarray:
+        """Return predictions for validated rows, scoring only the cache misses with ``predict``."""
+        keys = [f"{namespace}:{key}" for key in row_keys(validated_data)]
+        cached = self.backend.get_many(keys)
+        predictions = np.array([np.nan if value is None else value for value in cached], dtype=float)
+        missing = np.flatnonzero([value is None for value in cached])
+        self._count(len(keys) - len(missing), len(missing))
+        if len(missing):
+            predictions[missing] = predict(validated_data.iloc[missing])
+            self.backend.set_many({keys[i]: float(predictions[i]) for i in missing})
+        return predictions
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "size": len(self.backend),
+            "evictions": self.backend.evictions,
+        }
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = self.misses = 0
@@ -4,6 +4,7 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
+import os
 import re
 import joblib
 import pandas as pd
@@ -11,7 +12,9 @@ import typing as t
 from sklearn.pipeline import Pipeline
 
 from bikerental_model import __version__ as _version
-from bikerental_model.config.core import DATASET_DIR, TRAINED_MODEL_DIR, config
+from bikerental_model.config.core import DATASET_CACHE_DIR, DATASET_DIR, TRAINED_MODEL_DIR, config
+from bikerental_model.processing.dataset_cache import read_csv_cached
+from bikerental_model.processing.dates import date_features
 
 
 ##  Pre-Pipeline Preparation
@@ -20,12 +23,13 @@ from bikerental_model.config.core import DATASET_DIR, TRAINED_MODEL_DIR, config
 def get_year_and_month(dataframe):
 
     df = dataframe.copy()
+    # parse each distinct 'dteday' once and broadcast the date features
+    dates = date_features(df['dteday'])
     # convert 'dteday' column to Datetime datatype
-    df['dteday'] = pd.to_datetime(df['dteday'], format='%Y-%m-%d')
+    df['dteday'] = dates['dteday']
     # Add new features 'yr' and 'mnth
-    df['yr'] = df['dteday'].dt.year
-    df['yr'] = df['yr'].astype('str')
-    df['mnth'] = df['dteday'].dt.month_name()
+    df['yr'] = dates['yr']
+    df['mnth'] = dates['mnth']
 
     return df
 
@@ -39,38 +43,62 @@ def pre_pipeline_preparation(*, data_frame: pd.DataFrame) -> pd.DataFrame:
 
 
 
+def _read_dataset(file_name: str, categorical: bool) -> pd.DataFrame:
+    path = Path(f"{DATASET_DIR}/{file_name}")
+    if config.app_config_.dataset_cache:
+        return read_csv_cached(path, DATASET_CACHE_DIR, categorical=categorical)
+    return pd.read_csv(path)
+
 def load_raw_dataset(*, file_name: str) -> pd.DataFrame:
-    dataframe = pd.read_csv(Path(f"{DATASET_DIR}/{file_name}"))
+    # raw input records: string columns stay object, as the API and validation expect
+    dataframe = _read_dataset(file_name, categorical=False)
     return dataframe
 
 def load_dataset(*, file_name: str) -> pd.DataFrame:
-    dataframe = pd.read_csv(Path(f"{DATASET_DIR}/{file_name}"))
+    # training data: string columns are kept categorical when cached
+    dataframe = _read_dataset(file_name, categorical=True)
     transformed = pre_pipeline_preparation(data_frame=dataframe)
     return transformed
 
-def save_pipeline(*, pipeline_to_persist: Pipeline) -> None:
+def save_pipeline(*, pipeline_to_persist: Pipeline, version: str = _version) -> None:
     """Persist the pipeline.
     Saves the versioned model, and overwrites any previous
     saved models. This ensures that when the package is
     published, there is only one trained model that can be
     called, and we know exactly how it was built.
+    An incremental update (``version`` other than the package
+    version) also keeps the base model it was derived from.
     """
 
     # Prepare versioned save file name
-    save_file_name = f"{config.app_config_.pipeline_save_file}{_version}.pkl"
+    save_file_name = f"{config.app_config_.pipeline_save_file}{version}.pkl"
     save_path = TRAINED_MODEL_DIR / save_file_name
 
-    remove_old_pipelines(files_to_keep=[save_file_name])
-    joblib.dump(pipeline_to_persist, save_path)
+    files_to_keep = [save_file_name]
+    if version != _version:
+        files_to_keep.append(f"{config.app_config_.pipeline_save_file}{_version}.pkl")
+    remove_old_pipelines(files_to_keep=files_to_keep)
+    # Uncompressed, so the NumPy arrays inside can be memory-mapped on load.
+    # Write to a temporary file and rename it into place: processes that
+    # still map the previous artifact keep reading the old inode.
+    tmp_path = save_path.with_name(f".{save_file_name}.tmp")
+    joblib.dump(pipeline_to_persist, tmp_path, compress=0)
+    os.replace(tmp_path, save_path)
     print(save_path)
     print("Model/pipeline trained successfully!")
 
 
-def load_pipeline(*, file_name: str) -> Pipeline:
-    """Load a persisted pipeline."""
+def load_pipeline(*, file_name: str, mmap_mode: t.Optional[str] = None) -> Pipeline:
+    """Load a persisted pipeline.
+
+    With ``mmap_mode="r"`` the NumPy arrays stored in the artifact are
+    memory-mapped read-only instead of copied, so several worker processes
+    share them through the OS page cache. sklearn's tree objects copy their
+    node arrays on unpickling, so those are not shared this way.
+    """
 
     file_path = TRAINED_MODEL_DIR / file_name
-    trained_model = joblib.load(filename=file_path)
+    trained_model = joblib.load(filename=file_path, mmap_mode=mmap_mode)
     return trained_model
 
 
@@ -80,9 +108,13 @@ def remove_old_pipelines(*, files_to_keep: t.List[str]) -> None:
     This is to ensure there is a simple one-to-one
     mapping between the package version and the model
     version to be imported and used by other applications.
+    The metrics reports of evaluate.py are kept for every
+    version, so later versions can be compared with them.
     """
     do_not_delete = files_to_keep + ["__init__.py", ".gitignore"]
     for model_file in TRAINED_MODEL_DIR.iterdir():
-        if model_file.name not in do_not_delete:
+        if model_file.name.endswith(".metrics.json"):
+            continue
+        if model_file.is_file() and model_file.name not in do_not_delete:
             model_file.unlink()
 
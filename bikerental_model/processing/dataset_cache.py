@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# bump when the way the cached frame is built changes
+CACHE_FORMAT = 1
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(f"format-{CACHE_FORMAT}".encode(), digest_size=16)
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def categorize(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Store the string columns as categoricals: one copy of each distinct value."""
+    for column in dataframe.columns:
+        if dataframe[column].dtype == object:
+            dataframe[column] = dataframe[column].astype("category")
+    return dataframe
+
+
+def decategorize(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Turn categorical columns back into object columns, as pd.read_csv returns them."""
+    for column in dataframe.columns:
+        if isinstance(dataframe[column].dtype, pd.CategoricalDtype):
+            dataframe[column] = dataframe[column].astype(object)
+    return dataframe
+
+
+def read_csv_cached(path: Path, cache_dir: Path, categorical: bool = True) -> pd.DataFrame:
+    """
+    Read a CSV through a typed Feather (Arrow IPC) cache in ``cache_dir``.
+
+    The first read parses the CSV and writes it uncompressed, with string
+    columns as categoricals, under a key derived from the file's contents.
+    A small manifest remembers the file's size and mtime, so later reads
+    only re-hash the CSV when it has been touched, and memory-map the cache
+    instead of parsing. Needs the optional ``pyarrow`` package; without it
+    the CSV is parsed every time. With ``categorical=False`` the string
+    columns come back as object columns, exactly as pd.read_csv gives them.
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        dataframe = pd.read_csv(path)
+        return categorize(dataframe) if categorical else dataframe
+
+    path = Path(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    stat = path.stat()
+    manifest_path = cache_dir / f"{path.name}.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    if manifest.get("size") == stat.st_size and manifest.get("mtime_ns") == stat.st_mtime_ns:
+        digest = manifest["digest"]
+    else:
+        digest = _file_digest(path)
+    cache_path = cache_dir / f"{path.stem}-{digest}.feather"
+
+    if cache_path.exists():
+        # numeric columns are mapped straight from the file's pages
+        dataframe = feather.read_table(cache_path, memory_map=True).to_pandas(split_blocks=True)
+    else:
+        dataframe = categorize(pd.read_csv(path))
+        tmp_path = cache_path.with_name(f".{cache_path.name}.tmp")
+        feather.write_feather(dataframe, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+        for stale in cache_dir.glob(f"{path.stem}-*.feather"):
+            if stale != cache_path:
+                stale.unlink()
+
+    if manifest.get("digest") != digest or manifest.get("mtime_ns") != stat.st_mtime_ns:
+        manifest_path.write_text(json.dumps({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}))
+    return dataframe if categorical else decategorize(dataframe)
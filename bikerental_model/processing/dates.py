@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import calendar
+import datetime
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+@lru_cache(maxsize=65536)
+def date_parts(value: str) -> Tuple[str, str, str]:
+    """Return (year, month name, weekday abbreviation) for one date string, memoized."""
+    parsed = datetime.datetime.strptime(value, DATE_FORMAT)
+    return str(parsed.year), calendar.month_name[parsed.month], calendar.day_abbr[parsed.weekday()]
+
+
+def date_features(dates: pd.Series) -> pd.DataFrame:
+    """
+    Parse a date column once per distinct value and broadcast the results.
+
+    Returns a frame aligned with ``dates`` holding the parsed ``dteday``
+    (datetime64), ``yr`` (year as string), ``mnth`` (month name) and
+    ``weekday`` (three-letter day name). Missing dates give NaT / "nan" /
+    NaN, as pd.to_datetime followed by the .dt accessors would.
+    """
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+    if isinstance(uniques, pd.DatetimeIndex) or len(uniques) == 0:
+        parsed = pd.DatetimeIndex(uniques)
+        table = pd.DataFrame({
+            "yr": parsed.year.astype(str),
+            "mnth": parsed.month_name(),
+            "weekday": parsed.day_name().str[:3],
+        })
+    else:
+        parsed = pd.to_datetime(pd.Index(uniques), format=DATE_FORMAT)
+        table = pd.DataFrame(
+            [date_parts(value) if isinstance(value, str) else date_parts(value.strftime(DATE_FORMAT))
+             for value in uniques],
+            columns=["yr", "mnth", "weekday"],
+        )
+
+    # missing dates take the extra last row of the lookup table
+    codes = np.where(codes < 0, len(uniques), codes)
+    dteday = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    yr = np.append(table["yr"].to_numpy(dtype=object), "nan")
+    mnth = np.append(table["mnth"].to_numpy(dtype=object), np.nan)
+    weekday = np.append(table["weekday"].to_numpy(dtype=object), np.nan)
+    return pd.DataFrame(
+        {"dteday": dteday[codes], "yr": yr[codes], "mnth": mnth[codes], "weekday": weekday[codes]},
+        index=dates.index,
+    )
@@ -1,37 +1,49 @@
-from typing import List
+from typing import Dict, List, Optional
 import sys
 import pandas as pd
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from bikerental_model.processing.dates import date_features
+
 
 class WeekdayImputer(BaseEstimator, TransformerMixin):
     """ Impute missing values in 'weekday' column by extracting dayname from 'dteday' column """
 
-    def __init__(self, variables: str, date_column: str = 'dteday'):
+    # transformers pickled before the copy parameter existed keep copying
+    copy = True
+
+    def __init__(self, variables: str, date_column: str = 'dteday', copy: bool = True):
         if not isinstance(variables, str):
             raise ValueError("variables should be a string")
         self.variables = variables
         self.date_column = date_column
+        self.copy = copy
         self.fill_value = None
     
     def fit(self, X: pd.DataFrame, y: pd.Series = None):
-        X = X.copy()
-        X[self.date_column] = pd.to_datetime(X[self.date_column], errors='coerce')
+        # nothing to learn: missing weekdays are derived from the date itself
         # self.fill_value = X[self.variables].mode()[0]  # Store the most frequent weekday
         return self
     
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = X.copy()
-        X[self.date_column] = pd.to_datetime(X[self.date_column], errors='coerce')
+        if self.copy:
+            X = X.copy()
+        # reuse the column parsed by pre_pipeline_preparation when it is already datetime
+        if not pd.api.types.is_datetime64_any_dtype(X[self.date_column]):
+            try:
+                X[self.date_column] = date_features(X[self.date_column])['dteday']
+            except (TypeError, ValueError):
+                X[self.date_column] = pd.to_datetime(X[self.date_column], errors='coerce')
 
         # Find missing indices
         missing_idx = X[X[self.variables].isnull()].index
         
         # Impute missing values using day names
-        X.loc[missing_idx, self.variables] = (
-            X.loc[missing_idx, self.date_column].dt.day_name().str[:3]
-        )
+        if len(missing_idx):
+            X.loc[missing_idx, self.variables] = (
+                date_features(X.loc[missing_idx, self.date_column])['weekday']
+            )
         
         # Fill remaining missing values with the most frequent weekday
         # X[self.variables] = X[self.variables].fillna(self.fill_value)
@@ -43,12 +55,15 @@ class WeekdayImputer(BaseEstimator, TransformerMixin):
 class WeathersitImputer(BaseEstimator, TransformerMixin):
     """ Impute missing values in 'weathersit' column by replacing them with the most frequent category value """
 
-    def __init__(self, variables: str):
+    copy = True
+
+    def __init__(self, variables: str, copy: bool = True):
         # YOUR CODE HERE
         if not isinstance(variables, str):
             raise ValueError("variables should be a string")
 
         self.variables = variables
+        self.copy = copy
         self.fill_value = "Mist"
 
     def fit(self, X: pd.DataFrame, y: pd.Series = None):
@@ -60,7 +75,8 @@ class WeathersitImputer(BaseEstimator, TransformerMixin):
 
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         # YOUR CODE HERE
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         X[self.variables]=X[self.variables].fillna(self.fill_value)
 
         return X
@@ -73,20 +89,24 @@ class Mapper(BaseEstimator, TransformerMixin):
     Treat column as Ordinal categorical variable, and assign values accordingly
     """
 
-    def __init__(self, variables: str, mappings: dict):
+    copy = True
+
+    def __init__(self, variables: str, mappings: dict, copy: bool = True):
 
         if not isinstance(variables, str):
             raise ValueError("variables should be a str")
 
         self.variables = variables
         self.mappings = mappings
+        self.copy = copy
 
     def fit(self, X: pd.DataFrame, y: pd.Series = None):
         # we need the fit statement to accomodate the sklearn pipeline
         return self
 
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         #for feature in self.variables:
         X[self.variables] = X[self.variables].map(self.mappings).astype(int)
 
@@ -94,6 +114,88 @@ class Mapper(BaseEstimator, TransformerMixin):
 
 
 
+class MultiColumnMapper(BaseEstimator, TransformerMixin):
+    """
+    Ordinal categorical mapper for several columns in one step:
+    equivalent to one Mapper per column, with at most one copy of the frame.
+    """
+
+    def __init__(self, mappings: Dict[str, dict], copy: bool = True):
+        if not isinstance(mappings, dict):
+            raise ValueError("mappings should be a dict of column -> mapping")
+
+        self.mappings = mappings
+        self.copy = copy
+
+    def fit(self, X: pd.DataFrame, y: pd.Series = None):
+        # we need the fit statement to accomodate the sklearn pipeline
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        if self.copy:
+            X = X.copy()
+        for variable, mapping in self.mappings.items():
+            X[variable] = X[variable].map(mapping).astype(int)
+
+        return X
+
+
+
+class CategoricalEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encode categorical columns through fixed-category integer codes:
+        - ordinal columns are replaced by their mapped value, looked up by code,
+        - one-hot columns are replaced by one indicator column per category.
+    Categories come from the configuration, not from the data, so the output
+    columns are the same at fit and transform time whatever the batch holds.
+    """
+
+    def __init__(self, ordinal: Dict[str, dict], one_hot: Optional[Dict[str, List[str]]] = None, copy: bool = True):
+        """
+        Parameters:
+        - ordinal: column -> {category: mapped value}, as for Mapper.
+        - one_hot: column -> list of categories to create indicator columns for.
+        - copy: If False, encode in place on the frame passed in.
+        """
+        self.ordinal = ordinal
+        self.one_hot = one_hot
+        self.copy = copy
+
+    def fit(self, X: pd.DataFrame, y: pd.Series = None):
+        # categories are fixed by the configuration, nothing to learn
+        return self
+
+    @staticmethod
+    def codes(values: pd.Series, categories: List[str]) -> np.ndarray:
+        """Integer code of every value in ``categories``; -1 for missing or unknown values."""
+        if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == list(categories):
+            return values.cat.codes.to_numpy()
+        return pd.Categorical(values, categories=categories).codes
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        if self.copy:
+            X = X.copy()
+
+        for variable, mapping in self.ordinal.items():
+            codes = self.codes(X[variable], list(mapping))
+            if (codes < 0).any():
+                unknown = X[variable][codes < 0].unique()[:5]
+                raise ValueError(f"{variable} has missing or unknown categories: {list(unknown)}")
+            X[variable] = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))[codes]
+
+        for variable, categories in (self.one_hot or {}).items():
+            codes = self.codes(X[variable], categories)
+            indicators: np.ndarray = np.zeros((len(categories), len(X)), dtype=bool)
+            known = np.flatnonzero(codes >= 0)
+            indicators[codes[known], known] = True
+            del X[variable]
+            for category, column in zip(categories, indicators):
+                X[f"{variable}_{category}"] = column
+
+        return X
+
+
+
 class OutlierHandler(BaseEstimator, TransformerMixin):
     """
     Change the outlier values:
@@ -101,22 +203,25 @@ class OutlierHandler(BaseEstimator, TransformerMixin):
         - to lower-bound, if the value is lower than lower-bound respectively.
     """   
 
-    def __init__(self, variables=['temp', 'atemp', 'hum', 'windspeed'], method="iqr", factor=1.5):
+    copy = True
+
+    def __init__(self, variables=['temp', 'atemp', 'hum', 'windspeed'], method="iqr", factor=1.5, copy=True):
         """
         Parameters:
         - variables: List of numerical columns to handle outliers.
         - method: Outlier detection method ('iqr' or 'zscore').
         - factor: Threshold factor for detecting outliers (default 1.5 for IQR).
+        - copy: If False, cap the values in place on the frame passed in.
         """
         
         self.variables = variables
         self.method = method
         self.factor = factor
+        self.copy = copy
         self.bounds = {}  # Store lower and upper bounds
 
     def fit(self, X: pd.DataFrame, y=None):
         """Learn the lower and upper bounds for outlier detection."""
-        X = X.copy()
         if self.variables is None:
             self.variables = X.select_dtypes(include=[np.number]).columns  # Use all numerical columns
 
@@ -141,7 +246,8 @@ class OutlierHandler(BaseEstimator, TransformerMixin):
 
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """Apply outlier handling by capping values within bounds."""
-        X = X.copy()
+        if self.copy:
+            X = X.copy()
         #print(X)
         #self = self.fit(X)
         #print(self.bounds)
@@ -149,8 +255,9 @@ class OutlierHandler(BaseEstimator, TransformerMixin):
         for var in self.variables:
             #print(var)
             lower_bound, upper_bound = self.bounds[var]
-            X[var] = np.where(X[var] < lower_bound, lower_bound, X[var])
-            X[var] = np.where(X[var] > upper_bound, upper_bound, X[var])
+            # a record with a null value arrives as an object column holding None
+            values = pd.to_numeric(X[var]).to_numpy(dtype=float)
+            X[var] = np.clip(values, lower_bound, upper_bound)
         return X
 
 
@@ -158,14 +265,18 @@ class OutlierHandler(BaseEstimator, TransformerMixin):
 class WeekdayOneHotEncoder(BaseEstimator, TransformerMixin):
     """One-hot encode the 'weekday' column."""
 
-    def __init__(self, variables="weekday", drop_first=False):
+    copy = True
+
+    def __init__(self, variables="weekday", drop_first=False, copy=True):
         """
         Parameters:
         - variables: Column name to encode (default 'weekday').
         - drop_first: Whether to drop the first category to avoid multicollinearity.
+        - copy: If False, swap the column for its dummies in place on the frame passed in.
         """
         self.variables = variables
         self.drop_first = drop_first
+        self.copy = copy
         self.categories_ = None  # Store unique values
 
     def fit(self, X: pd.DataFrame, y=None):
@@ -175,8 +286,15 @@ class WeekdayOneHotEncoder(BaseEstimator, TransformerMixin):
 
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """Apply one-hot encoding to the 'weekday' column."""
-        X = X.copy()
-        X = pd.get_dummies(X, columns=[self.variables], drop_first=self.drop_first)
+        if self.copy:
+            # get_dummies builds a new frame, the input is left untouched
+            return pd.get_dummies(X, columns=[self.variables], drop_first=self.drop_first)
+
+        # same columns as above, without rebuilding the whole frame
+        dummies = pd.get_dummies(X[self.variables], prefix=self.variables, drop_first=self.drop_first)
+        del X[self.variables]
+        for column in dummies.columns:
+            X[column] = dummies[column]
         return X
 
 
@@ -189,7 +307,12 @@ class NumericColumnSelector(BaseEstimator, TransformerMixin):
         self.numeric_columns = X.select_dtypes(include=['int64', 'float64']).columns
         return self
 
+    def __sklearn_is_fitted__(self):
+        # sklearn only recognises fitted attributes ending in "_"
+        return hasattr(self, "numeric_columns")
+
     def transform(self, X):
         """Drops non-numeric columns and returns only numeric features."""
         #numeric_columns = X.select_dtypes(include=['int64', 'float64']).columns
-        return X[self.numeric_columns].copy()
\ No newline at end of file
+        # column selection with a list already returns a new frame
+        return X[self.numeric_columns]
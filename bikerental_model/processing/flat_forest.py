@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# padding a tree to its depth costs 2**depth nodes
+MAX_DEPTH = 16
+TREE_LEAF = -1
+
+
+class FlatForest:
+    """
+    A fitted RandomForestRegressor exported into flat NumPy arrays.
+
+    Every tree is padded to the forest's depth and stored in heap order
+    (the children of node ``i`` are ``2i+1`` and ``2i+2``): one row per tree
+    of split features and thresholds for the internal nodes and of values
+    for the leaves. A leaf above the bottom level becomes a chain of splits
+    on +inf thresholds, which always go left, down to a copy of its value.
+    A batch is scored by stepping all trees one level at a time, as array
+    operations over (trees, rows). As in sklearn, inputs are cast to
+    float32, a row goes left when ``x <= threshold`` and a missing value
+    goes the way the split learned for it (``missing_go_to_left``); the
+    tree outputs are summed in tree order and divided by the number of
+    trees, so the predictions match sklearn's.
+    """
+
+    def __init__(self, model: RandomForestRegressor, block_rows: int = 512):
+        estimators = model.estimators_
+        if estimators[0].tree_.n_outputs != 1:
+            raise ValueError("FlatForest only supports single-output forests")
+        self.depth = max(1, max(estimator.tree_.max_depth for estimator in estimators))
+        if self.depth > MAX_DEPTH:
+            raise ValueError(f"Trees of depth {self.depth} are too deep to pad (at most {MAX_DEPTH})")
+        self.n_features_in_ = model.n_features_in_
+        self.n_trees = len(estimators)
+        self.block_rows = block_rows
+
+        n_internal, n_leaves = 2 ** self.depth - 1, 2 ** self.depth
+        self.features = np.zeros((self.n_trees, n_internal), dtype=np.intp)
+        self.thresholds = np.full((self.n_trees, n_internal), np.inf)
+        # padding splits send missing values left too
+        self.missing_right = np.zeros((self.n_trees, n_internal), dtype=bool)
+        self.values = np.zeros((self.n_trees, n_leaves))
+        for index, estimator in enumerate(estimators):
+            self._export_tree(index, estimator.tree_)
+
+        # flat views and per-tree offsets for the gathers in _predict_block
+        self._features = self.features.ravel()
+        self._thresholds = self.thresholds.ravel()
+        self._missing_right = self.missing_right.ravel()
+        self._values = self.values.ravel()
+        self._node_offsets = (np.arange(self.n_trees) * n_internal)[:, None]
+        self._leaf_offsets = (np.arange(self.n_trees) * n_leaves - n_internal)[:, None]
+
+    def _export_tree(self, index: int, tree) -> None:
+        n_internal = 2 ** self.depth - 1
+        stack = [(0, 0, 0)]  # (sklearn node, heap position, level)
+        while stack:
+            node, position, level = stack.pop()
+            if level == self.depth:
+                self.values[index, position - n_internal] = tree.value[node, 0, 0]
+            elif tree.children_left[node] == TREE_LEAF:
+                stack.append((node, 2 * position + 1, level + 1))
+            else:
+                self.features[index, position] = tree.feature[node]
+                self.thresholds[index, position] = tree.threshold[node]
+                self.missing_right[index, position] = not tree.missing_go_to_left[node]
+                stack.append((tree.children_left[node], 2 * position + 1, level + 1))
+                stack.append((tree.children_right[node], 2 * position + 2, level + 1))
+
+    def _check(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected an array of shape (n_rows, {self.n_features_in_}), got {X.shape}")
+        return X
+
+    def predict(self, X) -> np.ndarray:
+        """Predict for a 2-D feature array (or frame) in the model's feature order."""
+        X = self._check(X)
+        predictions = np.empty(len(X))
+        for start in range(0, len(X), self.block_rows):
+            block = X[start:start + self.block_rows]
+            # summing over axis 0 adds the trees one by one, in sklearn's order
+            predictions[start:start + len(block)] = self._tree_values(block).sum(axis=0) / self.n_trees
+        return predictions
+
+    def tree_predictions(self, X) -> np.ndarray:
+        """Every tree's prediction for every row, shaped (rows, trees)."""
+        X = self._check(X)
+        predictions = np.empty((len(X), self.n_trees))
+        for start in range(0, len(X), self.block_rows):
+            block = X[start:start + self.block_rows]
+            predictions[start:start + len(block)] = self._tree_values(block).T
+        return predictions
+
+    def _tree_values(self, X: np.ndarray) -> np.ndarray:
+        """Leaf value reached in each tree, shaped (trees, rows)."""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = np.arange(n_rows) * n_features
+        nodes = np.zeros((self.n_trees, n_rows), dtype=np.int32)
+        has_missing = np.isnan(flat_X).any()
+        for _ in range(self.depth):
+            positions = nodes + self._node_offsets
+            values = flat_X[self._features[positions] + row_offsets]
+            # NaN > threshold is False: a missing value goes right only where the split says so
+            go_right = values > self._thresholds[positions]
+            if has_missing:
+                go_right |= np.isnan(values) & self._missing_right[positions]
+            nodes *= 2
+            nodes += 1
+            nodes += go_right
+        return self._values[nodes + self._leaf_offsets]
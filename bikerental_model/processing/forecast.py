@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import datetime
+from functools import lru_cache
+from typing import List, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday, USFederalHolidayCalendar, nearest_workday
+
+WEATHER_COLUMNS = ["temp", "atemp", "hum", "windspeed", "weathersit"]
+HOURS_PER_DAY = 24
+
+# first (month, day) of each season label, as the training data labels them
+SEASON_STARTS = [(3, 21), (6, 21), (9, 23), (12, 21)]
+SEASON_LABELS = ["spring", "summer", "fall", "winter", "spring"]
+
+
+class WashingtonDCHolidayCalendar(AbstractHolidayCalendar):
+    """The federal holidays plus DC Emancipation Day, the holidays of the training data."""
+
+    rules = USFederalHolidayCalendar.rules + [
+        Holiday("DC Emancipation Day", month=4, day=16, observance=nearest_workday)
+    ]
+
+
+@lru_cache(maxsize=64)
+def holidays_of_year(year: int) -> np.ndarray:
+    """Holiday dates of one year (datetime64[ns]); the calendar rules are evaluated once per year."""
+    holidays = WashingtonDCHolidayCalendar().holidays(f"{year}-01-01", f"{year}-12-31")
+    return holidays.to_numpy(dtype="datetime64[ns]")
+
+
+def hour_labels() -> List[str]:
+    """The ``hr`` labels of hours 0-23: "12am", "1am", ..., "11pm"."""
+    return [f"{hour % 12 or 12}{'am' if hour < 12 else 'pm'}" for hour in range(HOURS_PER_DAY)]
+
+
+def calendar_features(days: pd.DatetimeIndex) -> pd.DataFrame:
+    """``season``, ``mnth``, ``weekday``, ``holiday`` and ``workingday`` of each day."""
+    month_day = days.month * 100 + days.day
+    starts = [month * 100 + day for month, day in SEASON_STARTS]
+    season = np.array(SEASON_LABELS, dtype=object)[np.searchsorted(starts, month_day, side="right")]
+    holiday = np.isin(days.to_numpy(), np.concatenate([holidays_of_year(year) for year in np.unique(days.year)]))
+    workingday = (days.dayofweek < 5) & ~holiday
+    return pd.DataFrame({
+        "season": season,
+        "mnth": days.month_name(),
+        "weekday": days.day_name().str[:3],
+        "holiday": np.where(holiday, "Yes", "No"),
+        "workingday": np.where(workingday, "Yes", "No"),
+    }, index=days)
+
+
+def forecast_grid(
+    start: Union[str, datetime.date],
+    end: Union[str, datetime.date],
+    weather: Mapping[str, Sequence],
+) -> pd.DataFrame:
+    """
+    Raw input records for every hour from ``start`` to ``end`` (inclusive).
+
+    ``weather`` holds one hourly value per grid row for each of the
+    WEATHER_COLUMNS, day by day from 12am. The calendar columns are derived
+    once per day and repeated over its hours; ``yr`` is derived from
+    ``dteday`` by pre_pipeline_preparation, as for any other input.
+    """
+    days = pd.date_range(start, end, freq="D")
+    if len(days) == 0:
+        raise ValueError(f"end ({end}) is before start ({start})")
+    n_rows = len(days) * HOURS_PER_DAY
+    missing = [column for column in WEATHER_COLUMNS if column not in weather]
+    if missing:
+        raise ValueError(f"Missing weather columns: {', '.join(missing)}")
+    for column in WEATHER_COLUMNS:
+        if len(weather[column]) != n_rows:
+            raise ValueError(
+                f"{column!r} has {len(weather[column])} values, expected {n_rows} "
+                f"({len(days)} days x {HOURS_PER_DAY} hours)"
+            )
+
+    calendar = calendar_features(days)
+    grid = {
+        "dteday": np.repeat(days.to_numpy(), HOURS_PER_DAY),
+        "hr": np.tile(np.array(hour_labels(), dtype=object), len(days)),
+    }
+    for column in calendar.columns:
+        grid[column] = np.repeat(calendar[column].to_numpy(dtype=object), HOURS_PER_DAY)
+    for column in WEATHER_COLUMNS:
+        values = weather[column]
+        grid[column] = np.asarray(values, dtype=object if column == "weathersit" else float)
+    return pd.DataFrame(grid)
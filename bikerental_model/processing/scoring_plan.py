@@ -0,0 +1,186 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import datetime
+import threading
+from typing import Any, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from bikerental_model.processing.dates import date_parts
+from bikerental_model.processing.features import WeekdayImputer
+from bikerental_model.processing.features import WeathersitImputer
+from bikerental_model.processing.features import CategoricalEncoder
+from bikerental_model.processing.features import Mapper
+from bikerental_model.processing.features import MultiColumnMapper
+from bikerental_model.processing.features import OutlierHandler
+from bikerental_model.processing.features import WeekdayOneHotEncoder
+from bikerental_model.processing.features import NumericColumnSelector
+
+
+class UnsupportedRecordError(ValueError):
+    """Raised when a record cannot be encoded by the scoring plan.
+
+    Callers are expected to fall back to the pandas pipeline, which
+    produces the usual validation errors for such inputs.
+    """
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class ScoringPlan:
+    """
+    Array-native scoring plan compiled from a fitted bike_pipe:
+    encodes a single raw record straight into the model's feature row,
+    replaying the imputation, mapping, clipping, one-hot and scaling steps
+    without building any DataFrame. ``model`` replaces the pipeline's
+    final estimator for scoring, e.g. with a FlatForest.
+    """
+
+    def __init__(self, pipeline: Pipeline, date_column: str = "dteday", model: Any = None):
+        self.date_column = date_column
+        self.fill_values = {}
+        self.weekday_column = None
+        self.mappings = {}
+        self.bounds = {}
+        self.one_hot: Set[str] = set()
+        self.mean_ = None
+        self.scale_ = None
+
+        columns: Optional[List[str]] = None
+        *transformers, (_, self.model) = pipeline.steps
+        if model is not None:
+            self.model = model
+        for name, step in transformers:
+            if isinstance(step, WeekdayImputer):
+                self.weekday_column = step.variables
+                self.date_column = step.date_column
+            elif isinstance(step, WeathersitImputer):
+                self.fill_values[step.variables] = step.fill_value
+            elif isinstance(step, Mapper):
+                self.mappings[step.variables] = step.mappings
+            elif isinstance(step, MultiColumnMapper):
+                self.mappings.update(step.mappings)
+            elif isinstance(step, CategoricalEncoder):
+                self.mappings.update(step.ordinal)
+                self.one_hot.update(step.one_hot or {})
+            elif isinstance(step, OutlierHandler):
+                self.bounds.update(step.bounds)
+            elif isinstance(step, WeekdayOneHotEncoder):
+                self.one_hot.add(step.variables)
+            elif isinstance(step, NumericColumnSelector):
+                columns = list(step.numeric_columns)
+            elif isinstance(step, StandardScaler):
+                n_features = step.n_features_in_
+                self.mean_ = step.mean_ if step.with_mean else np.zeros(n_features)
+                self.scale_ = step.scale_ if step.with_std else np.ones(n_features)
+            else:
+                raise ValueError(f"Cannot compile pipeline step {name!r} ({type(step).__name__})")
+
+        if columns is None:
+            raise ValueError("Pipeline has no NumericColumnSelector step to fix the feature order")
+        self.columns = columns
+        if self.mean_ is None:
+            # a pipeline without a scaler
+            self.mean_, self.scale_ = np.zeros(self.n_features), np.ones(self.n_features)
+
+        self._encoders = [self._column_encoder(column) for column in self.columns]
+        self._local = threading.local()
+
+    def _column_encoder(self, column: str) -> Tuple[str, Any]:
+        if column in self.mappings:
+            return "mapped", (column, self.mappings[column])
+        for variable in self.one_hot:
+            if column.startswith(f"{variable}_"):
+                return "one_hot", (variable, column[len(variable) + 1:])
+        lower, upper = self.bounds.get(column, (-np.inf, np.inf))
+        return "numeric", (column, float(lower), float(upper))
+
+    @property
+    def n_features(self) -> int:
+        return len(self.columns)
+
+    def _row(self) -> np.ndarray:
+        # one preallocated feature row per thread
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty((1, self.n_features))
+        return row
+
+    def _categorical(self, record: Mapping, column: str, parts: Tuple[str, str, str]) -> Any:
+        if column == "yr":
+            return parts[0]
+        if column == "mnth":
+            return parts[1]
+        value = record.get(column)
+        if _is_missing(value):
+            if column == self.weekday_column:
+                return parts[2]
+            if column in self.fill_values:
+                return self.fill_values[column]
+        return value
+
+    def encode(self, record: Mapping, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode one raw input record into a scaled feature row of shape (1, n_features)."""
+        if out is None:
+            out = self._row()
+        values = out[0]
+
+        date_value = record.get(self.date_column)
+        if isinstance(date_value, datetime.date):
+            date_value = date_value.isoformat()[:10]
+        if not isinstance(date_value, str):
+            raise UnsupportedRecordError(f"{self.date_column!r} must be a date string")
+        try:
+            parts = date_parts(date_value)
+        except ValueError as error:
+            raise UnsupportedRecordError(str(error)) from error
+
+        for i, (kind, payload) in enumerate(self._encoders):
+            if kind == "mapped":
+                column, mapping = payload
+                value = self._categorical(record, column, parts)
+                try:
+                    values[i] = mapping[value]
+                except (KeyError, TypeError) as error:
+                    raise UnsupportedRecordError(f"Unknown value {value!r} for {column!r}") from error
+            elif kind == "one_hot":
+                column, category = payload
+                values[i] = self._categorical(record, column, parts) == category
+            else:
+                column, lower, upper = payload
+                value = record.get(column)
+                if isinstance(value, bool) or not isinstance(value, (int, float, np.number)) or value != value:
+                    raise UnsupportedRecordError(f"{column!r} must be a number")
+                values[i] = min(max(value, lower), upper)
+
+        values -= self.mean_
+        values /= self.scale_
+        return out
+
+    def predict(self, record: Mapping) -> np.ndarray:
+        """Score a single raw record with the fitted model."""
+        return self.model.predict(self.encode(record))
+
+
+def single_record(input_data: Any) -> Optional[Mapping]:
+    """Return the lone record in ``input_data``, or None if it holds zero or several rows."""
+    if isinstance(input_data, Mapping):
+        sequences = [isinstance(value, (list, tuple, np.ndarray)) for value in input_data.values()]
+        if not any(sequences):
+            return input_data
+        if all(sequences) and all(len(value) == 1 for value in input_data.values()):
+            return {key: value[0] for key, value in input_data.items()}
+        return None
+    if isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], Mapping):
+        return input_data[0]
+    if hasattr(input_data, "iloc") and len(input_data) == 1:
+        return input_data.iloc[0].to_dict()
+    return None
@@ -5,7 +5,8 @@ parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 from datetime import date
 
-from typing import List, Optional, Tuple, Union
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -13,10 +14,27 @@ from pydantic import BaseModel, ValidationError
 
 from bikerental_model.config.core import config
 from bikerental_model.processing.data_manager import pre_pipeline_preparation
+from bikerental_model.processing.dates import DATE_FORMAT
 
+COLUMNAR = "columnar"
+PYDANTIC = "pydantic"
+# categorical inputs the pipeline fills in when they are missing
+IMPUTED = ("weekday", "weathersit")
+
+
+def validate_inputs(*, input_df: pd.DataFrame, method: str = COLUMNAR) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Check model inputs for unprocessable values.
+
+    ``method="columnar"`` checks whole columns at once (types, categories,
+    ranges and dates); ``method="pydantic"`` is the original per-row schema
+    check, kept as the reference. Both report errors as a JSON list of
+    {type, loc: ["inputs", row, column], msg, input} entries.
+    """
+    if method == COLUMNAR:
+        return validate_inputs_columnar(input_df=input_df)
+    if method != PYDANTIC:
+        raise ValueError(f"Unknown validation method {method!r}")
 
-def validate_inputs(*, input_df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[dict]]:
-    """Check model inputs for unprocessable values."""
     pre_processed = pre_pipeline_preparation(data_frame=input_df)
     validated_data = pre_processed[config.model_config_.features].copy()
     errors = None
@@ -34,13 +52,135 @@ def validate_inputs(*, input_df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[d
     return validated_data, errors
 
 
+def _categories() -> Dict[str, List[str]]:
+    model_config = config.model_config_
+    return {
+        "yr": list(model_config.year_mapping),
+        "mnth": list(model_config.month_mappings),
+        "season": list(model_config.season_mappings),
+        "hr": list(model_config.hour_mapping),
+        "holiday": list(model_config.holiday_mapping),
+        "weekday": list(model_config.weekday_categories),
+        "workingday": list(model_config.workingday_mapping),
+        "weathersit": list(model_config.weather_mappings),
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _error(kind: str, row: int, column: str, msg: str, value: Any) -> dict:
+    return {"type": kind, "loc": ["inputs", int(row), column], "msg": msg, "input": _jsonable(value)}
+
+
+def _date_errors(dates: pd.Series, column: str) -> Tuple[np.ndarray, List[dict]]:
+    """Rows whose date cannot be parsed, checking each distinct value once."""
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+    if isinstance(uniques, pd.DatetimeIndex):
+        return np.zeros(len(dates), dtype=bool), []
+    parsed = pd.to_datetime(pd.Index(uniques, dtype=object), format=DATE_FORMAT, errors="coerce")
+    bad_codes = np.flatnonzero(parsed.isna())
+    bad = np.isin(codes, bad_codes)
+    values = dates.to_numpy()
+    errors = [
+        _error("date_parsing", row, column, "Input should be a valid date in the format YYYY-MM-DD", values[row])
+        for row in np.flatnonzero(bad)
+    ]
+    return bad, errors
+
+
+def _numeric_errors(series: pd.Series, column: str, bounds: Optional[List[float]]) -> List[dict]:
+    errors = []
+    raw = series.to_numpy()
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+    else:
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        for row in np.flatnonzero(np.isnan(values) & series.notna().to_numpy()):
+            if isinstance(raw[row], str):
+                errors.append(_error("float_parsing", row, column,
+                                     "Input should be a valid number, unable to parse string as a number", raw[row]))
+            else:
+                errors.append(_error("float_type", row, column, "Input should be a valid number", raw[row]))
+    if bounds is not None:
+        low, high = bounds
+        for row in np.flatnonzero(values < low):
+            errors.append(_error("greater_than_equal", row, column,
+                                 f"Input should be greater than or equal to {low}", raw[row]))
+        for row in np.flatnonzero(values > high):
+            errors.append(_error("less_than_equal", row, column,
+                                 f"Input should be less than or equal to {high}", raw[row]))
+    return errors
+
+
+def _category_errors(
+    series: pd.Series, column: str, categories: List[str], skip: np.ndarray, required: bool = True
+) -> List[dict]:
+    invalid = ~series.isin(categories).to_numpy() & ~skip
+    if not required:
+        invalid &= series.notna().to_numpy()
+    errors = []
+    raw = series.to_numpy()
+    for row in np.flatnonzero(invalid):
+        if isinstance(raw[row], str):
+            errors.append(_error("literal_error", row, column,
+                                 f"Input should be one of {', '.join(map(repr, categories))}", raw[row]))
+        else:
+            errors.append(_error("string_type", row, column, "Input should be a valid string", raw[row]))
+    return errors
+
+
+def validate_inputs_columnar(*, input_df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Vectorized validate_inputs: no per-row objects are built."""
+    date_column = "dteday"
+    bad_dates, date_errors = _date_errors(input_df[date_column], date_column)
+    date_errors += [
+        _error("date_type", row, date_column, "Input should be a valid date", None)
+        for row in np.flatnonzero(input_df[date_column].isna().to_numpy())
+    ]
+    if date_errors:
+        # blank the unparseable dates so the derived columns can still be built
+        input_df = input_df.copy()
+        input_df[date_column] = input_df[date_column].where(~bad_dates, None)
+
+    pre_processed = pre_pipeline_preparation(data_frame=input_df)
+    validated_data = pre_processed[config.model_config_.features].copy()
+
+    found = {date_column: date_errors}
+    no_date = validated_data[date_column].isna().to_numpy()
+    categories = _categories()
+    for column in config.model_config_.features:
+        if column in categories:
+            # yr and mnth are derived from the date; a missing date is reported (or allowed) there
+            skip = no_date if column in ("yr", "mnth") else np.zeros(len(validated_data), dtype=bool)
+            found[column] = _category_errors(
+                validated_data[column], column, categories[column], skip, required=column not in IMPUTED
+            )
+        elif column != date_column:
+            found[column] = _numeric_errors(
+                validated_data[column], column, config.model_config_.numeric_ranges.get(column)
+            )
+
+    order = {column: i for i, column in enumerate(config.model_config_.features)}
+    errors = sorted(
+        (error for column_errors in found.values() for error in column_errors),
+        key=lambda error: (error["loc"][1], order[error["loc"][2]]),
+    )
+    return validated_data, json.dumps(errors) if errors else None
+
+
 class DataInputValidationSchema(BaseModel):
-    dteday: Optional[date]  # Date column
-    season: Optional[str]  # Categorical (object)
-    hr: Optional[str]  # Categorical (object)
-    holiday: Optional[str]  # Categorical (object)
+    dteday: date  # Date column
+    season: str  # Categorical (object)
+    hr: str  # Categorical (object)
+    holiday: str  # Categorical (object)
     weekday: Optional[str]  # Categorical (object) - has missing values
-    workingday: Optional[str]  # Categorical (object)
+    workingday: str  # Categorical (object)
     weathersit: Optional[str]  # Categorical (object) - has missing values
     temp: Optional[float]  # Continuous numeric
     atemp: Optional[float]  # Continuous numeric
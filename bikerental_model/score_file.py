@@ -0,0 +1,153 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import config
+from bikerental_model.predict import make_batch_prediction
+
+
+def iter_file_chunks(path: Union[str, Path], chunk_size: int) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """Yield (offset, chunk) pairs of at most ``chunk_size`` rows from a CSV or Parquet file."""
+    path = Path(path)
+    offset = 0
+    if path.suffix == ".parquet":
+        from pyarrow import parquet
+
+        batches = (batch.to_pandas() for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    else:
+        batches = pd.read_csv(path, chunksize=chunk_size)
+    for chunk in batches:
+        yield offset, chunk.reset_index(drop=True)
+        offset += len(chunk)
+
+
+def _score_chunk(offset: int, chunk: pd.DataFrame) -> Tuple[int, pd.DataFrame, Optional[list]]:
+    """Validate and score one chunk; runs in the calling process or a pool worker.
+
+    Rows that fail validation are left out of the scored frame and
+    returned as errors; the other rows of the chunk are still scored.
+    """
+    results = make_batch_prediction(input_data=chunk, chunk_size=len(chunk))
+    rows, errors = chunk.index, None
+    if results["errors"] is not None:
+        errors = json.loads(results["errors"])
+        rows = chunk.index.difference([error["loc"][1] for error in errors])
+        for error in errors:
+            error["loc"][1] += offset  # row numbers relative to the whole file
+        results = {"predictions": np.empty(0)}
+        if len(rows):
+            results = make_batch_prediction(input_data=chunk.loc[rows].reset_index(drop=True), chunk_size=len(rows))
+    scored = pd.DataFrame({"row": offset + rows.to_numpy(), "prediction": results["predictions"]})
+    return offset, scored, errors
+
+
+class _PredictionWriter:
+    """Append scored chunks to a CSV or Parquet output file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parquet: Any = None
+        self._header = True
+
+    def write(self, scored: pd.DataFrame) -> None:
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            from pyarrow import parquet
+
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = parquet.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            scored.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(
+    *,
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    chunk_size: Optional[int] = None,
+    workers: int = 1,
+) -> dict:
+    """
+    Score a CSV or Parquet file chunk by chunk, writing predictions as it goes.
+
+    Each chunk of ``chunk_size`` rows is validated and scored on its own,
+    so memory use depends on the chunk size, not on the file size. With
+    ``workers`` > 1 the chunks are spread over a process pool, with at most
+    two chunks per worker in flight; output keeps the input order. The
+    output has one ``row, prediction`` line per scored row. Rows that fail
+    validation are not scored; their errors (with row numbers in the input
+    file) go to ``<output>.errors.jsonl``, one line per chunk that had any.
+    Both files are replaced, not appended to.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    chunk_size = chunk_size or config.app_config_.prediction_chunk_size
+    errors_path = output_path.with_name(output_path.name + ".errors.jsonl")
+    output_path.unlink(missing_ok=True)
+    errors_path.unlink(missing_ok=True)
+    writer = _PredictionWriter(output_path)
+    summary: Dict[str, Any] = {"rows": 0, "scored": 0, "failed_rows": 0, "version": _version}
+    start = time.perf_counter()
+
+    def collect(result: Tuple[int, pd.DataFrame, Optional[list]]) -> None:
+        offset, scored, errors = result
+        if errors is not None:
+            summary["failed_rows"] += len({error["loc"][1] for error in errors})
+            with open(errors_path, "a") as errors_file:
+                errors_file.write(json.dumps({"offset": offset, "errors": errors}) + "\n")
+        if len(scored):
+            writer.write(scored)
+            summary["scored"] += len(scored)
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending: Deque[Future] = deque()
+                for offset, chunk in iter_file_chunks(input_path, chunk_size):
+                    summary["rows"] += len(chunk)
+                    pending.append(pool.submit(_score_chunk, offset, chunk))
+                    if len(pending) >= 2 * workers:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+        else:
+            for offset, chunk in iter_file_chunks(input_path, chunk_size):
+                summary["rows"] += len(chunk)
+                collect(_score_chunk(offset, chunk))
+    finally:
+        writer.close()
+
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of inputs chunk by chunk.")
+    parser.add_argument("input_path")
+    parser.add_argument("output_path", help="predictions file, .csv or .parquet")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per chunk (default: prediction_chunk_size)")
+    parser.add_argument("--workers", type=int, default=1, help="scoring processes")
+    args = parser.parse_args()
+
+    print(score_file(
+        input_path=args.input_path, output_path=args.output_path, chunk_size=args.chunk_size, workers=args.workers
+    ))
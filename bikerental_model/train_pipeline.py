@@ -4,6 +4,8 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
+import time
+
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
@@ -34,7 +36,9 @@ def run_training() -> None:
     )
 
     # Pipeline fitting
+    start = time.perf_counter()
     bike_pipe.fit(X_train,y_train)
+    print(f"Fitted in {time.perf_counter() - start:.2f}s (n_jobs={config.model_config_.n_jobs})")
     #y_pred = titanic_pipe.predict(X_test)
     #print("Accuracy(in %):", accuracy_score(y_test, y_pred)*100)
 
@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+from joblib import Memory
+from sklearn.model_selection import GridSearchCV, KFold, RandomizedSearchCV, train_test_split
+
+from bikerental_model.config.core import TUNING_CACHE_DIR, TUNING_DIR, config
+from bikerental_model.pipeline import make_bike_pipe
+from bikerental_model.processing.data_manager import load_dataset
+
+LEADERBOARD_FILE = "leaderboard.csv"
+
+
+def make_search(
+    *,
+    method: str = "grid",
+    param_grid: Optional[Dict[str, List]] = None,
+    n_iter: int = 10,
+    cv: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    cache_dir: Union[str, Path, None] = None,
+) -> Union[GridSearchCV, RandomizedSearchCV]:
+    """
+    Build a search over the random forest's parameters of bike_pipe.
+
+    The preprocessing steps are fitted through a joblib.Memory cache on
+    disk (``cache_dir``, by default TUNING_CACHE_DIR under the temp
+    directory), keyed by a hash of each step's parameters and input. Every
+    candidate reuses the steps already fitted on the same CV fold, from any
+    worker process or an earlier run, so only the model step is refit.
+    Candidates are evaluated on a process pool of ``n_jobs`` workers.
+    """
+    model_config = config.model_config_
+    param_grid = param_grid or model_config.tuning_param_grid
+    pipe = make_bike_pipe(
+        copy_free=model_config.copy_free_pipeline,
+        categorical_encoding=model_config.categorical_encoding,
+    )
+    # the parallelism is across candidates, so each forest fits on one core
+    pipe.set_params(
+        memory=Memory(location=str(cache_dir or TUNING_CACHE_DIR), verbose=0),
+        model_rf__n_jobs=1,
+    )
+
+    search_space = {f"model_rf__{name}": values for name, values in param_grid.items()}
+    folds = KFold(
+        n_splits=cv or model_config.tuning_cv_folds, shuffle=True, random_state=model_config.random_state
+    )
+    n_jobs = model_config.n_jobs if n_jobs is None else n_jobs
+    if method == "grid":
+        return GridSearchCV(pipe, search_space, scoring="r2", cv=folds, n_jobs=n_jobs, refit=False)
+    if method == "random":
+        return RandomizedSearchCV(
+            pipe, search_space, n_iter=n_iter, scoring="r2", cv=folds, n_jobs=n_jobs,
+            refit=False, random_state=model_config.random_state,
+        )
+    raise ValueError(f"Unknown search method {method!r}, expected 'grid' or 'random'")
+
+
+def run_tuning(
+    *,
+    method: str = "grid",
+    param_grid: Optional[Dict[str, List]] = None,
+    n_iter: int = 10,
+    cv: Optional[int] = None,
+    n_jobs: Optional[int] = None,
+    output_dir: Union[str, Path, None] = None,
+    cache_dir: Union[str, Path, None] = None,
+) -> pd.DataFrame:
+    """
+    Tune the model on the training split and write the leaderboard.
+
+    The leaderboard holds one row per candidate, best first, with its
+    parameters, cross-validated r2 and the mean fit/score time per fold.
+    ``cache_dir`` is passed on to make_search.
+    """
+    output_dir = Path(output_dir or TUNING_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # same training split as run_training, so the test rows stay unseen
+    data = load_dataset(file_name=config.app_config_.training_data_file)
+    X_train, _, y_train, _ = train_test_split(
+        data[config.model_config_.features],
+        data[config.model_config_.target],
+        test_size=config.model_config_.test_size,
+        random_state=config.model_config_.random_state,
+    )
+
+    search = make_search(
+        method=method, param_grid=param_grid, n_iter=n_iter, cv=cv, n_jobs=n_jobs, cache_dir=cache_dir
+    )
+    search.fit(X_train, y_train)
+
+    results = pd.DataFrame(search.cv_results_)
+    params = pd.DataFrame(list(results["params"])).rename(columns=lambda name: name.replace("model_rf__", ""))
+    leaderboard = pd.concat([
+        results[["rank_test_score"]].rename(columns={"rank_test_score": "rank"}),
+        params,
+        results[["mean_test_score", "std_test_score", "mean_fit_time", "std_fit_time", "mean_score_time"]],
+    ], axis=1).sort_values(["rank", "mean_fit_time"]).reset_index(drop=True)
+
+    leaderboard.to_csv(output_dir / LEADERBOARD_FILE, index=False)
+    print(leaderboard.head(10).to_string(index=False))
+    print(f"Leaderboard written to {output_dir / LEADERBOARD_FILE}")
+    return leaderboard
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search the random forest's parameters of bike_pipe.")
+    parser.add_argument("--method", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=10, help="candidates sampled by the random search")
+    parser.add_argument("--cv", type=int, default=None, help="folds (default: tuning_cv_folds)")
+    parser.add_argument("--n-jobs", type=int, default=None, help="worker processes (default: n_jobs)")
+    parser.add_argument("--cache-dir", default=None, help=f"fitted step cache (default: {TUNING_CACHE_DIR})")
+    args = parser.parse_args()
+
+    run_tuning(method=args.method, n_iter=args.n_iter, cv=args.cv, n_jobs=args.n_jobs, cache_dir=args.cache_dir)
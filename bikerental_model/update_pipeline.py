@@ -0,0 +1,156 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import argparse
+import re
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import TRAINED_MODEL_DIR, config
+from bikerental_model.processing.data_manager import load_dataset, load_pipeline, save_pipeline
+from bikerental_model.processing.features import OutlierHandler
+from bikerental_model.processing.validation import validate_inputs
+
+
+class DriftError(ValueError):
+    """Raised when new data has drifted too far from the fitted preprocessing statistics.
+
+    The forest's existing trees were grown on features scaled with those
+    statistics, so the model has to be retrained with run_training instead.
+    """
+
+    def __init__(self, report: dict):
+        self.report = report
+        super().__init__(
+            f"Drift {report['max_mean_shift']:.2f} in {report['worst_feature']!r} exceeds "
+            f"{report['threshold']}; retrain the model with run_training"
+        )
+
+
+def update_version(number: int) -> str:
+    return f"{_version}.update{number}"
+
+
+def latest_version() -> str:
+    """The newest incremental update of this package version, or the base version."""
+    pattern = re.compile(re.escape(f"{config.app_config_.pipeline_save_file}{_version}.update") + r"(\d+)\.pkl")
+    numbers = [
+        int(match.group(1))
+        for match in (pattern.fullmatch(path.name) for path in TRAINED_MODEL_DIR.iterdir())
+        if match
+    ]
+    return update_version(max(numbers)) if numbers else _version
+
+
+def drift_report(pipeline: Pipeline, X: pd.DataFrame, threshold: float) -> dict:
+    """
+    Compare new inputs with the fitted preprocessing statistics.
+
+    ``mean_shift`` is how far the mean of each scaled feature has moved, in
+    standard deviations of the training data (the scaler's units);
+    ``clipped_share`` is the share of new values outside the OutlierHandler
+    bounds. Drift is declared when the largest mean shift exceeds
+    ``threshold``.
+    """
+    scaled = pipeline[:-1].transform(X)
+    features = pipeline[-2].feature_names_in_
+    mean_shift = dict(zip(features, np.abs(np.nanmean(scaled, axis=0)).tolist()))
+    clipped_share = {}
+    for step in pipeline[:-1]:
+        if isinstance(step, OutlierHandler):
+            for var, (lower, upper) in step.bounds.items():
+                clipped_share[var] = float(((X[var] < lower) | (X[var] > upper)).mean())
+    worst = max(mean_shift, key=mean_shift.__getitem__)
+    return {
+        "mean_shift": mean_shift,
+        "clipped_share": clipped_share,
+        "worst_feature": worst,
+        "max_mean_shift": mean_shift[worst],
+        "threshold": threshold,
+        "drifted": mean_shift[worst] > threshold,
+    }
+
+
+def update_pipeline(
+    pipeline: Pipeline,
+    X: pd.DataFrame,
+    y: pd.Series,
+    *,
+    new_trees: Optional[int] = None,
+    max_trees: Optional[int] = None,
+    drift_threshold: Optional[float] = None,
+) -> dict:
+    """
+    Grow the fitted forest of ``pipeline`` on new data, in place.
+
+    The preprocessing steps keep their fitted statistics (outlier bounds,
+    scaler, category mappings); only ``new_trees`` trees are trained, on
+    the new rows alone, through the forest's ``warm_start``. The oldest
+    trees are dropped beyond ``max_trees``. Raises DriftError, leaving the
+    pipeline untouched, when the new data has drifted past
+    ``drift_threshold``. Returns the drift report.
+    """
+    model_config = config.model_config_
+    new_trees = new_trees or model_config.update_new_trees
+    max_trees = max_trees or model_config.update_max_trees
+    threshold = model_config.update_drift_threshold if drift_threshold is None else drift_threshold
+
+    report = drift_report(pipeline, X, threshold)
+    if report["drifted"]:
+        raise DriftError(report)
+
+    model = pipeline[-1]
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + new_trees)
+    model.fit(pipeline[:-1].transform(X), y)
+    model.set_params(warm_start=False)
+    if len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.set_params(n_estimators=max_trees)
+    return report
+
+
+def run_update(*, file_name: str, new_trees: Optional[int] = None, drift_threshold: Optional[float] = None) -> str:
+    """
+    Update the latest model with a file of new rentals and save it as a new version.
+
+    Loads the newest saved version (base model or previous update), grows
+    it on ``file_name`` from the datasets folder and saves it as the next
+    ``<version>.updateN``. Returns the new version.
+    """
+    data = load_dataset(file_name=file_name)
+    validated_data, errors = validate_inputs(input_df=data)
+    if errors is not None:
+        raise ValueError(f"New data failed validation: {errors}")
+
+    current = latest_version()
+    pipeline = load_pipeline(file_name=f"{config.app_config_.pipeline_save_file}{current}.pkl")
+    start = time.perf_counter()
+    report = update_pipeline(
+        pipeline, validated_data, data[config.model_config_.target],
+        new_trees=new_trees, drift_threshold=drift_threshold,
+    )
+    print(f"Updated {current} with {len(data)} rows in {time.perf_counter() - start:.2f}s "
+          f"(max mean shift {report['max_mean_shift']:.2f} in {report['worst_feature']!r})")
+
+    number = int(current.rsplit(".update", 1)[1]) + 1 if ".update" in current else 1
+    version = update_version(number)
+    save_pipeline(pipeline_to_persist=pipeline, version=version)
+    return version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grow the latest model on a file of new rentals.")
+    parser.add_argument("file_name", help="CSV in the datasets folder, in the training data format")
+    parser.add_argument("--new-trees", type=int, default=None, help="trees to add (default: update_new_trees)")
+    parser.add_argument("--drift-threshold", type=float, default=None)
+    args = parser.parse_args()
+
+    print(run_update(file_name=args.file_name, new_trees=args.new_trees, drift_threshold=args.drift_threshold))
@@ -4,18 +4,29 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
+import asyncio
 import json
-from typing import Any
+from typing import Any, Callable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Body
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from bikerental_model import __version__ as model_version
-from bikerental_model.predict import make_prediction
+from bikerental_model.config.core import config as model_config
+from bikerental_model.instrumentation import stage_metrics
+from bikerental_model.model_registry import model_registry
+from bikerental_model.prediction_cache import LocalCacheBackend, PredictionCache, RedisCacheBackend
+from bikerental_model.predict import make_batch_prediction, make_grouped_prediction
+from bikerental_model.predict import make_forecast, make_trusted_prediction
+from bikerental_model.processing.forecast import WEATHER_COLUMNS
 
 from app import __version__, schemas
+from app.batching import MicroBatcher
 from app.config import settings
+from app.inference import InferenceQueueFull, inference_executor
+from app.responses import NumpyJSONResponse, dumps
 
 api_router = APIRouter()
 
@@ -25,7 +36,10 @@ def health() -> dict:
     Root Get
     """
     health = schemas.Health(
-        name=settings.PROJECT_NAME, api_version=__version__, model_version=model_version
+        name=settings.PROJECT_NAME,
+        api_version=__version__,
+        model_version=model_version,
+        model_ready=model_registry.is_ready(model_version),
     )
 
     return health.dict()
@@ -72,24 +86,295 @@ example_input ={
   ]
 }
 
+example_columnar_input = {column: [value] for column, value in example_input["inputs"][0].items()}
+
+# one day; a week is the same with 168 values per weather column
+example_forecast = {
+    "start": "2012-11-05",
+    "end": "2012-11-05",
+    "temp": [6.1] * 24,
+    "atemp": [3.0014] * 24,
+    "hum": [49.0] * 24,
+    "windspeed": [19.0012] * 24,
+    "weathersit": ["Mist"] * 24,
+}
+
+
+def _build_prediction_cache() -> Optional[PredictionCache]:
+    if not settings.PREDICTION_CACHE_ENABLED:
+        return None
+    backend: Union[LocalCacheBackend, RedisCacheBackend]
+    if settings.PREDICTION_CACHE_REDIS_URL:
+        backend = RedisCacheBackend(settings.PREDICTION_CACHE_REDIS_URL, ttl=settings.PREDICTION_CACHE_TTL_SECONDS)
+    else:
+        backend = LocalCacheBackend(
+            max_size=settings.PREDICTION_CACHE_SIZE, ttl=settings.PREDICTION_CACHE_TTL_SECONDS
+        )
+    return PredictionCache(backend)
+
+
+prediction_cache = _build_prediction_cache()
+
+
+async def run_inference(func: Callable, **kwargs) -> Any:
+    """Run a prediction call on the bounded inference executor."""
+    try:
+        return await inference_executor.run(func, **kwargs)
+    except InferenceQueueFull:
+        raise HTTPException(status_code=503, detail="Inference queue is full, retry later")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Prediction timed out")
+
+
+def _records(inputs: list) -> List[dict]:
+    """Plain records from request items; the request schema has already validated them."""
+    return [dict(item) for item in inputs]
+
+
+def _predict(inputs: list) -> dict:
+    """Score one request's records; runs on an inference worker."""
+    return make_trusted_prediction(input_data=_records(inputs), cache=prediction_cache)
+
+
+def _predict_intervals(inputs: list) -> dict:
+    """Score one request's records with per-tree quantiles; runs on an inference worker."""
+    return make_trusted_prediction(
+        input_data=_records(inputs), quantiles=model_config.model_config_.prediction_quantiles
+    )
+
+
+def _predict_grouped(groups: List[list]) -> List[Any]:
+    """Score coalesced requests together; runs on an inference worker."""
+    input_dfs = [pd.DataFrame(_records(inputs)) for inputs in groups]
+    try:
+        return make_grouped_prediction(input_data=input_dfs, validate=False, cache=prediction_cache)
+    except Exception:
+        # keep a bad request from failing the others in its batch
+        results: List[Any] = []
+        for inputs in groups:
+            try:
+                results.append(make_trusted_prediction(input_data=_records(inputs), cache=prediction_cache))
+            except Exception as error:
+                results.append(error)
+        return results
+
+
+async def _run_batch(groups: List[list]) -> List[Any]:
+    return await run_inference(_predict_grouped, groups=groups)
+
+
+micro_batcher = MicroBatcher(_run_batch, window_ms=settings.BATCH_WINDOW_MS, max_rows=settings.BATCH_MAX_ROWS)
+
+
+@api_router.get("/stats", status_code=200)
+def stats() -> dict:
+    """
+    Serving statistics: inference queue depth, micro-batching metrics
+    and prediction cache hit/miss counters
+    """
+    return {
+        "inference": {"workers": inference_executor.max_workers, "pending": inference_executor.pending},
+        "batching": micro_batcher.stats() if settings.BATCHING_ENABLED else None,
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+    }
+
+
+@api_router.get("/metrics", response_class=PlainTextResponse, status_code=200)
+def metrics() -> str:
+    """
+    Per-stage prediction timings (and micro-batching histograms) in the
+    Prometheus text exposition format
+    """
+    text = stage_metrics.prometheus()
+    if settings.BATCHING_ENABLED:
+        lines = []
+        for name, histogram in (
+            ("bikerental_batch_size_rows", micro_batcher.batch_sizes),
+            ("bikerental_batch_queue_delay_seconds", micro_batcher.queue_delays),
+        ):
+            lines += [f"# TYPE {name} histogram", *histogram.prometheus_lines(name)]
+        text += "\n".join(lines) + "\n"
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
 
 @api_router.post("/predict", response_model=schemas.PredictionResults, status_code=200)
-async def predict(input_data: schemas.MultipleDataInputs = Body(..., example=example_input)) -> Any:
+async def predict(
+    input_data: schemas.MultipleDataInputs = Body(..., examples=[example_input]), intervals: bool = False
+) -> Any:
     """
-    Bikerental total count predictions with the bikerental_model
+    Bikerental total count predictions with the bikerental_model. With
+    ``intervals=true`` the response also holds ``quantiles`` of the
+    forest's per-tree predictions (prediction_quantiles in the model config)
     """
 
-    input_df = pd.DataFrame(jsonable_encoder(input_data.inputs))
-    print(input_df)
-    
-    results = make_prediction(input_data=input_df.replace({np.nan: None}))
+    if intervals:
+        results = await run_inference(_predict_intervals, inputs=input_data.inputs)
+    elif settings.BATCHING_ENABLED:
+        results = await micro_batcher.submit(input_data.inputs)
+    else:
+        results = await run_inference(_predict, inputs=input_data.inputs)
 
     if results["errors"] is not None:
         raise HTTPException(status_code=400, detail=json.loads(results["errors"]))
 
+    return _single_prediction(results)
+
+
+def _single_prediction(results: dict) -> dict:
+    """A one-row result's arrays as the plain floats of ``PredictionResults``."""
+    results = dict(results)
+    predictions = results["predictions"]
+    if isinstance(predictions, np.ndarray) and predictions.size == 1:
+        results["predictions"] = predictions.item()
+    if results.get("quantiles"):
+        results["quantiles"] = {
+            label: band.item() if isinstance(band, np.ndarray) and band.size == 1 else band
+            for label, band in results["quantiles"].items()
+        }
     return results
 
 
+def _results_response(results: dict, model) -> NumpyJSONResponse:
+    """``results`` as the fields of the response ``model`` (absent ones as null), serialized as they are."""
+    return NumpyJSONResponse({field: results.get(field) for field in model.model_fields})
+
+
+def _ndjson_lines(chunk: dict, offset: int) -> bytes:
+    """One NDJSON line per prediction of a scored chunk starting at row ``offset``."""
+    lines = [
+        {"row": offset + i, "prediction": prediction}
+        for i, prediction in enumerate(chunk["predictions"].tolist())
+    ]
+    for label, band in (chunk.get("quantiles") or {}).items():
+        for line, value in zip(lines, band.tolist()):
+            line[label] = value
+    return b"".join(dumps(line) + b"\n" for line in lines)
+
+
+async def _ndjson_predictions(inputs: list, first: dict, quantiles: Optional[List[float]] = None):
+    """Yield NDJSON lines chunk by chunk, scoring each chunk on the inference executor.
+
+    ``first`` is the already scored first chunk. Once the response has
+    started its status can no longer change, so a later chunk that is
+    rejected (503) or times out (504) ends the stream with an error line.
+    """
+    chunk_size = model_config.app_config_.prediction_chunk_size
+    chunk = first
+    for offset in range(0, len(inputs), chunk_size):
+        if offset:
+            try:
+                chunk = await run_inference(
+                    _predict_batch, inputs=inputs[offset:offset + chunk_size], quantiles=quantiles
+                )
+            except HTTPException as error:
+                yield dumps({"offset": offset, "status_code": error.status_code, "detail": error.detail}) + b"\n"
+                return
+        if chunk["errors"] is not None:
+            yield dumps({"offset": offset + chunk["offset"], "errors": json.loads(chunk["errors"])}) + b"\n"
+            return
+        yield _ndjson_lines(chunk, offset)
+
+
+def _predict_batch(inputs: list, quantiles: Optional[List[float]] = None) -> dict:
+    input_df = pd.DataFrame(_records(inputs))
+    return make_batch_prediction(input_data=input_df, cache=prediction_cache, validate=False, quantiles=quantiles)
+
+
+def _predict_columns(columns: schemas.ColumnarDataInputs, quantiles: Optional[List[float]] = None) -> dict:
+    """Score a columnar request; its lists become the DataFrame's columns as they are."""
+    input_data = {column: values for column, values in columns if values is not None}
+    return make_batch_prediction(input_data=input_data, cache=prediction_cache, validate=False, quantiles=quantiles)
+
+
+@api_router.post(
+    "/predict/batch",
+    response_model=schemas.BatchPredictionResults,
+    response_class=NumpyJSONResponse,
+    status_code=200,
+)
+async def predict_batch(
+    input_data: schemas.MultipleDataInputs = Body(..., examples=[example_input]),
+    stream: bool = False,
+    intervals: bool = False,
+) -> Any:
+    """
+    Bikerental total count predictions for large batches, scored in
+    fixed-size vectorized chunks. With ``stream=true`` the predictions are
+    streamed back as NDJSON, one ``{"row", "prediction"}`` object per line,
+    each chunk scored on the inference executor like any other request.
+    With ``intervals=true`` the per-tree quantiles are added, as lists
+    under ``quantiles`` or as ``"p10"``-style keys of each NDJSON line.
+    The prediction arrays are serialized directly (NumpyJSONResponse).
+    """
+    quantiles = model_config.model_config_.prediction_quantiles if intervals else None
+
+    if stream:
+        # the first chunk is scored up front, so a full queue or a timeout still gets its 503/504
+        chunk_size = model_config.app_config_.prediction_chunk_size
+        first = await run_inference(_predict_batch, inputs=input_data.inputs[:chunk_size], quantiles=quantiles)
+        return StreamingResponse(
+            _ndjson_predictions(input_data.inputs, first, quantiles), media_type="application/x-ndjson"
+        )
+
+    results = await run_inference(_predict_batch, inputs=input_data.inputs, quantiles=quantiles)
+
+    if results["errors"] is not None:
+        raise HTTPException(status_code=400, detail=json.loads(results["errors"]))
+
+    return _results_response(results, schemas.BatchPredictionResults)
+
+
+@api_router.post(
+    "/predict/batch/columnar",
+    response_model=schemas.BatchPredictionResults,
+    response_class=NumpyJSONResponse,
+    status_code=200,
+)
+async def predict_batch_columnar(
+    input_data: schemas.ColumnarDataInputs = Body(..., examples=[example_columnar_input]),
+    intervals: bool = False,
+) -> Any:
+    """
+    /predict/batch for a columnar body, one list per input column
+    (``{"dteday": [...], "temp": [...], ...}``). The lists are checked
+    against the same categories and ranges as row inputs and become the
+    DataFrame's columns without building an object per row
+    """
+    quantiles = model_config.model_config_.prediction_quantiles if intervals else None
+    results = await run_inference(_predict_columns, columns=input_data, quantiles=quantiles)
+
+    if results["errors"] is not None:
+        raise HTTPException(status_code=400, detail=json.loads(results["errors"]))
+
+    return _results_response(results, schemas.BatchPredictionResults)
+
+
+def _forecast(forecast: schemas.ForecastInputs, quantiles: Optional[List[float]] = None) -> dict:
+    weather = {column: getattr(forecast, column) for column in WEATHER_COLUMNS}
+    return make_forecast(start=forecast.start, end=forecast.end, weather=weather, validate=False, quantiles=quantiles)
+
+
+@api_router.post(
+    "/forecast", response_model=schemas.ForecastResults, response_class=NumpyJSONResponse, status_code=200
+)
+async def forecast(
+    input_data: schemas.ForecastInputs = Body(..., examples=[example_forecast]), intervals: bool = False
+) -> Any:
+    """
+    Hourly bikerental total count predictions for a date range. The
+    request holds the range and one value per hour of it for each weather
+    column; the date x hour grid and its calendar columns (weekday, mnth,
+    yr, season, holiday, workingday) are built server-side and scored as
+    one batch. ``intervals=true`` adds quantiles as in /predict/batch
+    """
+    quantiles = model_config.model_config_.prediction_quantiles if intervals else None
+    results = await run_inference(_forecast, forecast=input_data, quantiles=quantiles)
+
+    if results["errors"] is not None:
+        raise HTTPException(status_code=400, detail=json.loads(results["errors"]))
+
+    return _results_response(results, schemas.ForecastResults)
+
 
 @api_router.post("/items")
 async def create_item(item: schemas.Item):
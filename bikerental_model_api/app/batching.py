@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from bikerental_model.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+QUEUE_DELAY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class MicroBatcher:
+    """
+    Dynamic request coalescer.
+
+    Concurrent requests are queued and collected until either ``window_ms``
+    has passed since the first one arrived or ``max_rows`` rows are waiting.
+    The collected requests are handed to ``run_batch`` as one list, which
+    must return one result per request (or an Exception to raise for that
+    request only); the results are then fanned back out to the callers.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], Awaitable[List[Any]]], window_ms: float, max_rows: int):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_delays = Histogram(QUEUE_DELAY_BUCKETS)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # the event loop only keeps weak references to tasks: hold the running dispatches
+        self._dispatches: Set[asyncio.Task] = set()
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._collect(self._queue))
+        return self._queue
+
+    async def submit(self, inputs: list) -> Any:
+        """Queue one request's rows and wait for its share of the batch result."""
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((inputs, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.window
+            while rows < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            dispatch = loop.create_task(self._dispatch(batch, rows))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[list, asyncio.Future, float]], rows: int) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self.queue_delays.observe(started - enqueued)
+        self.batch_sizes.observe(rows)
+
+        try:
+            results = await self.run_batch([inputs for inputs, _, _ in batch])
+        except Exception as error:
+            results = [error] * len(batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_rows": self.max_rows,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_delay_seconds": self.queue_delays.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
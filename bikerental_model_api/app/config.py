@@ -1,8 +1,8 @@
 import sys
-from typing import List
+from typing import List, Optional
 
 from pydantic import AnyHttpUrl
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
@@ -20,8 +20,39 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "Bike rental total count Prediction API"
 
-    class Config:
-        case_sensitive = True
+    # Load the trained pipeline during startup instead of on the first request
+    MODEL_WARM_UP: bool = True
+
+    # Inference executor: "thread" or "process" pool, number of workers,
+    # how many requests may wait for a worker before answering 503, and
+    # the per-request timeout (504) in seconds
+    INFERENCE_EXECUTOR: str = "thread"
+    INFERENCE_WORKERS: int = 4
+    INFERENCE_QUEUE_SIZE: int = 32
+    INFERENCE_TIMEOUT_SECONDS: float = 10.0
+
+    # Micro-batching of concurrent /predict calls: wait at most
+    # BATCH_WINDOW_MS or until BATCH_MAX_ROWS rows are queued
+    BATCHING_ENABLED: bool = False
+    BATCH_WINDOW_MS: float = 5.0
+    BATCH_MAX_ROWS: int = 64
+
+    # Predicted-demand cache: in-process LRU/TTL, or shared between
+    # workers through Redis when PREDICTION_CACHE_REDIS_URL is set
+    PREDICTION_CACHE_ENABLED: bool = False
+    PREDICTION_CACHE_SIZE: int = 100000
+    PREDICTION_CACHE_TTL_SECONDS: float = 3600.0
+    PREDICTION_CACHE_REDIS_URL: Optional[str] = None
+
+    # Per-stage timing of the prediction pipeline, served by /metrics in
+    # the Prometheus text format. With INFERENCE_EXECUTOR="process" the
+    # stages run in the worker processes and are not visible here.
+    STAGE_METRICS_ENABLED: bool = True
+
+    # Longest date range one /forecast request may cover
+    FORECAST_MAX_DAYS: int = 31
+
+    model_config = SettingsConfigDict(case_sensitive=True)
 
 settings = Settings()
 
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+
+class InferenceQueueFull(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class InferenceExecutor:
+    """
+    Bounded executor that keeps CPU-bound prediction work off the event loop.
+
+    At most ``max_workers`` calls run at once and at most ``queue_size`` more
+    wait for a worker; anything beyond that is rejected straight away with
+    InferenceQueueFull so the API can answer 503 instead of piling up work.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int, timeout: float, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError("kind must be 'thread' or 'process'")
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Calls currently running or waiting for a worker."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._executor
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func`` on a worker, raising InferenceQueueFull or asyncio.TimeoutError."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_size:
+                raise InferenceQueueFull(f"{self._pending} inference calls already in flight")
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(partial(func, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        # the slot is only freed once the worker is really done, even after a timeout
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    queue_size=settings.INFERENCE_QUEUE_SIZE,
+    timeout=settings.INFERENCE_TIMEOUT_SECONDS,
+    kind=settings.INFERENCE_EXECUTOR,
+)
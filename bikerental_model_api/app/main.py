@@ -4,17 +4,42 @@ file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 #print(sys.path)
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
-from app.api import api_router
+from bikerental_model import __version__ as model_version
+from bikerental_model.instrumentation import stage_metrics
+from bikerental_model.model_registry import model_registry
+
+from app.api import api_router, micro_batcher
 from app.config import settings
+from app.inference import inference_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # stage timing is a library-wide switch: turned on for the app's lifetime only
+    stages_were_enabled = stage_metrics.enabled
+    stage_metrics.enabled = settings.STAGE_METRICS_ENABLED
+    if settings.MODEL_WARM_UP:
+        try:
+            model_registry.warm_up(model_version)
+            print(f"Model {model_version} loaded in {model_registry.load_seconds[model_version]:.3f}s")
+        except FileNotFoundError as error:
+            # keep serving; /health reports model_ready=false until a model exists
+            print(f"Model warm-up failed: {error}")
+    yield
+    micro_batcher.shutdown()
+    inference_executor.shutdown()
+    stage_metrics.enabled = stages_were_enabled
+
 
 app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json", lifespan=lifespan
 )
 
 root_router = APIRouter()
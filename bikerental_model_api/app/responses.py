@@ -0,0 +1,43 @@
+import datetime
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the standard library encoder
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        if np.issubdtype(value.dtype, np.datetime64):
+            return np.datetime_as_string(value, unit="s").tolist()
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON, writing NumPy arrays and scalars directly."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class NumpyJSONResponse(JSONResponse):
+    """
+    JSON response for prediction results holding NumPy arrays.
+
+    Returned directly by an endpoint, it skips the response_model
+    validation and jsonable_encoder pass: the arrays are serialized as they
+    are, by orjson when it is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
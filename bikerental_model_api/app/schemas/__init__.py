@@ -1,2 +1,3 @@
 from .health import Health
-from .predict import MultipleDataInputs, PredictionResults, Item
+from .predict import MultipleDataInputs, ColumnarDataInputs, PredictionResults, BatchPredictionResults, Item
+from .forecast import ForecastInputs, ForecastResults
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, model_validator
+
+from bikerental_model.config.core import config
+from bikerental_model.processing.forecast import HOURS_PER_DAY, WEATHER_COLUMNS
+
+from app.config import settings
+from app.schemas.predict import Atemp, Hum, Temp, Weathersit, Windspeed
+
+_model_config = config.model_config_
+
+
+# A date range plus one weather value per hour of it, day by day from 12am;
+# the calendar columns of every hour are derived server-side.
+class ForecastInputs(BaseModel):
+    start: date
+    end: date  # inclusive
+    temp: List[Temp]
+    atemp: List[Atemp]
+    hum: List[Hum]
+    windspeed: List[Windspeed]
+    weathersit: List[Optional[Weathersit]]  # missing values are imputed
+
+    @model_validator(mode="after")
+    def grid_matches_weather(self) -> "ForecastInputs":
+        days = (self.end - self.start).days + 1
+        if days < 1:
+            raise ValueError("end should not be before start")
+        if days > settings.FORECAST_MAX_DAYS:
+            raise ValueError(f"at most {settings.FORECAST_MAX_DAYS} days can be forecast at once")
+        # 'yr' is derived from the date and must be one the model was trained on
+        for year in range(self.start.year, self.end.year + 1):
+            if str(year) not in _model_config.year_mapping:
+                raise ValueError(f"year should be one of {', '.join(_model_config.year_mapping)}")
+        for column in WEATHER_COLUMNS:
+            if len(getattr(self, column)) != days * HOURS_PER_DAY:
+                raise ValueError(f"{column} should have {days * HOURS_PER_DAY} hourly values ({days} days)")
+        return self
+
+
+class ForecastResults(BaseModel):
+    errors: Optional[Any]
+    version: str
+    timestamps: Optional[List[datetime]]
+    predictions: Optional[List[float]]
+    quantiles: Optional[Dict[str, List[float]]] = None
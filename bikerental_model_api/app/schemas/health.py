@@ -5,3 +5,4 @@ class Health(BaseModel):
     name: str
     api_version: str
     model_version: str
+    model_ready: bool
@@ -1,32 +1,117 @@
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel, StrictStr
+from pydantic import BaseModel, Field, StrictStr, field_validator, model_validator
+from typing_extensions import Annotated
 from datetime import date
 
+from bikerental_model.config.core import config
+
+_model_config = config.model_config_
+_ranges = _model_config.numeric_ranges
+
+# The model's categories as Literal types; they are built from the config
+# at import time, so type checkers see plain strings.
+if TYPE_CHECKING:
+    Season = str
+    Hour = str
+    Holiday = str
+    Weekday = str
+    Workingday = str
+    Weathersit = str
+else:
+    Season = Literal[tuple(_model_config.season_mappings)]
+    Hour = Literal[tuple(_model_config.hour_mapping)]
+    Holiday = Literal[tuple(_model_config.holiday_mapping)]
+    Weekday = Literal[tuple(_model_config.weekday_categories)]
+    Workingday = Literal[tuple(_model_config.workingday_mapping)]
+    Weathersit = Literal[tuple(_model_config.weather_mappings)]
+
+Temp = Annotated[float, Field(ge=_ranges["temp"][0], le=_ranges["temp"][1])]
+Atemp = Annotated[float, Field(ge=_ranges["atemp"][0], le=_ranges["atemp"][1])]
+Hum = Annotated[float, Field(ge=_ranges["hum"][0], le=_ranges["hum"][1])]
+Windspeed = Annotated[float, Field(ge=_ranges["windspeed"][0], le=_ranges["windspeed"][1])]
+
 
 class PredictionResults(BaseModel):
     errors: Optional[Any]
     version: str
     #predictions: Optional[List[int]]
     predictions: Optional[float]
+    # per-tree quantiles of the prediction, e.g. {"p10": ..., "p90": ...}, with intervals=true
+    quantiles: Optional[Dict[str, float]] = None
+
+class BatchPredictionResults(BaseModel):
+    errors: Optional[Any]
+    version: str
+    predictions: Optional[List[float]]
+    quantiles: Optional[Dict[str, List[float]]] = None
 
+# Categories and ranges come from the model config, and only the inputs the
+# pipeline imputes (weekday, weathersit) or tolerates (numeric values) may be
+# null, so a request that passes this schema can be scored by the model
+# package without validating it again.
 class DataInputSchemaValidation(BaseModel):
-    dteday: Optional[date]  # Date column
-    season: Optional[str] = None  # Categorical (object)
-    hr: Optional[str] = None # Categorical (object)
-    holiday: Optional[str] = None # Categorical (object)
-    weekday: Optional[str] = None # Categorical (object) - has missing values
-    workingday: Optional[str] = None # Categorical (object)
-    weathersit: Optional[str] = None # Categorical (object) - has missing values
-    temp: Optional[float] = None # Continuous numeric
-    atemp: Optional[float] = None # Continuous numeric
-    hum: Optional[float] = None # Continuous numeric
-    windspeed: Optional[float] = None # Continuous numeric
+    dteday: date  # Date column
+    season: Season  # Categorical (object)
+    hr: Hour # Categorical (object)
+    holiday: Holiday # Categorical (object)
+    weekday: Optional[Weekday] = None # Categorical (object) - has missing values
+    workingday: Workingday # Categorical (object)
+    weathersit: Optional[Weathersit] = None # Categorical (object) - has missing values
+    temp: Optional[float] = Field(None, ge=_ranges["temp"][0], le=_ranges["temp"][1]) # Continuous numeric
+    atemp: Optional[float] = Field(None, ge=_ranges["atemp"][0], le=_ranges["atemp"][1]) # Continuous numeric
+    hum: Optional[float] = Field(None, ge=_ranges["hum"][0], le=_ranges["hum"][1]) # Continuous numeric
+    windspeed: Optional[float] = Field(None, ge=_ranges["windspeed"][0], le=_ranges["windspeed"][1]) # Continuous numeric
     mnth: Optional[str] = None # Categorical (object)
 
+    @field_validator("dteday")
+    @classmethod
+    def year_is_known(cls, value: date) -> date:
+        # 'yr' is derived from the date and must be one the model was trained on
+        if str(value.year) not in _model_config.year_mapping:
+            raise ValueError(f"year should be one of {', '.join(_model_config.year_mapping)}")
+        return value
+
 class MultipleDataInputs(BaseModel):
     inputs: List[DataInputSchemaValidation]
 
+T = TypeVar("T")
+_Column = Optional[List[Optional[T]]]
+
+
+# The same inputs as MultipleDataInputs, one list per column, e.g.
+# {"dteday": [...], "temp": [...], ...}: the lists become DataFrame columns
+# as they are, without building a model per row.
+class ColumnarDataInputs(BaseModel):
+    dteday: List[date]
+    season: List[Season]
+    hr: List[Hour]
+    holiday: List[Holiday]
+    weekday: _Column[Weekday] = None
+    workingday: List[Workingday]
+    weathersit: _Column[Weathersit] = None
+    temp: _Column[Temp] = None
+    atemp: _Column[Atemp] = None
+    hum: _Column[Hum] = None
+    windspeed: _Column[Windspeed] = None
+    mnth: _Column[str] = None
+
+    @field_validator("dteday")
+    @classmethod
+    def years_are_known(cls, values: List[date]) -> List[date]:
+        unknown = {value.year for value in values} - set(map(int, _model_config.year_mapping))
+        if unknown:
+            raise ValueError(f"year should be one of {', '.join(_model_config.year_mapping)}")
+        return values
+
+    @model_validator(mode="after")
+    def columns_have_equal_lengths(self) -> "ColumnarDataInputs":
+        rows = len(self.dteday)
+        for column, values in self:
+            if values is not None and len(values) != rows:
+                raise ValueError(f"{column} has {len(values)} values, dteday has {rows}")
+        return self
+
 class Item(BaseModel):
     inputs: List[DataInputSchemaValidation]
 
@@ -49,7 +49,7 @@ setup(
     packages=find_packages(exclude=("tests",)),
     package_data={"classification_model": ["VERSION"]},
     install_requires=list_reqs(),
-    extras_require={},
+    extras_require={"dataset-cache": ["pyarrow>=14.0"]},
     include_package_data=True,
     license="BSD-3",
     classifiers=[
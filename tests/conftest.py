@@ -3,6 +3,7 @@ from pathlib import Path
 file = Path(__file__).resolve()
 parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
+sys.path.append(str(root / "bikerental_model_api"))
 
 import pytest
 from sklearn.model_selection import train_test_split
@@ -33,4 +34,13 @@ def sample_input_data():
         random_state=config.model_config_.random_state,
     )
 
-    return X_test, y_test, X_train, y_train
\ No newline at end of file
+    return X_test, y_test, X_train, y_train
+
+@pytest.fixture
+def client():
+    # the API is imported lazily, so the model package tests do not need it
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,271 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import json
+
+import numpy as np
+import pytest
+
+from bikerental_model.instrumentation import stage_metrics
+
+
+def _rows(inputs) -> dict:
+    return {"inputs": json.loads(inputs.to_json(orient="records", date_format="iso"))}
+
+
+def _columns(inputs) -> dict:
+    records = _rows(inputs)["inputs"]
+    return {column: [record[column] for record in records] for column in records[0]}
+
+
+def test_metrics_serve_stage_histograms_in_prometheus_format(client, sample_input_data):
+    # Given
+    stage_metrics.reset()
+    client.post("/api/v1/predict/batch", json=_rows(sample_input_data[0].iloc[:5])).raise_for_status()
+
+    # When
+    response = client.get("/api/v1/metrics")
+    client.__exit__(None, None, None)
+
+    # Then
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE bikerental_stage_seconds histogram" in lines
+    assert 'bikerental_stage_seconds_count{stage="model_rf"} 1' in lines
+    assert 'bikerental_stage_rows_bucket{stage="model_rf",le="10"} 1' in lines
+    assert 'bikerental_stage_seconds_bucket{stage="model_rf",le="+Inf"} 1' in lines
+    # the app turns stage timing on for its lifetime only
+    assert not stage_metrics.enabled
+    stage_metrics.reset()
+
+
+def test_batched_predict_reads_and_fills_the_prediction_cache(client, sample_input_data, monkeypatch):
+    # Given
+    from app import api
+    from app.config import settings
+    from bikerental_model.prediction_cache import LocalCacheBackend, PredictionCache
+
+    monkeypatch.setattr(settings, "BATCHING_ENABLED", True)
+    monkeypatch.setattr(api, "prediction_cache", PredictionCache(LocalCacheBackend()))
+    payload = _rows(sample_input_data[0].iloc[:1])
+
+    # When
+    first = client.post("/api/v1/predict", json=payload)
+    second = client.post("/api/v1/predict", json=payload)
+    stats = client.get("/api/v1/stats").json()
+
+    # Then
+    assert first.json()["predictions"] == second.json()["predictions"]
+    assert stats["cache"]["misses"] == 1
+    assert stats["cache"]["hits"] == 1
+    assert stats["batching"]["batch_size"]["count"] >= 2
+
+
+def test_columnar_batch_matches_row_batch(client, sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:50]
+
+    # When
+    rows = client.post("/api/v1/predict/batch", json=_rows(X_test))
+    columns = client.post("/api/v1/predict/batch/columnar", json=_columns(X_test))
+
+    # Then
+    assert rows.status_code == columns.status_code == 200
+    assert len(columns.json()["predictions"]) == 50
+    np.testing.assert_array_equal(columns.json()["predictions"], rows.json()["predictions"])
+
+
+@pytest.mark.filterwarnings("error")
+def test_columnar_batch_imputes_absent_optional_columns(client, sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:20].copy()
+    X_test[["weekday", "weathersit"]] = None
+    columns = _columns(X_test)
+    del columns["weekday"], columns["weathersit"]
+
+    # When
+    rows = client.post("/api/v1/predict/batch", json=_rows(X_test))
+    response = client.post("/api/v1/predict/batch/columnar", json=columns)
+
+    # Then
+    assert response.status_code == 200
+    np.testing.assert_array_equal(response.json()["predictions"], rows.json()["predictions"])
+
+
+def test_columnar_batch_rejects_unequal_column_lengths(client, sample_input_data):
+    # Given
+    body = _columns(sample_input_data[0].iloc[:5])
+    body["temp"] = body["temp"][:4]
+
+    # When
+    response = client.post("/api/v1/predict/batch/columnar", json=body)
+
+    # Then
+    assert response.status_code == 422
+    assert "temp has 4 values, dteday has 5" in response.text
+
+
+def test_columnar_batch_rejects_unknown_years(client, sample_input_data):
+    # Given
+    body = _columns(sample_input_data[0].iloc[:5])
+    body["dteday"][2] = "2013-01-15"
+
+    # When
+    response = client.post("/api/v1/predict/batch/columnar", json=body)
+
+    # Then
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "dteday"]
+    assert "year should be one of 2011, 2012" in response.text
+
+
+def test_intervals_add_ordered_quantiles_to_every_endpoint(client, sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:20]
+    requests = {
+        "predict": _rows(X_test.iloc[:1]),
+        "predict/batch": _rows(X_test),
+        "predict/batch/columnar": _columns(X_test),
+    }
+
+    for route, body in requests.items():
+        # When
+        plain = client.post(f"/api/v1/{route}", json=body).json()
+        response = client.post(f"/api/v1/{route}?intervals=true", json=body)
+
+        # Then
+        assert response.status_code == 200, route
+        results = response.json()
+        assert sorted(results["quantiles"]) == ["p10", "p50", "p90"]
+        p10, p50, p90 = (np.atleast_1d(results["quantiles"][label]) for label in ("p10", "p50", "p90"))
+        assert (p10 <= p50).all() and (p50 <= p90).all()
+        np.testing.assert_allclose(results["predictions"], plain["predictions"])
+        assert plain["quantiles"] is None
+
+
+def test_streamed_intervals_add_quantile_keys_to_each_line(client, sample_input_data):
+    # Given
+    body = _rows(sample_input_data[0].iloc[:5])
+
+    # When
+    response = client.post("/api/v1/predict/batch?stream=true&intervals=true", json=body)
+
+    # Then
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["row"] for line in lines] == list(range(5))
+    assert all(line["p10"] <= line["p50"] <= line["p90"] for line in lines)
+
+
+def _forecast_body(start: str, end: str, hours: int) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "temp": [12.0] * hours,
+        "atemp": [11.0] * hours,
+        "hum": [60.0] * hours,
+        "windspeed": [10.0] * hours,
+        "weathersit": ["Clear"] * hours,
+    }
+
+
+def test_forecast_scores_the_hourly_grid(client):
+    # Given
+    from bikerental_model.predict import make_forecast
+
+    body = _forecast_body("2012-06-30", "2012-07-01", 48)
+    weather = {column: body[column] for column in ("temp", "atemp", "hum", "windspeed", "weathersit")}
+
+    # When
+    response = client.post("/api/v1/forecast", json=body)
+
+    # Then
+    assert response.status_code == 200
+    results = response.json()
+    np.testing.assert_array_equal(
+        results["predictions"], make_forecast(start="2012-06-30", end="2012-07-01", weather=weather)["predictions"]
+    )
+    assert results["timestamps"][0].startswith("2012-06-30T00:00:00")
+    assert results["timestamps"][-1].startswith("2012-07-01T23:00:00")
+
+
+def test_forecast_rejects_ranges_it_cannot_score(client, monkeypatch):
+    # Given
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "FORECAST_MAX_DAYS", 2)
+    short_temp = _forecast_body("2012-06-01", "2012-06-01", 24)
+    short_temp["temp"] = short_temp["temp"][:23]
+    bodies = {
+        "at most 2 days can be forecast at once": _forecast_body("2012-06-01", "2012-06-03", 72),
+        "end should not be before start": _forecast_body("2012-06-02", "2012-06-01", 24),
+        "temp should have 24 hourly values (1 days)": short_temp,
+        "year should be one of 2011, 2012": _forecast_body("2012-12-31", "2013-01-01", 48),
+    }
+
+    for message, body in bodies.items():
+        # When
+        response = client.post("/api/v1/forecast", json=body)
+
+        # Then
+        assert response.status_code == 422, message
+        assert message in response.text
+
+
+def test_single_record_with_a_null_numeric_value_is_scored(client, sample_input_data):
+    # Given
+    body = _rows(sample_input_data[0].iloc[:1])
+    body["inputs"][0]["temp"] = None
+
+    # When
+    plain = client.post("/api/v1/predict", json=body)
+    batch = client.post("/api/v1/predict/batch", json=body)
+
+    # Then
+    assert plain.status_code == batch.status_code == 200
+    np.testing.assert_allclose(batch.json()["predictions"], [plain.json()["predictions"]])
+
+
+def test_intervals_score_a_record_with_a_null_numeric_value(client, sample_input_data):
+    # Given
+    body = _rows(sample_input_data[0].iloc[:1])
+    body["inputs"][0]["temp"] = None
+
+    # When
+    plain = client.post("/api/v1/predict", json=body)
+    intervals = client.post("/api/v1/predict?intervals=true", json=body)
+    batch = client.post("/api/v1/predict/batch?intervals=true", json=body)
+
+    # Then
+    assert intervals.status_code == batch.status_code == 200
+    np.testing.assert_allclose(intervals.json()["predictions"], plain.json()["predictions"])
+    np.testing.assert_allclose(batch.json()["quantiles"]["p50"], [intervals.json()["quantiles"]["p50"]])
+
+
+def test_null_required_inputs_are_rejected_before_scoring(client, sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:3]
+    rows, columns = _rows(X_test), _columns(X_test)
+    rows["inputs"][1]["season"] = None
+    columns["dteday"][2] = None
+    no_hr = _columns(X_test)
+    del no_hr["hr"]
+
+    for route, body, loc in (
+        ("predict", {"inputs": rows["inputs"][1:2]}, ["body", "inputs", 0, "season"]),
+        ("predict/batch", rows, ["body", "inputs", 1, "season"]),
+        ("predict/batch/columnar", columns, ["body", "dteday", 2]),
+        ("predict/batch/columnar", no_hr, ["body", "hr"]),
+    ):
+        # When
+        response = client.post(f"/api/v1/{route}", json=body)
+
+        # Then
+        assert response.status_code == 422, route
+        assert response.json()["detail"][0]["loc"] == loc
@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import asyncio
+
+
+def _batcher(run_batch, window_ms: float, max_rows: int):
+    from app.batching import MicroBatcher
+
+    return MicroBatcher(run_batch, window_ms=window_ms, max_rows=max_rows)
+
+
+def test_micro_batcher_coalesces_requests_within_the_window_and_fans_out_in_order():
+    # Given
+    batches = []
+
+    async def run_batch(groups):
+        batches.append(groups)
+        assert len(batcher._dispatches) == 1  # the running dispatch is referenced
+        return [sum(rows) for rows in groups]
+
+    batcher = _batcher(run_batch, window_ms=50, max_rows=100)
+
+    async def scenario():
+        results = await asyncio.gather(*(batcher.submit([i] * (i + 1)) for i in range(3)))
+        await asyncio.sleep(0)
+        batcher.shutdown()
+        return results
+
+    # When
+    results = asyncio.run(scenario())
+
+    # Then
+    assert batches == [[[0], [1, 1], [2, 2, 2]]]
+    assert results == [0, 2, 6]
+    assert not batcher._dispatches
+    assert batcher.batch_sizes.snapshot()["count"] == 1
+    assert batcher.batch_sizes.snapshot()["sum"] == 6
+    assert batcher.queue_delays.snapshot()["count"] == 3
+    assert batcher.queue_delays.snapshot()["buckets"]["0.25"] == 3
+
+
+def test_micro_batcher_dispatches_at_max_rows_without_waiting_for_the_window():
+    # Given
+    batches = []
+
+    async def run_batch(groups):
+        batches.append(groups)
+        return [len(rows) for rows in groups]
+
+    batcher = _batcher(run_batch, window_ms=10_000, max_rows=4)
+
+    async def scenario():
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(["row", "row"]) for _ in range(4))), timeout=1
+        )
+        batcher.shutdown()
+        return results
+
+    # When
+    results = asyncio.run(scenario())
+
+    # Then
+    assert results == [2, 2, 2, 2]
+    assert [len(groups) for groups in batches] == [2, 2]
+    assert batcher.batch_sizes.snapshot()["buckets"]["4"] == 2
+
+
+def test_micro_batcher_fails_only_the_request_whose_result_is_an_exception():
+    # Given
+    async def run_batch(groups):
+        return [ValueError("bad rows") if rows == ["bad"] else rows[0] for rows in groups]
+
+    batcher = _batcher(run_batch, window_ms=50, max_rows=100)
+
+    async def scenario():
+        results = await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["bad"]), batcher.submit(["c"]), return_exceptions=True
+        )
+        batcher.shutdown()
+        return results
+
+    # When
+    first, second, third = asyncio.run(scenario())
+
+    # Then
+    assert (first, third) == ("a", "c")
+    assert isinstance(second, ValueError)
+
+
+def test_micro_batcher_fails_every_request_when_the_batch_raises():
+    # Given
+    async def run_batch(groups):
+        raise RuntimeError("worker died")
+
+    batcher = _batcher(run_batch, window_ms=10, max_rows=100)
+
+    async def scenario():
+        results = await asyncio.gather(batcher.submit([1]), batcher.submit([2]), return_exceptions=True)
+        batcher.shutdown()
+        return results
+
+    # When
+    results = asyncio.run(scenario())
+
+    # Then
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import pandas as pd
+import pytest
+
+from bikerental_model.processing.dataset_cache import read_csv_cached
+
+
+def test_read_csv_cached_round_trips_and_reuses_cache(sample_input_data, tmp_path):
+    # Given
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "sample.csv"
+    sample_input_data[0].iloc[:200].to_csv(source, index=False)
+    expected = pd.read_csv(source)
+
+    # When
+    first = read_csv_cached(source, tmp_path / "cache", categorical=False)
+    cached = list((tmp_path / "cache").glob("sample-*.feather"))
+    second = read_csv_cached(source, tmp_path / "cache")
+
+    # Then
+    assert first.equals(expected)
+    assert len(cached) == 1
+    assert isinstance(second["season"].dtype, pd.CategoricalDtype)
+    assert second.astype({"season": object})["season"].equals(expected["season"])
+
+
+def test_read_csv_cached_rebuilds_when_source_changes(sample_input_data, tmp_path):
+    # Given
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "sample.csv"
+    sample_input_data[0].iloc[:200].to_csv(source, index=False)
+    read_csv_cached(source, tmp_path / "cache")
+    old_cache = list((tmp_path / "cache").glob("sample-*.feather"))
+
+    # When
+    sample_input_data[0].iloc[:50].to_csv(source, index=False)
+    subject = read_csv_cached(source, tmp_path / "cache")
+
+    # Then
+    assert len(subject) == 50
+    assert not old_cache[0].exists()
+    assert len(list((tmp_path / "cache").glob("sample-*.feather"))) == 1
+
+
+def test_read_csv_cached_parses_csv_without_pyarrow(sample_input_data, tmp_path, monkeypatch):
+    # Given
+    source = tmp_path / "sample.csv"
+    sample_input_data[0].iloc[:200].to_csv(source, index=False)
+    expected = pd.read_csv(source)
+    # a None entry makes "from pyarrow import feather" raise ImportError
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    # When
+    raw = read_csv_cached(source, tmp_path / "cache", categorical=False)
+    categorical = read_csv_cached(source, tmp_path / "cache")
+
+    # Then
+    assert raw.equals(expected)
+    assert isinstance(categorical["season"].dtype, pd.CategoricalDtype)
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import json
+
+import pytest
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.validation import check_is_fitted
+
+from bikerental_model.evaluate import compare_reports, report_file_name, run_evaluation, time_splits
+from bikerental_model.pipeline import make_bike_pipe
+
+
+def test_time_splits_train_on_past_days(sample_input_data):
+    # Given
+    data = sample_input_data[0].reset_index(drop=True)
+
+    # When
+    splits = list(time_splits(data["dteday"], n_splits=3))
+
+    # Then
+    assert len(splits) == 3
+    for train, test in splits:
+        assert data["dteday"].iloc[train].max() < data["dteday"].iloc[test].min()
+
+
+def test_run_evaluation_writes_versioned_report(tmp_path):
+    # Given
+    pipeline = make_bike_pipe().set_params(model_rf__n_estimators=10)
+
+    # When
+    report = run_evaluation(
+        version="0.0.1", output_dir=tmp_path, pipeline=pipeline, k_folds=2, n_time_splits=2, n_jobs=1
+    )
+    saved = json.loads((tmp_path / report_file_name("0.0.1")).read_text())
+
+    # Then
+    assert saved["version"] == "0.0.1"
+    assert len(saved["kfold"]["folds"]) == 2 and len(saved["time_based"]["folds"]) == 2
+    assert saved["kfold"]["mean"]["r2"] > 0.7
+    assert saved["time_based"]["mean"]["predict_rows_per_second"] > 0
+    assert compare_reports(report, saved) == []
+
+    # the pipeline passed in is left as it was
+    assert pipeline.get_params()["model_rf__n_jobs"] == make_bike_pipe().get_params()["model_rf__n_jobs"]
+    with pytest.raises(NotFittedError):
+        check_is_fitted(pipeline[-1])
+
+    # a worse model against this report is flagged
+    saved["kfold"]["mean"]["r2"] += 0.1
+    assert [regression.split(":")[0] for regression in compare_reports(report, saved)] == ["kfold r2"]
@@ -15,8 +15,14 @@ parent, root = file.parent, file.parents[1]
 sys.path.append(str(root))
 
 import numpy as np
+import pandas as pd
 from bikerental_model.config.core import config
 from bikerental_model.processing.features import WeekdayImputer, WeathersitImputer, NumericColumnSelector, OutlierHandler
+from bikerental_model.processing.features import Mapper, MultiColumnMapper
+from bikerental_model.processing.features import CategoricalEncoder, WeekdayOneHotEncoder
+from bikerental_model.processing.data_manager import pre_pipeline_preparation
+from bikerental_model.processing.dates import date_features
+from bikerental_model.pipeline import make_bike_pipe
 
 
 def test_weekday_variable_transformer(sample_input_data):
@@ -87,5 +93,100 @@ def test_numeric_column_transformer(sample_input_data):
             #Then
             validate_outliers = list(subject.loc[(subject[var] < lower_bound) | (subject[var] > upper_bound)].index)
             assert len(validate_outliers) == 0
-    
 
+
+def test_outlier_handler_keeps_null_values_of_an_object_column(sample_input_data):
+    # Given: a single record with a null value holds None in an object column
+    X = sample_input_data[0].iloc[:2].copy()
+    X['temp'] = pd.Series([None, 60.0], index=X.index, dtype=object)
+    transformer = OutlierHandler(variables=['temp']).fit(sample_input_data[2])
+    _, upper_bound = transformer.bounds['temp']
+
+    # When
+    subject = transformer.transform(X)
+
+    # Then
+    assert np.isnan(subject['temp'].iloc[0])
+    assert subject['temp'].iloc[1] == min(60.0, upper_bound)
+
+
+def test_multi_column_mapper_matches_mappers(sample_input_data):
+    # Given
+    X = pre_pipeline_preparation(data_frame=sample_input_data[0])
+    mappings = {'yr': config.model_config_.year_mapping, 'hr': config.model_config_.hour_mapping}
+    expected = X
+    for variable, mapping in mappings.items():
+        expected = Mapper(variable, mapping).fit(expected).transform(expected)
+
+    # When
+    subject = MultiColumnMapper(mappings).fit(X).transform(X)
+
+    # Then
+    assert subject[['yr', 'hr']].equals(expected[['yr', 'hr']])
+    assert X['hr'].dtype == object  # input left untouched
+
+
+def test_copy_free_pipeline_matches_default(sample_input_data):
+    # Given
+    X_train = pre_pipeline_preparation(data_frame=sample_input_data[2])[config.model_config_.features]
+    X_test = pre_pipeline_preparation(data_frame=sample_input_data[0])[config.model_config_.features]
+    X_test_before = X_test.copy()
+    default = make_bike_pipe()[:-1].fit(X_train)
+
+    # When
+    copy_free = make_bike_pipe(copy_free=True)[:-1].fit(X_train)
+
+    # Then
+    np.testing.assert_allclose(copy_free.transform(X_test), default.transform(X_test))
+    assert X_test.equals(X_test_before)
+
+
+def test_categorical_encoder_matches_mappers_and_one_hot(sample_input_data):
+    # Given
+    X = pre_pipeline_preparation(data_frame=sample_input_data[0])
+    X = WeekdayImputer('weekday').fit(X).transform(X)
+    X = WeathersitImputer('weathersit').fit(X).transform(X)
+    mappings = {'hr': config.model_config_.hour_mapping, 'weathersit': config.model_config_.weather_mappings}
+    expected = MultiColumnMapper(mappings).fit(X).transform(X)
+    expected = WeekdayOneHotEncoder('weekday').fit(expected).transform(expected)
+    encoder = CategoricalEncoder(mappings, {'weekday': config.model_config_.weekday_categories})
+
+    # When
+    subject = encoder.fit(X).transform(X)
+
+    # Then
+    assert sorted(subject.columns) == sorted(expected.columns)
+    assert subject[expected.columns].equals(expected)
+
+
+def test_categorical_encoder_one_hot_columns_are_stable(sample_input_data):
+    # Given
+    encoder = CategoricalEncoder({}, {'weekday': config.model_config_.weekday_categories})
+    X = sample_input_data[0]
+
+    # When
+    subject = encoder.fit(X).transform(X.iloc[[0]])
+
+    # Then
+    assert [c for c in subject.columns if c.startswith('weekday_')] == [
+        f'weekday_{day}' for day in config.model_config_.weekday_categories
+    ]
+
+
+def test_date_features_match_pandas_parsing(sample_input_data):
+    # Given
+    dates = sample_input_data[0]['dteday']
+    parsed = pd.to_datetime(dates, format='%Y-%m-%d')
+
+    # When
+    subject = date_features(dates)
+    with_missing = date_features(pd.Series([np.nan, dates.iloc[0]]))
+
+    # Then
+    assert subject['dteday'].equals(parsed)
+    assert subject['yr'].equals(parsed.dt.year.astype('str'))
+    assert subject['mnth'].equals(parsed.dt.month_name())
+    assert subject['weekday'].equals(parsed.dt.day_name().str[:3])
+    assert date_features(parsed)[['yr', 'mnth', 'weekday']].equals(subject[['yr', 'mnth', 'weekday']])
+    assert pd.isna(with_missing.loc[0, 'dteday']) and with_missing.loc[0, 'yr'] == 'nan'
+    assert with_missing.loc[1, 'weekday'] == subject['weekday'].iloc[0]
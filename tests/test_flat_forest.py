@@ -0,0 +1,73 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from bikerental_model.config.core import config
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import make_prediction
+from bikerental_model.processing.flat_forest import FlatForest
+
+
+def test_flat_forest_matches_sklearn_with_unbalanced_trees():
+    # Given
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 4))
+    y = X[:, 0] * 3 + (X[:, 1] > 0.5) * 10 + rng.normal(size=500)
+    # leaves end up at many depths, so most trees need padding
+    model = RandomForestRegressor(n_estimators=20, min_samples_leaf=40, random_state=0).fit(X, y)
+    X_new = rng.normal(size=(3000, 4))
+
+    # When
+    forest = FlatForest(model, block_rows=256)
+
+    # Then
+    np.testing.assert_allclose(forest.predict(X_new), model.predict(X_new), rtol=1e-12)
+    np.testing.assert_allclose(forest.predict(X_new[:1]), model.predict(X_new[:1]), rtol=1e-12)
+
+
+def test_flat_forest_routes_missing_values_like_sklearn():
+    # Given
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 4))
+    y = X[:, 0] * 3 + (X[:, 1] > 0.5) * 10 + rng.normal(size=500)
+    # feature 0 is missing at fit time, so its splits learn where NaN goes;
+    # feature 2 is only missing at predict time
+    X[rng.random(500) < 0.2, 0] = np.nan
+    model = RandomForestRegressor(n_estimators=20, min_samples_leaf=20, random_state=0).fit(X, y)
+    X_new = rng.normal(size=(1000, 4))
+    X_new[rng.random(1000) < 0.3, 0] = np.nan
+    X_new[rng.random(1000) < 0.3, 2] = np.nan
+
+    # When
+    forest = FlatForest(model, block_rows=256)
+
+    # Then
+    np.testing.assert_allclose(forest.predict(X_new), model.predict(X_new), rtol=1e-12)
+    trees = np.stack([tree.predict(X_new) for tree in model.estimators_], axis=1)
+    np.testing.assert_allclose(forest.tree_predictions(X_new), trees, rtol=1e-12)
+
+
+def test_flat_engine_predictions_match_pipeline(sample_input_data, monkeypatch):
+    # Given
+    inputs = sample_input_data[0].iloc[:200]
+    expected = make_prediction(input_data=inputs)["predictions"]
+    single_expected = make_prediction(input_data=inputs.iloc[:1])["predictions"]
+    monkeypatch.setattr(config.app_config_, "forest_engine", "flat")
+    model_registry.evict()
+
+    # When
+    predictions = make_prediction(input_data=inputs)["predictions"]
+    single = make_prediction(input_data=inputs.iloc[:1])["predictions"]
+    model_registry.evict()
+
+    # Then
+    np.testing.assert_allclose(predictions, expected, rtol=1e-12)
+    np.testing.assert_allclose(single, single_expected, rtol=1e-12)
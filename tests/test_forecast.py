@@ -0,0 +1,63 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bikerental_model.config.core import config
+from bikerental_model.predict import make_batch_prediction, make_forecast
+from bikerental_model.processing.data_manager import load_raw_dataset
+from bikerental_model.processing.forecast import calendar_features, forecast_grid, hour_labels
+
+
+def test_calendar_features_match_training_data():
+    # Given
+    data = load_raw_dataset(file_name=config.app_config_.training_data_file)
+    days = data.drop_duplicates("dteday").set_index("dteday").sort_index()
+    days.index = pd.to_datetime(days.index)
+
+    # When
+    derived = calendar_features(days.index)
+
+    # Then
+    for column in ("season", "holiday", "workingday"):
+        assert (derived[column] == days[column]).all(), column
+    known = days["weekday"].notna()
+    assert (derived["weekday"][known] == days["weekday"][known]).all()
+    assert sorted(hour_labels()) == sorted(config.model_config_.hour_mapping)
+
+
+def test_make_forecast_scores_the_week_grid():
+    # Given
+    hours = 7 * 24
+    rng = np.random.default_rng(0)
+    weather = {
+        "temp": rng.uniform(0, 30, hours),
+        "atemp": rng.uniform(-5, 35, hours),
+        "hum": rng.uniform(20, 100, hours),
+        "windspeed": rng.uniform(0, 40, hours),
+        "weathersit": rng.choice(list(config.model_config_.weather_mappings), hours),
+    }
+
+    # When
+    result = make_forecast(start="2012-06-25", end="2012-07-01", weather=weather, quantiles=[0.1, 0.9])
+    grid = forecast_grid("2012-06-25", "2012-07-01", weather)
+    grid["dteday"] = grid["dteday"].dt.strftime("%Y-%m-%d")
+    expected = make_batch_prediction(input_data=grid)["predictions"]
+
+    # Then
+    assert result["errors"] is None
+    assert len(result["predictions"]) == hours
+    np.testing.assert_array_equal(result["predictions"], expected)
+    assert str(result["timestamps"][0]) == "2012-06-25T00:00:00.000000000"
+    assert str(result["timestamps"][-1]) == "2012-07-01T23:00:00.000000000"
+    assert (result["quantiles"]["p10"] <= result["quantiles"]["p90"]).all()
+    with pytest.raises(ValueError):
+        make_forecast(start="2012-06-25", end="2012-06-26", weather=weather)
@@ -0,0 +1,94 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from bikerental_model.config.core import config
+
+
+@pytest.fixture
+def small_executor(monkeypatch):
+    # one worker and no wait queue, in place of the API's executor
+    from app import api
+    from app.inference import InferenceExecutor
+
+    executor = InferenceExecutor(max_workers=1, queue_size=0, timeout=0.2)
+    monkeypatch.setattr(api, "inference_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+def test_run_inference_answers_503_when_queue_is_full_and_504_on_timeout(small_executor):
+    # Given
+    from fastapi import HTTPException
+    from app.api import run_inference
+
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(run_inference(release.wait, timeout=5))
+        await asyncio.sleep(0)  # the busy call takes the only worker
+        with pytest.raises(HTTPException) as full:
+            await run_inference(release.wait, timeout=0)
+        with pytest.raises(HTTPException) as timed_out:
+            await busy
+        release.set()
+        return full.value.status_code, timed_out.value.status_code, small_executor.pending
+
+    # When
+    full, timed_out, pending = asyncio.run(scenario())
+
+    # Then
+    assert full == 503
+    assert timed_out == 504
+    assert pending in (0, 1)  # freed once the worker really finishes
+
+
+def test_streamed_batch_is_scored_on_the_inference_executor(client, sample_input_data, monkeypatch):
+    # Given
+    from app import api
+
+    inputs = sample_input_data[0].iloc[:25]
+    payload = {"inputs": json.loads(inputs.to_json(orient="records"))}
+    monkeypatch.setattr(config.app_config_, "prediction_chunk_size", 10)
+    calls = []
+    run = api.inference_executor.run
+
+    async def counting_run(func, *args, **kwargs):
+        calls.append(len(kwargs["inputs"]))
+        return await run(func, *args, **kwargs)
+
+    monkeypatch.setattr(api.inference_executor, "run", counting_run)
+
+    # When
+    streamed = client.post("/api/v1/predict/batch?stream=true", json=payload)
+    batch = client.post("/api/v1/predict/batch", json=payload)
+
+    # Then
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert calls == [10, 10, 5, 25]
+    assert [line["row"] for line in lines] == list(range(25))
+    assert [line["prediction"] for line in lines] == batch.json()["predictions"]
+
+
+def test_streamed_batch_answers_503_when_queue_is_full(client, sample_input_data, small_executor):
+    # Given
+    inputs = sample_input_data[0].iloc[:5]
+    payload = {"inputs": json.loads(inputs.to_json(orient="records"))}
+    small_executor.queue_size = -1  # every slot taken
+
+    # When
+    response = client.post("/api/v1/predict/batch?stream=true", json=payload)
+
+    # Then
+    assert response.status_code == 503
@@ -0,0 +1,50 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+
+from bikerental_model.instrumentation import stage_metrics
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import make_prediction
+
+
+def test_stage_metrics_time_every_pipeline_step(sample_input_data, monkeypatch):
+    # Given
+    inputs = sample_input_data[0].iloc[:50]
+    expected = make_prediction(input_data=inputs)["predictions"]
+    monkeypatch.setattr(stage_metrics, "enabled", True)
+    stage_metrics.reset()
+
+    # When
+    predictions = make_prediction(input_data=inputs)["predictions"]
+    snapshot = stage_metrics.snapshot()
+    exposition = stage_metrics.prometheus()
+    stage_metrics.reset()
+
+    # Then
+    np.testing.assert_array_equal(predictions, expected)
+    step_names = [name for name, _ in model_registry.get().steps]
+    assert set(step_names + ["validate_inputs"]) <= set(snapshot)
+    for name in step_names:
+        assert snapshot[name]["seconds"]["count"] == 1
+        assert snapshot[name]["rows"]["sum"] == 50
+    assert 'bikerental_stage_seconds_count{stage="model_rf"} 1' in exposition
+    assert 'bikerental_stage_rows_bucket{stage="scaler",le="100"} 1' in exposition
+
+
+def test_disabled_stage_metrics_record_nothing(sample_input_data):
+    # Given
+    stage_metrics.reset()
+
+    # When
+    make_prediction(input_data=sample_input_data[0].iloc[:5])
+
+    # Then
+    assert not stage_metrics.enabled
+    assert stage_metrics.snapshot() == {}
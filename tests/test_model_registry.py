@@ -0,0 +1,73 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bikerental_model import __version__ as _version
+from bikerental_model.config.core import config
+from bikerental_model.model_registry import ModelRegistry
+from bikerental_model.processing.flat_forest import FlatForest
+
+
+def test_registry_loads_lazily_and_once():
+    # Given
+    registry = ModelRegistry()
+    assert not registry.is_ready(_version)
+
+    # When
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pipelines = list(pool.map(lambda _: registry.get(_version), range(16)))
+
+    # Then
+    assert registry.is_ready(_version)
+    assert all(pipeline is pipelines[0] for pipeline in pipelines)
+    assert list(registry.load_seconds) == [_version]
+
+
+def test_registry_evict_forces_reload():
+    # Given
+    registry = ModelRegistry()
+    registry.warm_up(_version)
+    first = registry.get(_version)
+
+    # When
+    registry.evict(_version)
+
+    # Then
+    assert not registry.is_ready(_version)
+    assert registry.get(_version) is not first
+
+
+def test_registry_serves_with_predict_n_jobs():
+    # Given
+    registry = ModelRegistry()
+
+    # When
+    model = registry.get(_version)[-1]
+
+    # Then
+    assert model.n_jobs == config.model_config_.predict_n_jobs
+    assert model.max_features == config.model_config_.max_features
+
+
+def test_registry_warms_up_the_flat_engine(monkeypatch):
+    # Given
+    monkeypatch.setattr(config.app_config_, "forest_engine", "flat")
+    registry = ModelRegistry()
+    # a daemon thread, so that a deadlock fails the test instead of hanging it
+    warm_up = threading.Thread(target=registry.warm_up, args=(_version,), daemon=True)
+
+    # When
+    warm_up.start()
+    warm_up.join(timeout=60)
+
+    # Then
+    assert not warm_up.is_alive()
+    assert isinstance(registry.scoring_plan(_version).model, FlatForest)
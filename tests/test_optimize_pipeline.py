@@ -0,0 +1,41 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+
+from bikerental_model.model_registry import model_registry
+from bikerental_model.optimize_pipeline import numeric_sweep, optimize_pipeline
+from bikerental_model.predict import prepare_inputs
+from bikerental_model.processing.scoring_plan import ScoringPlan
+
+
+def test_optimized_pipeline_matches_original(sample_input_data):
+    # Given
+    pipeline = model_registry.get()
+    X, _ = prepare_inputs(sample_input_data[0], validate=False)
+    # values far outside the OutlierHandler bounds exercise the folded clipping
+    extreme = X.iloc[:100].copy()
+    extreme["hum"] = np.linspace(-50, 200, 100)
+    extreme["windspeed"] = np.linspace(-30, 90, 100)
+    # 2-decimal values off the training grid land between and on the splits
+    sweep = numeric_sweep(X.iloc[:2])
+
+    # When
+    optimized, report = optimize_pipeline(pipeline)
+
+    # Then
+    assert report["steps_after"] == [
+        "weathersit_imputation", "map_categoricals", "numeric_selector", "scaler", "model_rf"
+    ]
+    assert {"outlier_handler", "map_hr", "weekday_encoder"} <= set(report["removed"])
+    np.testing.assert_array_equal(optimized.predict(X), pipeline.predict(X))
+    np.testing.assert_array_equal(optimized.predict(extreme), pipeline.predict(extreme))
+    np.testing.assert_array_equal(optimized.predict(sweep), pipeline.predict(sweep))
+    record = sample_input_data[0].iloc[0].to_dict()
+    np.testing.assert_array_equal(ScoringPlan(optimized).predict(record), ScoringPlan(pipeline).predict(record))
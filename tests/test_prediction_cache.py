@@ -0,0 +1,83 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+
+from bikerental_model.predict import make_grouped_prediction, make_prediction
+from bikerental_model.prediction_cache import LocalCacheBackend, PredictionCache, record_key, row_keys
+from bikerental_model.processing.validation import validate_inputs
+
+
+def test_record_and_row_keys_agree(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:100]
+    validated_data, _ = validate_inputs(input_df=X_test)
+
+    # When
+    keys = row_keys(validated_data)
+
+    # Then
+    assert keys == [record_key(record) for record in X_test.to_dict(orient="records")]
+
+
+def test_local_backend_evicts_least_recently_used_and_expired():
+    # Given
+    backend = LocalCacheBackend(max_size=2, ttl=None)
+    backend.set_many({"a": 1.0, "b": 2.0})
+    backend.get_many(["a"])
+
+    # When
+    backend.set_many({"c": 3.0})
+
+    # Then
+    assert backend.get_many(["a", "b", "c"]) == [1.0, None, 3.0]
+    assert backend.evictions == 1
+
+    expired = LocalCacheBackend(ttl=-1)
+    expired.set_many({"a": 1.0})
+    assert expired.get_many(["a"]) == [None]
+
+
+def test_make_prediction_with_cache(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:200]
+    cache = PredictionCache(LocalCacheBackend())
+    expected = make_prediction(input_data=X_test)["predictions"]
+
+    # When
+    first = make_prediction(input_data=X_test, cache=cache)["predictions"]
+    second = make_prediction(input_data=X_test, cache=cache)["predictions"]
+    single = make_prediction(input_data=X_test.iloc[[3]].to_dict(orient="records"), cache=cache)["predictions"]
+
+    # Then
+    np.testing.assert_allclose(first, expected)
+    np.testing.assert_allclose(second, expected)
+    np.testing.assert_allclose(single, expected[[3]])
+    assert cache.stats()["misses"] == len(X_test)
+    assert cache.stats()["hits"] == len(X_test) + 1
+
+
+def test_make_grouped_prediction_with_cache(sample_input_data):
+    # Given
+    groups = [sample_input_data[0].iloc[:30], sample_input_data[0].iloc[30:50]]
+    cache = PredictionCache(LocalCacheBackend())
+    expected = [result["predictions"] for result in make_grouped_prediction(input_data=groups)]
+
+    # When
+    first = make_grouped_prediction(input_data=groups, cache=cache)
+    misses = cache.stats()["misses"]
+    second = make_grouped_prediction(input_data=groups, cache=cache)
+
+    # Then
+    for results in (first, second):
+        for result, predictions in zip(results, expected):
+            np.testing.assert_allclose(result["predictions"], predictions)
+    assert misses == 50
+    assert cache.stats()["hits"] == 50
+    assert cache.stats()["misses"] == 50
@@ -10,7 +10,10 @@ sys.path.append(str(root))
 import numpy as np
 from sklearn.metrics import accuracy_score, r2_score
 
-from bikerental_model.predict import make_prediction
+from bikerental_model.predict import make_batch_prediction, make_grouped_prediction, make_prediction
+from bikerental_model.predict import make_trusted_prediction
+from bikerental_model.model_registry import model_registry
+from bikerental_model.predict import prepare_inputs
 
 
 def test_make_prediction(sample_input_data):
@@ -33,3 +36,70 @@ def test_make_prediction(sample_input_data):
     print(accuracy)
     assert accuracy > 70
 
+
+def test_make_batch_prediction_matches_single_call(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:250]
+    expected = make_prediction(input_data=X_test)["predictions"]
+
+    # When
+    result = make_batch_prediction(input_data=X_test, chunk_size=100)
+
+    # Then
+    assert result["errors"] is None
+    np.testing.assert_allclose(result["predictions"], expected)
+
+
+def test_make_grouped_prediction_splits_results_per_request(sample_input_data):
+    # Given
+    X_test = sample_input_data[0]
+    requests = [X_test.iloc[[0]], X_test.iloc[1:4], X_test.iloc[[4]]]
+
+    # When
+    results = make_grouped_prediction(input_data=requests)
+
+    # Then
+    assert [len(result["predictions"]) for result in results] == [1, 3, 1]
+    expected = make_prediction(input_data=X_test.iloc[:5], fast_path=False)["predictions"]
+    np.testing.assert_allclose(np.concatenate([result["predictions"] for result in results]), expected)
+
+
+def test_make_trusted_prediction_matches_validated_path(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:50]
+    records = X_test.astype(object).where(X_test.notna(), None).to_dict(orient="records")
+    expected = make_prediction(input_data=X_test, fast_path=False)["predictions"]
+
+    # When
+    many = make_trusted_prediction(input_data=records)
+    columnar = make_trusted_prediction(input_data={key: list(values) for key, values in X_test.items()})
+    single = make_trusted_prediction(input_data=records[:1])
+
+    # Then
+    assert many["errors"] is None
+    np.testing.assert_allclose(many["predictions"], expected)
+    np.testing.assert_allclose(columnar["predictions"], expected)
+    np.testing.assert_allclose(single["predictions"], expected[:1])
+
+
+def test_make_prediction_with_quantiles(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:200]
+    expected = make_prediction(input_data=X_test, fast_path=False)["predictions"]
+    pipeline = model_registry.get()
+    features = pipeline[:-1].transform(prepare_inputs(X_test, validate=False)[0])
+    trees = np.array([tree.predict(features) for tree in pipeline[-1].estimators_])
+
+    # When
+    results = make_prediction(input_data=X_test, quantiles=[0.1, 0.5, 0.9])
+    single = make_trusted_prediction(input_data=X_test.iloc[:1].to_dict(orient="records"), quantiles=[0.1, 0.9])
+    batch = make_batch_prediction(input_data=X_test, chunk_size=64, quantiles=[0.1, 0.5, 0.9])
+
+    # Then
+    np.testing.assert_array_equal(results["predictions"], expected)
+    assert list(results["quantiles"]) == ["p10", "p50", "p90"]
+    np.testing.assert_allclose(results["quantiles"]["p10"], np.quantile(trees, 0.1, axis=0))
+    np.testing.assert_allclose(results["quantiles"]["p90"], np.quantile(trees, 0.9, axis=0))
+    assert (results["quantiles"]["p10"] <= results["quantiles"]["p90"]).all()
+    np.testing.assert_allclose(single["quantiles"]["p90"], results["quantiles"]["p90"][:1])
+    np.testing.assert_array_equal(batch["quantiles"]["p50"], results["quantiles"]["p50"])
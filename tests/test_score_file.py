@@ -0,0 +1,76 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from bikerental_model.predict import make_prediction
+from bikerental_model.score_file import score_file
+
+
+def test_score_file_matches_in_memory_predictions(sample_input_data, tmp_path):
+    # Given
+    X_test = sample_input_data[0].iloc[:250]
+    X_test.to_csv(tmp_path / "inputs.csv", index=False)
+    expected = make_prediction(input_data=X_test, fast_path=False)["predictions"]
+
+    # When
+    summary = score_file(input_path=tmp_path / "inputs.csv", output_path=tmp_path / "out.csv", chunk_size=100)
+    pooled = score_file(
+        input_path=tmp_path / "inputs.csv", output_path=tmp_path / "pooled.csv", chunk_size=100, workers=2
+    )
+
+    # Then
+    assert summary["rows"] == summary["scored"] == 250
+    for name in ("out.csv", "pooled.csv"):
+        output = pd.read_csv(tmp_path / name)
+        assert output["row"].tolist() == list(range(250))
+        np.testing.assert_allclose(output["prediction"], expected)
+    assert pooled["scored"] == 250
+
+
+def test_score_file_reports_errors_by_input_row(sample_input_data, tmp_path):
+    # Given
+    X_test = sample_input_data[0].iloc[:250].copy()
+    X_test.iloc[130, X_test.columns.get_loc("hr")] = "25am"
+    X_test.to_csv(tmp_path / "inputs.csv", index=False)
+
+    # When
+    summary = score_file(input_path=tmp_path / "inputs.csv", output_path=tmp_path / "out.csv", chunk_size=100)
+
+    # Then
+    assert summary["scored"] == 249 and summary["failed_rows"] == 1
+    errors = [json.loads(line) for line in (tmp_path / "out.csv.errors.jsonl").read_text().splitlines()]
+    assert len(errors) == 1 and errors[0]["offset"] == 100
+    assert errors[0]["errors"][0]["loc"] == ["inputs", 130, "hr"]
+    output = pd.read_csv(tmp_path / "out.csv")
+    assert output["row"].tolist() == [row for row in range(250) if row != 130]
+    expected = make_prediction(input_data=X_test.drop(index=X_test.index[130]), fast_path=False)["predictions"]
+    np.testing.assert_allclose(output["prediction"], expected)
+
+
+def test_score_file_replaces_the_outputs_of_a_previous_run(sample_input_data, tmp_path):
+    # Given
+    X_test = sample_input_data[0].iloc[:20].copy()
+    X_test.iloc[5, X_test.columns.get_loc("hr")] = "25am"
+    X_test.to_csv(tmp_path / "inputs.csv", index=False)
+    score_file(input_path=tmp_path / "inputs.csv", output_path=tmp_path / "out.csv", chunk_size=10)
+    X_test["hr"] = "25am"
+    X_test.to_csv(tmp_path / "inputs.csv", index=False)
+
+    # When
+    summary = score_file(input_path=tmp_path / "inputs.csv", output_path=tmp_path / "out.csv", chunk_size=10)
+
+    # Then
+    assert summary["scored"] == 0 and summary["failed_rows"] == 20
+    assert not (tmp_path / "out.csv").exists()
+    errors = [json.loads(line) for line in (tmp_path / "out.csv.errors.jsonl").read_text().splitlines()]
+    assert [error["offset"] for error in errors] == [0, 10]
@@ -0,0 +1,61 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import json
+
+import numpy as np
+
+from bikerental_model.config.core import config
+from bikerental_model.predict import bikerental_pipeline, get_scoring_plan, make_prediction
+from bikerental_model.processing.validation import validate_inputs
+
+
+def test_scoring_plan_matches_pipeline(sample_input_data):
+    # Given
+    X_test = sample_input_data[0].iloc[:300]
+    validated_data, _ = validate_inputs(input_df=X_test)
+    expected_rows = bikerental_pipeline[:-1].transform(validated_data[config.model_config_.features])
+    expected = bikerental_pipeline.predict(validated_data[config.model_config_.features])
+    plan = get_scoring_plan()
+
+    # When
+    records = X_test.to_dict(orient="records")
+    rows = np.vstack([plan.encode(record).copy() for record in records])
+    predictions = np.concatenate([plan.predict(record) for record in records])
+
+    # Then
+    np.testing.assert_allclose(rows, expected_rows)
+    np.testing.assert_allclose(predictions, expected)
+
+
+def test_make_prediction_fast_path_parity(sample_input_data):
+    # Given
+    record = sample_input_data[0].iloc[[0]]
+
+    # When
+    fast = make_prediction(input_data=record.to_dict(orient="records"))
+    slow = make_prediction(input_data=record, fast_path=False)
+
+    # Then
+    assert fast["errors"] is None
+    np.testing.assert_allclose(fast["predictions"], slow["predictions"])
+
+
+def test_make_prediction_falls_back_on_unknown_category(sample_input_data):
+    # Given
+    record = sample_input_data[0].iloc[[0]].to_dict(orient="records")
+    record[0]["hr"] = "25pm"
+
+    # When
+    result = make_prediction(input_data=record)
+
+    # Then: the validated pandas path reports the category instead of scoring
+    assert result["predictions"] is None
+    errors = json.loads(result["errors"])
+    assert [(e["type"], e["loc"]) for e in errors] == [("literal_error", ["inputs", 0, "hr"])]
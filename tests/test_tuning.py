@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import pandas as pd
+
+from bikerental_model.tune_pipeline import LEADERBOARD_FILE, run_tuning
+
+
+def test_run_tuning_writes_ranked_leaderboard(tmp_path):
+    # Given
+    param_grid = {"n_estimators": [5], "max_depth": [2, 4]}
+
+    # When
+    leaderboard = run_tuning(
+        param_grid=param_grid, cv=2, n_jobs=1, output_dir=tmp_path, cache_dir=tmp_path / "cache"
+    )
+
+    # Then
+    assert list(leaderboard["max_depth"]) == [4, 2]
+    assert list(leaderboard["rank"]) == [1, 2]
+    assert (leaderboard["mean_fit_time"] > 0).all()
+    assert pd.read_csv(tmp_path / LEADERBOARD_FILE)["max_depth"].tolist() == [4, 2]
+    # the fitted preprocessing steps were cached on disk
+    assert any((tmp_path / "cache").rglob("output.pkl"))
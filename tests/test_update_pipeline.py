@@ -0,0 +1,73 @@
+"""
+Note: These tests will fail if you have not first trained the model.
+"""
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import pytest
+
+from bikerental_model import __version__ as _version
+from bikerental_model import update_pipeline as updates
+from bikerental_model.config.core import config
+from bikerental_model.model_registry import ModelRegistry
+from bikerental_model.processing import data_manager
+from bikerental_model.processing.data_manager import load_dataset, load_pipeline
+from bikerental_model.update_pipeline import DriftError, update_pipeline
+
+
+@pytest.fixture
+def new_day():
+    data = load_dataset(file_name=config.app_config_.training_data_file)
+    day = data[data["dteday"] == "2012-12-31"]
+    return day[config.model_config_.features], day[config.model_config_.target]
+
+
+def test_update_pipeline_adds_trees_and_keeps_preprocessing(new_day):
+    # Given
+    pipeline = load_pipeline(file_name=ModelRegistry.file_name(_version))
+    old_trees = list(pipeline[-1].estimators_)
+    bounds = dict(pipeline.named_steps["outlier_handler"].bounds)
+
+    # When
+    report = update_pipeline(pipeline, *new_day, new_trees=5)
+
+    # Then
+    assert not report["drifted"]
+    assert pipeline[-1].estimators_[:len(old_trees)] == old_trees
+    assert len(pipeline[-1].estimators_) == len(old_trees) + 5
+    assert pipeline.named_steps["outlier_handler"].bounds == bounds
+
+
+def test_update_pipeline_refuses_drifted_data(new_day):
+    # Given
+    pipeline = load_pipeline(file_name=ModelRegistry.file_name(_version))
+    X, y = new_day
+    X = X.assign(hum=X["hum"] / 100)  # fraction instead of percent
+
+    # When
+    with pytest.raises(DriftError) as error:
+        update_pipeline(pipeline, X, y)
+
+    # Then
+    assert error.value.report["worst_feature"] == "hum"
+    assert len(pipeline[-1].estimators_) == config.model_config_.n_estimators
+
+
+def test_saved_update_keeps_base_model(tmp_path, monkeypatch):
+    # Given
+    monkeypatch.setattr(data_manager, "TRAINED_MODEL_DIR", tmp_path)
+    monkeypatch.setattr(updates, "TRAINED_MODEL_DIR", tmp_path)
+    data_manager.save_pipeline(pipeline_to_persist={"model": "base"})
+
+    # When
+    data_manager.save_pipeline(pipeline_to_persist={"model": 1}, version=updates.update_version(1))
+    data_manager.save_pipeline(pipeline_to_persist={"model": 2}, version=updates.update_version(2))
+
+    # Then
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        ModelRegistry.file_name(_version), ModelRegistry.file_name(updates.update_version(2))
+    ]
+    assert updates.latest_version() == f"{_version}.update2"
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+file = Path(__file__).resolve()
+parent, root = file.parent, file.parents[1]
+sys.path.append(str(root))
+
+import json
+
+from bikerental_model.processing.validation import validate_inputs
+
+
+def test_columnar_validation_matches_pydantic_on_clean_data(sample_input_data):
+    # Given
+    X_test = sample_input_data[0]
+
+    # When
+    columnar_data, columnar_errors = validate_inputs(input_df=X_test)
+    reference_data, reference_errors = validate_inputs(input_df=X_test, method="pydantic")
+
+    # Then
+    assert columnar_errors is None and reference_errors is None
+    assert columnar_data.equals(reference_data)
+
+
+def test_columnar_validation_reports_rows_and_columns(sample_input_data):
+    # Given
+    X = sample_input_data[0].iloc[:5].copy()
+    X['temp'] = X['temp'].astype(object)
+    X.iloc[1, X.columns.get_loc('temp')] = 'warm'
+    X.iloc[2, X.columns.get_loc('season')] = 3
+    X.iloc[3, X.columns.get_loc('hum')] = 150.0
+    X.iloc[4, X.columns.get_loc('hr')] = '25am'
+    _, reference_errors = validate_inputs(input_df=X, method="pydantic")
+    assert reference_errors is not None
+    reference = json.loads(reference_errors)
+
+    # When
+    _, errors = validate_inputs(input_df=X)
+
+    # Then
+    assert errors is not None
+    errors = json.loads(errors)
+    assert [(e['type'], e['loc']) for e in errors] == [
+        ('float_parsing', ['inputs', 1, 'temp']),
+        ('string_type', ['inputs', 2, 'season']),
+        ('less_than_equal', ['inputs', 3, 'hum']),
+        ('literal_error', ['inputs', 4, 'hr']),
+    ]
+    # every type error pydantic finds is reported the same way
+    assert [(e['type'], e['loc']) for e in reference] == [(e['type'], e['loc']) for e in errors[:2]]
+
+
+def test_columnar_validation_reports_unparseable_dates(sample_input_data):
+    # Given
+    X = sample_input_data[0].iloc[:3].copy()
+    X.iloc[1, X.columns.get_loc('dteday')] = '2011-13-01'
+
+    # When
+    validated_data, errors = validate_inputs(input_df=X)
+
+    # Then
+    assert errors is not None
+    assert [e['loc'] for e in json.loads(errors)] == [['inputs', 1, 'dteday']]
+    assert validated_data['dteday'].isna().tolist() == [False, True, False]
+
+
+def test_validation_reports_missing_required_values(sample_input_data):
+    # Given
+    X = sample_input_data[0].iloc[:4].copy().astype(object)
+    X.iloc[0, X.columns.get_loc('season')] = None
+    X.iloc[1, X.columns.get_loc('hr')] = None
+    X.iloc[2, X.columns.get_loc('dteday')] = None
+    # weekday and weathersit are imputed by the pipeline, so they may be missing
+    X.iloc[3, X.columns.get_loc('weekday')] = None
+    X.iloc[3, X.columns.get_loc('weathersit')] = None
+
+    # When
+    _, errors = validate_inputs(input_df=X)
+    _, reference_errors = validate_inputs(input_df=X, method="pydantic")
+
+    # Then
+    assert errors is not None and reference_errors is not None
+    found = [(e['type'], e['loc']) for e in json.loads(errors)]
+    assert found == [
+        ('string_type', ['inputs', 0, 'season']),
+        ('string_type', ['inputs', 1, 'hr']),
+        ('date_type', ['inputs', 2, 'dteday']),
+    ]
+    assert [(e['type'], e['loc']) for e in json.loads(reference_errors)] == found